@@ -0,0 +1,6 @@
+"""
+AI agents for Hacktoberfest 2025.
+
+Importing this package (or any agent module) has no side effects. Run an
+agent with ``python -m agents <name> [args...]``; see ``agents.cli``.
+"""
@@ -1,14 +1,34 @@
+import argparse
 import google.generativeai as genai
 import os
-import re
 from typing import Optional
 
-# Try to load .env file if python-dotenv is available
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    pass
+from agents.common import enable_session_profile, wrap_model
+from agents.common.config import load_env
+from agents.common.history import HistoryStore
+from agents.common.profiler import enable_turn_profiler, profile_turn
+from agents.common.structured import ParseError, StructuredOutput
+
+# Replies are JSON matching this schema instead of "Steps: ... Answer: ..." text
+CALCULATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "steps": {"type": "array", "items": {"type": "string"}},
+        "answer": {"type": "string"},
+        "value": {"type": "number", "nullable": True},
+    },
+    "required": ["steps", "answer"],
+}
+
+HISTORY_COLUMNS = (
+    ("expression", "text"),
+    ("full_response", "text"),
+    ("steps", "json"),
+    ("answer", "text"),
+    ("value", "number"),
+    ("status", "enum"),
+)
+
 
 class CalculatorAgent:
     """
@@ -32,7 +52,7 @@ class CalculatorAgent:
         self.model_name = model_name
         
         # Configure the model with calculator-specific instructions
-        self.model = genai.GenerativeModel(
+        self.model = wrap_model(genai.GenerativeModel(
             model_name=self.model_name,
             generation_config=genai.types.GenerationConfig(
                 temperature=0.1,  # Low temperature for accurate calculations
@@ -45,20 +65,23 @@ class CalculatorAgent:
             
             Rules:
             1. Always show the calculation steps
-            2. Provide the final answer clearly marked as "Answer: "
+            2. Provide the final answer clearly
             3. Support basic arithmetic, algebra, trigonometry, calculus concepts
             4. Explain complex calculations briefly
             5. For word problems, extract the mathematical expression first
             6. Be precise and accurate in all calculations
             
-            Format your response as:
-            Steps: [show calculation steps]
-            Answer: [final numerical result]
+            Respond with JSON:
+            "steps": [calculation steps, one per item]
+            "answer": [final result as you would write it, with units if any]
+            "value": [final result as a plain number, or null if it is not a single number]
             """
-        )
+        ), agent="CalculatorAgent")
         
         self.chat = self.model.start_chat(history=[])
-        self.calculation_history = []
+        self.structured = StructuredOutput(self.model, CALCULATION_SCHEMA, "CalculatorAgent", "calculate")
+        # Columnar store: older entries are compressed, very long sessions spill to disk
+        self.calculation_history = HistoryStore(HISTORY_COLUMNS)
     
     def calculate(self, expression: str) -> dict:
         """
@@ -68,58 +91,60 @@ class CalculatorAgent:
             expression: Mathematical expression or word problem
             
         Returns:
-            dict: Contains 'expression', 'steps', 'answer', and 'full_response'
+            dict: Contains 'expression', 'steps', 'answer', 'value' (a number
+            or None), 'full_response' and 'status'; on error 'steps',
+            'answer' and 'value' are None
         """
         try:
-            # Send the calculation request
-            response = self.chat.send_message(expression)
-            full_response = response.text
-            
-            # Extract answer from response
-            answer = self._extract_answer(full_response)
+            # Send the calculation request; the reply is validated JSON
+            data = self.structured.generate(expression, send=self.chat.send_message)
+            steps = data['steps']
+            full_response = "Steps:\n" + "\n".join(f"  {step}" for step in steps)
+            full_response += f"\nAnswer: {data['answer']}"
             
             # Store in history
             result = {
                 'expression': expression,
                 'full_response': full_response,
-                'answer': answer,
+                'steps': steps,
+                'answer': data['answer'],
+                'value': data.get('value'),
                 'status': 'success'
             }
             
-            self.calculation_history.append(result)
+            self.calculation_history.append(**result)
             return result
             
+        except ParseError as e:
+            error_result = {
+                'expression': expression,
+                'full_response': f"Could not read the model's answer ({e}):\n{e.text}",
+                'steps': None,
+                'answer': None,
+                'value': None,
+                'status': 'error'
+            }
+            self.calculation_history.append(**error_result)
+            return error_result
         except Exception as e:
             error_result = {
                 'expression': expression,
                 'full_response': f"Error: {str(e)}",
+                'steps': None,
                 'answer': None,
+                'value': None,
                 'status': 'error'
             }
-            self.calculation_history.append(error_result)
+            self.calculation_history.append(**error_result)
             return error_result
     
-    def _extract_answer(self, response: str) -> Optional[str]:
-        """Extract the numerical answer from the response."""
-        # Look for "Answer:" pattern
-        answer_match = re.search(r'Answer:\s*([^\n]+)', response, re.IGNORECASE)
-        if answer_match:
-            return answer_match.group(1).strip()
-        
-        # Look for final number in the response
-        numbers = re.findall(r'-?\d+\.?\d*', response)
-        if numbers:
-            return numbers[-1]
-        
-        return None
-    
     def get_history(self) -> list:
-        """Get calculation history."""
-        return self.calculation_history
+        """Get calculation history (entries as dicts, oldest first)."""
+        return list(self.calculation_history)
     
     def clear_history(self):
         """Clear calculation history."""
-        self.calculation_history = []
+        self.calculation_history.clear()
         self.chat = self.model.start_chat(history=[])
         print("✓ History cleared!\n")
     
@@ -162,8 +187,21 @@ def print_help():
     print("=" * 60 + "\n")
 
 
-def main():
+def main(argv=None):
     """Main function to run the calculator agent."""
+    parser = argparse.ArgumentParser(description="Calculator Agent - Powered by Gemini AI")
+    parser.add_argument("--profile", action="store_true",
+                        help="print a per-session latency/token/cost breakdown on exit")
+    parser.add_argument("--flamegraph", metavar="PATH",
+                        help="sample each turn, report wall/CPU/network time on exit and write the "
+                             "stacks to PATH (.json: speedscope, otherwise collapsed stacks)")
+    args = parser.parse_args(argv)
+    if args.profile:
+        enable_session_profile()
+    if args.flamegraph:
+        enable_turn_profiler(args.flamegraph)
+    load_env()
+
     print("\n" + "🧮 " + "=" * 58)
     print("   CALCULATOR AGENT - Powered by Gemini AI")
     print("=" * 60 + "\n")
@@ -209,14 +247,15 @@ def main():
                 
                 # Perform calculation
                 print("\n🔄 Calculating...\n")
-                result = calculator.calculate(user_input)
-                
-                if result['status'] == 'success':
-                    print("📊 " + "=" * 58)
-                    print(result['full_response'])
-                    print("=" * 60 + "\n")
-                else:
-                    print(f"❌ {result['full_response']}\n")
+                with profile_turn("calculate"):
+                    result = calculator.calculate(user_input)
+                    
+                    if result['status'] == 'success':
+                        print("📊 " + "=" * 58)
+                        print(result['full_response'])
+                        print("=" * 60 + "\n")
+                    else:
+                        print(f"❌ {result['full_response']}\n")
                 
             except KeyboardInterrupt:
                 print("\n\n👋 Goodbye!")
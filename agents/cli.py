@@ -0,0 +1,60 @@
+"""
+Unified command-line runner for the agents.
+
+Usage (from the repository root)::
+
+    python -m agents                      # list the agents
+    python -m agents calculator --profile
+    python -m agents search "AI agents 2025"
+    python -m agents rule --temperature 30 --steps 3
+
+Only the selected agent's module is imported, so running the rule-based
+agent never loads the Gemini SDK and only the search agent loads bs4.
+"""
+
+import importlib
+import sys
+from typing import Dict, List, Optional, Tuple
+
+# name -> (module, description); every module exposes ``main(argv=None)``
+AGENTS: Dict[str, Tuple[str, str]] = {
+    "calculator": ("agents.calculator.calculator", "natural-language calculator (Gemini)"),
+    "chatbot": ("agents.gemini_chatbot.chatbot", "interactive chatbot (Gemini)"),
+    "code": ("agents.code_agent.agent", "generate, review or explain code (Gemini)"),
+    "content-team": ("agents.content_team.agent", "writer and editor agents (Gemini)"),
+    "goal": ("agents.goal_based_agent.agent", "goal-based planning agent"),
+    "learning-advisor": ("agents.learning_advisor.agent", "personalized learning paths (Gemini)"),
+    "prompt": ("agents.gemini.prompt", "search and summarize one query (Gemini)"),
+    "research": ("agents.research_agent.research_agent", "in-depth topic research (Gemini)"),
+    "rule": ("agents.rule_based_agent.agent", "rule-based thermostat agent"),
+    "search": ("agents.search_agent.agent", "DuckDuckGo web search agent"),
+    "tool": ("agents.tool_agent.agent", "function-calling agent (Gemini)"),
+    "workflow": ("agents.orchestrator.agent", "search → research ∥ code → writer → editor (Gemini)"),
+}
+
+
+def print_agents() -> None:
+    print("Usage: python -m agents <name> [args...]\n")
+    print("Available agents:")
+    for name, (_, description) in AGENTS.items():
+        print(f"  {name:<18}{description}")
+    print("\nRun 'python -m agents <name> --help' for an agent's options.")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help", "--list"):
+        print_agents()
+        return 0
+
+    name, rest = argv[0], argv[1:]
+    if name not in AGENTS:
+        print(f"❌ Unknown agent '{name}'\n")
+        print_agents()
+        return 2
+
+    module = importlib.import_module(AGENTS[name][0])
+    # Show "python -m agents <name>" in the agent's own --help output
+    sys.argv = [f"python -m agents {name}"] + rest
+    module.main(rest)
+    return 0
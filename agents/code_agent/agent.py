@@ -1,14 +1,60 @@
 """Code generation and review agent"""
+import argparse
+import os
+import time
+from typing import Dict, List, Optional
+
 import google.generativeai as genai
 
+from agents.common import wrap_model
+from agents.common.config import configure_gemini
+from agents.common.structured import StructuredOutput
+from agents.code_agent.repo_review import RepoReview, RepoReviewer
+from agents.code_agent.static_analysis import analyze, compact_prompt
+
+REVIEW_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "summary": {"type": "string"},
+        "findings": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "line": {"type": "integer", "nullable": True},
+                    "category": {"type": "string", "enum": ["bug", "performance", "quality", "best-practice"]},
+                    "severity": {"type": "string", "enum": ["high", "medium", "low"]},
+                    "message": {"type": "string"},
+                    "suggestion": {"type": "string"},
+                },
+                "required": ["category", "severity", "message"],
+            },
+        },
+    },
+    "required": ["summary", "findings"],
+}
+
+
+def format_review(data: Dict) -> str:
+    """Render a structured code review as readable text."""
+    lines: List[str] = [data["summary"]]
+    for finding in data["findings"]:
+        where = f"line {finding['line']} " if finding.get("line") else ""
+        lines.append(f"\n- {where}[{finding['severity']}, {finding['category']}] {finding['message']}")
+        if finding.get("suggestion"):
+            lines.append(f"  Suggestion: {finding['suggestion']}")
+    return "\n".join(lines)
+
 
 class CodeAgent:
     def __init__(self):
-        self.model = genai.GenerativeModel(
+        self.last_review_stats = {}
+        self.model = wrap_model(genai.GenerativeModel(
             'gemini-1.5-flash',
             system_instruction="""You are an expert programming assistant. 
             Generate clean, well-documented code with explanations."""
-        )
+        ), agent="CodeAgent")
+        self.review_output = StructuredOutput(self.model, REVIEW_SCHEMA, "CodeAgent", "review_code")
     
     def generate_code(self, description: str, language: str = "python") -> str:
         """Generate code based on description"""
@@ -24,25 +70,143 @@ class CodeAgent:
         response = self.model.generate_content(prompt)
         return response.text
     
-    def review_code(self, code: str) -> str:
-        """Review and suggest improvements for code"""
-        prompt = f"""Review the following code and suggest improvements:
+    def review_code(self, code: str, pre_analysis: bool = True, language: str = "python") -> str:
+        """
+        Review and suggest improvements for code
+
+        Same arguments as ``review_code_structured``; returns the review as
+        readable text.
+        """
+        return self.review_code_structured(code, pre_analysis, language)["content"]
+    
+    def review_code_structured(self, code: str, pre_analysis: bool = True, language: str = "python") -> Dict:
+        """
+        Review code and return the findings as validated data
+
+        Args:
+            code: Source code to review
+            pre_analysis: Run the local static analysis first and send the model
+                its findings plus the relevant snippets instead of the whole file.
+                Small files and files with nothing flagged are still sent whole.
+                Statistics about the call are kept in ``self.last_review_stats``.
+            language: Language of ``code``; the static analysis only
+                understands Python, so other languages are always sent whole
+
+        Returns:
+            Dictionary with ``summary``, ``findings`` (each with ``line``,
+            ``category``, ``severity``, ``message`` and ``suggestion``) and
+            ``content`` as readable text
+        """
+        started = time.perf_counter()
+        prompt = full_prompt = f"""Review the following code and suggest improvements:
         
         ```
         {code}
         ```
         
         Provide:
-        1. Code quality assessment
+        1. Code quality assessment (the summary)
         2. Potential bugs or issues
         3. Optimization suggestions
-        4. Best practice recommendations"""
+        4. Best practice recommendations
+        with one finding per issue, giving its line number where there is one."""
         
-        response = self.model.generate_content(prompt)
-        return response.text
+        analysis = None
+        if pre_analysis and language.lower() == "python":
+            analysis = analyze(code)
+            if analysis.syntax_error:
+                # The model needs the whole file to suggest a fix
+                error = analysis.syntax_error
+                prompt = f"Local analysis found a syntax error at line {error.line}: {error.message}\n\n{full_prompt}"
+            else:
+                compact = compact_prompt(code, analysis)
+                if compact is not None and len(compact) < len(full_prompt):
+                    prompt = compact
+        analyzed = time.perf_counter()
+        
+        data = self.review_output.generate(prompt)
+        finished = time.perf_counter()
+        self.last_review_stats = {
+            "full_prompt_chars": len(full_prompt),
+            "prompt_chars": len(prompt),
+            "reduction": 1 - len(prompt) / len(full_prompt),
+            "local_findings": len(analysis.issues) if analysis else 0,
+            "analysis_ms": (analyzed - started) * 1000,
+            "model_ms": (finished - analyzed) * 1000,
+            "total_ms": (finished - started) * 1000,
+        }
+        return {**data, "content": format_review(data)}
+    
+    def review_repository(self, root: str, budget: int = 6000, concurrency: int = 4,
+                          cache_path: Optional[str] = "") -> RepoReview:
+        """
+        Review a whole directory in chunks and merge the findings per file
+
+        Args:
+            root: Directory (or single file) to review
+            budget: Maximum estimated prompt tokens per request
+            concurrency: Requests in flight
+            cache_path: Review cache file; "" uses ``<root>/.code_review_cache.json``,
+                None disables caching
+
+        Returns:
+            RepoReview with findings per file and run statistics
+        """
+        if cache_path == "":
+            base = root if os.path.isdir(root) else os.path.dirname(os.path.abspath(root))
+            cache_path = os.path.join(base, ".code_review_cache.json")
+        reviewer = RepoReviewer(self.model, budget=budget, concurrency=concurrency, cache_path=cache_path)
+        return reviewer.review(root)
     
     def explain_code(self, code: str) -> str:
         """Explain what code does"""
         prompt = f"Explain what this code does:\n\n{code}"
         response = self.model.generate_content(prompt)
         return response.text
+
+
+def main(argv=None):
+    """Generate, review or explain code from the command line."""
+    parser = argparse.ArgumentParser(description="Code Agent - generation and review")
+    parser.add_argument("task", choices=["generate", "review", "explain"])
+    parser.add_argument("text", help="task description, a source file, or a directory to review")
+    parser.add_argument("--language", help="language to generate, or of the code to review "
+                                           "(default: python, or the file extension when reviewing a file)")
+    parser.add_argument("--budget", type=int, default=6000, help="prompt tokens per request in directory review")
+    parser.add_argument("--concurrency", type=int, default=4, help="requests in flight in directory review")
+    parser.add_argument("--no-cache", action="store_true", help="review every chunk, ignoring the cache")
+    parser.add_argument("--no-pre-analysis", action="store_true",
+                        help="send the whole file to the model without local static analysis")
+    args = parser.parse_args(argv)
+
+    text = args.text
+    language = args.language or "python"
+    if args.task == "review" and os.path.isdir(text):
+        configure_gemini()
+        report = CodeAgent().review_repository(text, args.budget, args.concurrency,
+                                               None if args.no_cache else "")
+        print(report.format_report())
+        return
+    if args.task != "generate" and os.path.isfile(text):
+        extension = os.path.splitext(text)[1].lstrip(".").lower()
+        if args.language is None and extension and extension != "py":
+            language = extension
+        with open(text, encoding="utf-8") as f:
+            text = f.read()
+
+    configure_gemini()
+    agent = CodeAgent()
+    if args.task == "generate":
+        print(agent.generate_code(text, language))
+    elif args.task == "review":
+        print(agent.review_code(text, pre_analysis=not args.no_pre_analysis, language=language))
+        stats = agent.last_review_stats
+        print(f"\n📉 Prompt {stats['full_prompt_chars']:,} → {stats['prompt_chars']:,} chars "
+              f"({stats['reduction']:.0%} smaller), {stats['local_findings']} local findings, "
+              f"analysis {stats['analysis_ms']:.0f} ms, model {stats['model_ms'] / 1000:.1f} s")
+    else:
+        print(agent.explain_code(text))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,354 @@
+"""
+Repository-scale code review for ``CodeAgent``.
+
+Reviewing a repository one file per prompt breaks on large files and pays
+for every file again after each commit. ``RepoReviewer`` instead:
+
+1. walks the directory and splits Python files on function/class
+   boundaries with ``ast`` (other files, and files that do not parse, are
+   split into line windows)
+2. skips chunks whose content hash is already in the review cache
+3. packs the remaining chunks into requests that fit a token budget
+4. reviews the requests concurrently and merges the findings per file
+
+Findings are cached relative to the start of their chunk, so a chunk that
+only moved (because code above it changed) is not reviewed again.
+"""
+
+import ast
+import hashlib
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Dict, Iterator, List, Optional
+
+from agents.common.structured import StructuredOutput
+
+# Bump when the prompt or finding format changes to invalidate old caches
+CACHE_VERSION = 1
+DEFAULT_EXTENSIONS = (".py",)
+# Prompt tokens spent on each chunk's header and code fence
+CHUNK_OVERHEAD = 25
+SKIP_DIRS = {"__pycache__", "node_modules", "venv", "env", "build", "dist", "site-packages"}
+
+REVIEW_PROMPT = """Review the following code chunks and report concrete problems:
+bugs, error handling gaps, security issues, performance problems and clear
+best-practice violations. Skip style nitpicks.
+
+Reply with JSON only: a list of objects with keys
+"chunk" (the chunk id, e.g. "C3"), "line" (line number in the file, as shown
+in the chunk header), "severity" ("high", "medium" or "low") and "message".
+Reply with [] if there is nothing worth reporting.
+
+"""
+
+# Findings are requested in JSON mode and validated against this schema
+FINDINGS_SCHEMA = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {
+            "chunk": {"type": "string"},
+            "line": {"type": "integer"},
+            "severity": {"type": "string", "enum": ["high", "medium", "low"]},
+            "message": {"type": "string"},
+        },
+        "required": ["chunk", "line", "severity", "message"],
+    },
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token)."""
+    return len(text) // 4 + 1
+
+
+@dataclass
+class Chunk:
+    path: str
+    name: str
+    start: int
+    end: int
+    source: str
+
+    @cached_property
+    def digest(self) -> str:
+        return hashlib.sha256(self.source.encode("utf-8")).hexdigest()
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.source)
+
+
+@dataclass
+class Finding:
+    path: str
+    line: int
+    severity: str
+    message: str
+    chunk: str = ""
+
+
+@dataclass
+class RepoReview:
+    """Merged findings per file plus statistics about the run."""
+
+    files: Dict[str, List[Finding]] = field(default_factory=dict)
+    files_scanned: int = 0
+    chunks: int = 0
+    chunks_cached: int = 0
+    chunks_reviewed: int = 0
+    requests: int = 0
+    failed_requests: int = 0
+    prompt_tokens: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def findings(self) -> int:
+        return sum(len(items) for items in self.files.values())
+
+    def format_report(self) -> str:
+        lines = []
+        for path in sorted(self.files):
+            lines.append(f"📄 {path}")
+            for f in self.files[path]:
+                lines.append(f"   {f.line:>5}  [{f.severity}] {f.message}  ({f.chunk})")
+            lines.append("")
+        lines.append(f"✓ {self.findings} findings in {len(self.files)} files "
+                     f"({self.files_scanned} scanned, {self.chunks} chunks: {self.chunks_cached} cached, "
+                     f"{self.chunks_reviewed} reviewed in {self.requests} requests, "
+                     f"~{self.prompt_tokens:,} prompt tokens, {self.elapsed:.1f}s)")
+        if self.failed_requests:
+            lines.append(f"⚠️  {self.failed_requests} requests failed; their chunks will be retried next run")
+        return "\n".join(lines)
+
+
+def _line_windows(path: str, lines: List[str], start: int, end: int, name: str,
+                  max_tokens: int) -> Iterator[Chunk]:
+    """Split lines ``start..end`` (1-based, inclusive) into chunks under ``max_tokens``."""
+    first, size = start, 0
+    for number in range(start, end + 1):
+        size += estimate_tokens(lines[number - 1])
+        if size > max_tokens and number > first:
+            yield Chunk(path, f"{name}:{first}-{number - 1}", first, number - 1,
+                        "".join(lines[first - 1:number - 1]))
+            first, size = number, estimate_tokens(lines[number - 1])
+    if first <= end:
+        yield Chunk(path, f"{name}:{first}-{end}" if first != start else name, first, end,
+                    "".join(lines[first - 1:end]))
+
+
+def _node_span(node: ast.AST) -> tuple:
+    start = min([node.lineno] + [d.lineno for d in getattr(node, "decorator_list", [])])
+    return start, node.end_lineno
+
+
+def _split_nodes(path: str, lines: List[str], body: List[ast.stmt], prefix: str,
+                 max_tokens: int) -> Iterator[Chunk]:
+    """Chunks for a list of statements: one per def/class, loose statements grouped."""
+    loose: List[ast.stmt] = []
+
+    def flush():
+        if loose:
+            start, end = _node_span(loose[0])[0], loose[-1].end_lineno
+            yield from _line_windows(path, lines, start, end, f"{prefix}<statements>", max_tokens)
+            loose.clear()
+
+    for node in body:
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            loose.append(node)
+            continue
+        yield from flush()
+        start, end = _node_span(node)
+        name = prefix + node.name
+        source = "".join(lines[start - 1:end])
+        if estimate_tokens(source) <= max_tokens:
+            yield Chunk(path, name, start, end, source)
+        elif isinstance(node, ast.ClassDef):
+            yield from _split_nodes(path, lines, node.body, name + ".", max_tokens)
+        else:
+            yield from _line_windows(path, lines, start, end, name, max_tokens)
+    yield from flush()
+
+
+def chunk_file(path: str, source: str, max_tokens: int = 1500) -> List[Chunk]:
+    """Split one file into review chunks of at most ``max_tokens`` each."""
+    lines = source.splitlines(keepends=True)
+    if not lines:
+        return []
+    if path.endswith(".py"):
+        try:
+            tree = ast.parse(source)
+        except (SyntaxError, ValueError):
+            tree = None
+        if tree is not None:
+            return list(_split_nodes(path, lines, tree.body, "", max_tokens))
+    return list(_line_windows(path, lines, 1, len(lines), "<file>", max_tokens))
+
+
+def iter_files(root: str, extensions=DEFAULT_EXTENSIONS) -> Iterator[str]:
+    """Source files under ``root``, skipping hidden, cache and vendored directories."""
+    if os.path.isfile(root):
+        yield root
+        return
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith(".") and d not in SKIP_DIRS)
+        for filename in sorted(filenames):
+            if filename.endswith(tuple(extensions)):
+                yield os.path.join(dirpath, filename)
+
+
+def pack(chunks: List[Chunk], budget: int) -> List[List[Chunk]]:
+    """Group chunks, in order, into requests of at most ``budget`` tokens."""
+    budget -= estimate_tokens(REVIEW_PROMPT)
+    batches, current, size = [], [], 0
+    for chunk in chunks:
+        cost = chunk.tokens + CHUNK_OVERHEAD
+        if current and size + cost > budget:
+            batches.append(current)
+            current, size = [], 0
+        current.append(chunk)
+        size += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+class ReviewCache:
+    """Findings per chunk content hash, stored as JSON (line numbers relative to the chunk)."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.entries: Dict[str, list] = {}
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == CACHE_VERSION:
+                self.entries = data.get("chunks", {})
+
+    def get(self, digest: str) -> Optional[list]:
+        return self.entries.get(digest)
+
+    def put(self, digest: str, findings: list) -> None:
+        self.entries[digest] = findings
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "chunks": self.entries}, f)
+        os.replace(tmp, self.path)
+
+
+class RepoReviewer:
+    """
+    Review a directory tree in token-budgeted, concurrent requests.
+
+    Args:
+        model: A ``wrap_model`` proxy (e.g. ``CodeAgent().model``)
+        budget: Maximum estimated prompt tokens per request
+        chunk_tokens: Maximum tokens per chunk (larger definitions are split)
+        concurrency: Requests in flight
+        cache_path: JSON file for the content-hash cache (None disables it)
+        extensions: File extensions to review
+    """
+
+    def __init__(self, model, budget: int = 6000, chunk_tokens: int = 1500, concurrency: int = 4,
+                 cache_path: Optional[str] = None, extensions=DEFAULT_EXTENSIONS):
+        self.model = model
+        self.structured = StructuredOutput(model, FINDINGS_SCHEMA, getattr(model, "agent", "CodeAgent"),
+                                           "review_repository")
+        self.budget = budget
+        self.chunk_tokens = min(chunk_tokens, budget - estimate_tokens(REVIEW_PROMPT) - CHUNK_OVERHEAD)
+        self.concurrency = concurrency
+        self.cache = ReviewCache(cache_path)
+        self.extensions = tuple(extensions)
+
+    def collect(self, root: str) -> List[Chunk]:
+        chunks = []
+        for path in iter_files(root, self.extensions):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    source = f.read()
+            except (OSError, UnicodeDecodeError):
+                continue
+            rel = os.path.relpath(path, root) if os.path.isdir(root) else path
+            chunks.extend(chunk_file(rel, source, self.chunk_tokens))
+        return chunks
+
+    def _prompt(self, batch: List[Chunk]) -> str:
+        parts = [REVIEW_PROMPT]
+        for i, chunk in enumerate(batch, 1):
+            parts.append(f"### C{i}: {chunk.path} lines {chunk.start}-{chunk.end} ({chunk.name})\n"
+                         f"```\n{chunk.source}```\n")
+        return "\n".join(parts)
+
+    def _review_batch(self, batch: List[Chunk]) -> Optional[Dict[str, list]]:
+        """Findings per chunk digest for one request, or None if it failed."""
+        try:
+            items = self.structured.generate(self._prompt(batch))
+        except Exception:
+            return None
+        results = {chunk.digest: [] for chunk in batch}
+        for item in items:
+            match = re.fullmatch(r"C?(\d+)", item["chunk"].strip())
+            if not match or not 1 <= int(match.group(1)) <= len(batch):
+                continue
+            chunk = batch[int(match.group(1)) - 1]
+            line = min(max(item["line"], chunk.start), chunk.end)
+            results[chunk.digest].append({
+                "offset": line - chunk.start,
+                "severity": item["severity"],
+                "message": item["message"].strip(),
+            })
+        return results
+
+    def review(self, root: str) -> RepoReview:
+        """Review every matching file under ``root`` and merge findings per file."""
+        started = time.perf_counter()
+        report = RepoReview()
+        chunks = self.collect(root)
+        report.files_scanned = len({chunk.path for chunk in chunks})
+        report.chunks = len(chunks)
+
+        todo, seen = [], set()
+        for chunk in chunks:
+            if self.cache.get(chunk.digest) is not None:
+                report.chunks_cached += 1
+            elif chunk.digest not in seen:
+                # Identical chunks (e.g. in copied files) are reviewed once
+                seen.add(chunk.digest)
+                todo.append(chunk)
+
+        batches = pack(todo, self.budget)
+        report.requests = len(batches)
+        report.prompt_tokens = sum(estimate_tokens(self._prompt(batch)) for batch in batches)
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, self.concurrency)) as executor:
+                for batch, results in zip(batches, executor.map(self._review_batch, batches)):
+                    if results is None:
+                        report.failed_requests += 1
+                        continue
+                    report.chunks_reviewed += len(batch)
+                    for digest, findings in results.items():
+                        self.cache.put(digest, findings)
+        finally:
+            self.cache.save()
+
+        for chunk in chunks:
+            for item in self.cache.get(chunk.digest) or ():
+                finding = Finding(chunk.path, chunk.start + item["offset"], item["severity"],
+                                  item["message"], chunk.name)
+                merged = report.files.setdefault(chunk.path, [])
+                if all((f.line, f.message) != (finding.line, finding.message) for f in merged):
+                    merged.append(finding)
+        for findings in report.files.values():
+            findings.sort(key=lambda f: f.line)
+        report.elapsed = time.perf_counter() - started
+        return report
+
@@ -0,0 +1,303 @@
+"""
+Local static analysis run before ``CodeAgent.review_code`` calls the model.
+
+Syntax errors, unused names, overly complex functions and a handful of
+common defects can be found with ``ast`` and ``tokenize`` in milliseconds.
+``analyze`` collects them together with per-function complexity metrics,
+and ``compact_prompt`` turns the result into a small review prompt: the
+local findings plus only the code around them and around the complex
+functions, instead of the whole file.
+"""
+
+import ast
+import io
+import tokenize
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+COMPLEXITY_LIMIT = 10
+LENGTH_LIMIT = 60
+NESTING_LIMIT = 4
+ARGS_LIMIT = 6
+LINE_LIMIT = 120
+# Files this short are always reviewed in full; trimming them saves little
+SMALL_FILE_LINES = 80
+
+_BRANCHES = (ast.If, ast.For, ast.AsyncFor, ast.While, ast.IfExp, ast.ExceptHandler, ast.comprehension)
+_NESTING = (ast.If, ast.For, ast.AsyncFor, ast.While, ast.Try, ast.With, ast.AsyncWith)
+_FUNCTIONS = (ast.FunctionDef, ast.AsyncFunctionDef)
+_MUTABLE_DEFAULTS = (ast.List, ast.Dict, ast.Set, ast.ListComp, ast.DictComp, ast.SetComp)
+
+
+@dataclass
+class Issue:
+    line: int
+    kind: str
+    message: str
+
+
+@dataclass
+class FunctionMetrics:
+    name: str
+    start: int
+    end: int
+    complexity: int
+    nesting: int
+    args: int
+
+    @property
+    def length(self) -> int:
+        return self.end - self.start + 1
+
+
+@dataclass
+class Analysis:
+    lines: int = 0
+    issues: List[Issue] = field(default_factory=list)
+    functions: List[FunctionMetrics] = field(default_factory=list)
+    syntax_error: Optional[Issue] = None
+
+    @property
+    def hotspots(self) -> List[FunctionMetrics]:
+        """Functions over the complexity, length or nesting limits."""
+        return [f for f in self.functions
+                if f.complexity > COMPLEXITY_LIMIT or f.length > LENGTH_LIMIT or f.nesting > NESTING_LIMIT]
+
+
+def _complexity(node: ast.AST) -> int:
+    """McCabe-style cyclomatic complexity of one function (nested defs excluded)."""
+    score = 1
+    stack = list(ast.iter_child_nodes(node))
+    while stack:
+        child = stack.pop()
+        if isinstance(child, _FUNCTIONS + (ast.ClassDef, ast.Lambda)):
+            continue
+        if isinstance(child, _BRANCHES):
+            score += 1 + (len(child.ifs) if isinstance(child, ast.comprehension) else 0)
+        elif isinstance(child, ast.BoolOp):
+            score += len(child.values) - 1
+        elif isinstance(child, ast.Try):
+            score += bool(child.orelse)
+        elif getattr(ast, "match_case", None) and isinstance(child, ast.match_case):
+            score += 1
+        stack.extend(ast.iter_child_nodes(child))
+    return score
+
+
+def _nesting(node: ast.AST, depth: int = 0) -> int:
+    """Deepest block nesting inside ``node`` (an ``elif`` does not add a level)."""
+    deepest = depth
+    for name, value in ast.iter_fields(node):
+        children = value if isinstance(value, list) else [value]
+        for child in children:
+            if not isinstance(child, ast.AST) or isinstance(child, _FUNCTIONS + (ast.ClassDef,)):
+                continue
+            elif_chain = isinstance(node, ast.If) and name == "orelse" and len(children) == 1
+            step = isinstance(child, _NESTING) and not (elif_chain and isinstance(child, ast.If))
+            deepest = max(deepest, _nesting(child, depth + step))
+    return deepest
+
+
+class _Checker(ast.NodeVisitor):
+    """Collects metrics and defects in one pass over the tree."""
+
+    def __init__(self, analysis: Analysis):
+        self.analysis = analysis
+        self.scope: List[str] = []
+
+    def add(self, node: ast.AST, kind: str, message: str) -> None:
+        self.analysis.issues.append(Issue(node.lineno, kind, message))
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        self.scope.append(node.name)
+        self.generic_visit(node)
+        self.scope.pop()
+
+    def visit_FunctionDef(self, node) -> None:
+        name = ".".join(self.scope + [node.name])
+        args = node.args
+        positional = args.posonlyargs + args.args
+        count = len(positional) + len(args.kwonlyargs) - bool(self.scope and positional
+                                                               and positional[0].arg in ("self", "cls"))
+        metrics = FunctionMetrics(name, node.lineno, node.end_lineno, _complexity(node), _nesting(node), count)
+        self.analysis.functions.append(metrics)
+
+        if metrics.complexity > COMPLEXITY_LIMIT:
+            self.add(node, "complexity", f"{name} has cyclomatic complexity {metrics.complexity}")
+        if metrics.length > LENGTH_LIMIT:
+            self.add(node, "length", f"{name} is {metrics.length} lines long")
+        if metrics.nesting > NESTING_LIMIT:
+            self.add(node, "nesting", f"{name} nests blocks {metrics.nesting} levels deep")
+        if count > ARGS_LIMIT:
+            self.add(node, "arguments", f"{name} takes {count} arguments")
+        for default in args.defaults + [d for d in args.kw_defaults if d is not None]:
+            if isinstance(default, _MUTABLE_DEFAULTS):
+                self.add(default, "mutable-default", f"{name} uses a mutable default argument")
+        self._unused_locals(node, name)
+
+        self.scope.append(node.name)
+        self.generic_visit(node)
+        self.scope.pop()
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def _unused_locals(self, node, name: str) -> None:
+        stored, loaded, declared = {}, set(), set()
+        stack = list(node.body)
+        while stack:
+            child = stack.pop()
+            if isinstance(child, (ast.Global, ast.Nonlocal)):
+                declared.update(child.names)
+            elif isinstance(child, ast.Name):
+                if isinstance(child.ctx, ast.Store):
+                    stored.setdefault(child.id, child)
+                else:
+                    loaded.add(child.id)
+            if isinstance(child, _FUNCTIONS + (ast.Lambda,)):
+                # Closures may read the variable
+                loaded.update(n.id for n in ast.walk(child) if isinstance(n, ast.Name))
+                continue
+            stack.extend(ast.iter_child_nodes(child))
+        for var, where in stored.items():
+            if var not in loaded and var not in declared and not var.startswith("_"):
+                self.add(where, "unused-variable", f"local variable '{var}' in {name} is never used")
+
+    def visit_ExceptHandler(self, node: ast.ExceptHandler) -> None:
+        if node.type is None:
+            self.add(node, "bare-except", "bare 'except:' also catches KeyboardInterrupt and SystemExit")
+        self.generic_visit(node)
+
+    def visit_Compare(self, node: ast.Compare) -> None:
+        for op, right in zip(node.ops, node.comparators):
+            if isinstance(op, (ast.Eq, ast.NotEq)) and isinstance(right, ast.Constant) and right.value is None:
+                self.add(node, "none-comparison", "comparison to None should use 'is' / 'is not'")
+        self.generic_visit(node)
+
+    def visit_Call(self, node: ast.Call) -> None:
+        if isinstance(node.func, ast.Name) and node.func.id in ("eval", "exec"):
+            self.add(node, "eval", f"{node.func.id}() runs arbitrary code")
+        self.generic_visit(node)
+
+
+def _unused_imports(tree: ast.Module, analysis: Analysis) -> None:
+    imported = {}
+    for node in tree.body:
+        if isinstance(node, ast.ImportFrom) and node.module == "__future__":
+            continue
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            for alias in node.names:
+                if alias.name == "*":
+                    continue
+                bound = alias.asname or alias.name.split(".")[0]
+                imported[bound] = (node.lineno, alias.name)
+    if not imported:
+        return
+    used = set()
+    exported = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and not isinstance(node.ctx, ast.Store):
+            used.add(node.id)
+        elif isinstance(node, ast.Assign) and any(
+                isinstance(t, ast.Name) and t.id == "__all__" for t in node.targets):
+            if isinstance(node.value, (ast.List, ast.Tuple)):
+                exported.update(e.value for e in node.value.elts if isinstance(e, ast.Constant))
+    for bound, (line, name) in imported.items():
+        if bound not in used and bound not in exported:
+            analysis.issues.append(Issue(line, "unused-import", f"'{name}' is imported but never used"))
+
+
+def _token_checks(code: str, analysis: Analysis) -> None:
+    try:
+        for tok in tokenize.generate_tokens(io.StringIO(code).readline):
+            if tok.type == tokenize.COMMENT and any(tag in tok.string for tag in ("TODO", "FIXME", "XXX")):
+                analysis.issues.append(Issue(tok.start[0], "todo", tok.string.lstrip("# ").strip()[:100]))
+    except (tokenize.TokenError, IndentationError, SyntaxError):
+        pass
+    for number, line in enumerate(code.splitlines(), 1):
+        if len(line) > LINE_LIMIT:
+            analysis.issues.append(Issue(number, "long-line", f"line is {len(line)} characters long"))
+
+
+def analyze(code: str) -> Analysis:
+    """Run all local checks on Python source."""
+    analysis = Analysis(lines=code.count("\n") + 1)
+    try:
+        tree = ast.parse(code)
+    except SyntaxError as e:
+        analysis.syntax_error = Issue(e.lineno or 1, "syntax-error", e.msg)
+        analysis.issues.append(analysis.syntax_error)
+        _token_checks(code, analysis)
+        return analysis
+    _Checker(analysis).visit(tree)
+    _unused_imports(tree, analysis)
+    _token_checks(code, analysis)
+    analysis.issues.sort(key=lambda issue: issue.line)
+    return analysis
+
+
+def _merge(ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def compact_prompt(code: str, analysis: Analysis, context: int = 3,
+                   max_snippet_lines: int = 400) -> Optional[str]:
+    """
+    Build a review prompt from local findings and the relevant snippets only.
+
+    Snippets cover ``context`` lines around each finding and the full body
+    of every hotspot function, numbered as in the original file.
+
+    Returns:
+        The prompt, or None when the file is small or nothing was flagged,
+        since the model would then see none of the code; send the whole
+        file instead.
+    """
+    if analysis.lines <= SMALL_FILE_LINES:
+        return None
+    lines = code.splitlines()
+    ranges = [(max(1, f.start), f.end) for f in analysis.hotspots]
+    ranges += [(max(1, i.line - context), min(len(lines), i.line + context))
+               for i in analysis.issues if i.kind not in ("complexity", "length", "nesting")]
+    snippets, budget = [], max_snippet_lines
+    for start, end in _merge(ranges):
+        end = min(end, start + budget - 1)
+        if end < start:
+            break
+        snippets.append("\n".join(f"{n:>5} | {lines[n - 1]}" for n in range(start, end + 1)))
+        budget -= end - start + 1
+
+    findings = "\n".join(f"- line {i.line} [{i.kind}] {i.message}" for i in analysis.issues) or "- none"
+    metrics = "\n".join(f"- {f.name} (lines {f.start}-{f.end}): complexity {f.complexity}, "
+                        f"{f.length} lines, nesting {f.nesting}, {f.args} args"
+                        for f in sorted(analysis.functions, key=lambda f: -f.complexity)[:15]) or "- none"
+    if not snippets:
+        return None
+    body = "\n\n".join(f"```\n{s}\n```" for s in snippets)
+
+    return f"""Review a {analysis.lines}-line Python file. A local static analysis already ran;
+its findings are listed below, so do not repeat them. Confirm which ones matter,
+explain how to fix them, and look for logic bugs, error handling gaps and
+performance problems in the snippets (line numbers refer to the full file).
+
+Local findings:
+{findings}
+
+Most complex functions:
+{metrics}
+
+Relevant snippets:
+{body}
+
+Provide:
+1. Code quality assessment
+2. Potential bugs or issues
+3. Optimization suggestions
+4. Best practice recommendations
+with one finding per issue, giving its line number where there is one."""
+
@@ -0,0 +1,30 @@
+"""
+Shared infrastructure used by the agents in this repository.
+"""
+
+from .instrumentation import (
+    InMemorySink,
+    JsonlSink,
+    PrometheusSink,
+    Span,
+    Tracer,
+    enable_session_profile,
+    get_tracer,
+)
+from .model import wrap_model
+from .scheduler import BATCH, INTERACTIVE, configure_scheduler, get_scheduler
+
+__all__ = [
+    'BATCH',
+    'INTERACTIVE',
+    'InMemorySink',
+    'JsonlSink',
+    'PrometheusSink',
+    'Span',
+    'Tracer',
+    'configure_scheduler',
+    'enable_session_profile',
+    'get_scheduler',
+    'get_tracer',
+    'wrap_model',
+]
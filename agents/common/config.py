@@ -0,0 +1,41 @@
+"""
+Environment and API setup shared by the agents' entry points.
+
+Nothing here runs on import: agent modules stay free of side effects and
+their ``main()`` functions call these helpers explicitly.
+"""
+
+import os
+from typing import Optional
+
+
+def load_env() -> None:
+    """Load variables from a ``.env`` file if python-dotenv is available."""
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        return  # python-dotenv not installed, will use system env variables
+    load_dotenv()
+
+
+def configure_gemini(api_key: Optional[str] = None) -> str:
+    """
+    Configure the Gemini SDK for agents that do not take an API key.
+
+    Args:
+        api_key: Explicit key; defaults to ``GEMINI_API_KEY`` from the
+            environment or ``.env``
+
+    Returns:
+        The API key used
+
+    Raises:
+        ValueError: If no API key is available
+    """
+    load_env()
+    api_key = api_key or os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        raise ValueError("GEMINI_API_KEY not found. Set it in your environment or a .env file.")
+    import google.generativeai as genai
+    genai.configure(api_key=api_key)
+    return api_key
@@ -0,0 +1,255 @@
+"""
+Compact, columnar storage for per-session history.
+
+Agents used to keep history as a list of dicts: one dict per entry with the
+same string keys repeated and a formatted timestamp string. ``HistoryStore``
+keeps one column per field instead:
+
+- timestamps in an ``array('d')`` of epoch seconds
+- ``number`` fields in an ``array('d')`` (NaN stands for None)
+- ``enum`` fields (status flags and other small vocabularies) as one byte
+  per entry indexing an interned value table
+- ``text`` and ``json`` fields as a list of bodies. Bodies older than the
+  last ``compress_after`` entries are zlib-compressed in place, and once the
+  bodies held in memory exceed ``memory_limit`` bytes the oldest entries are
+  spilled to a file and only their offset is kept. The spill file is only
+  open while rows are written or read, so idle stores hold no descriptors.
+
+Entries are still read as plain dicts (built on access), so callers that
+index ``history[i]['user']`` keep working.
+"""
+
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+import weakref
+import zlib
+from array import array
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+KINDS = ("text", "json", "enum", "number")
+# Bodies shorter than this are not worth compressing
+MIN_COMPRESS = 64
+
+
+class HistoryStore:
+    """
+    Append-only columnar history.
+
+    Args:
+        columns: ``(name, kind)`` pairs, kind one of ``text``, ``json``,
+            ``enum`` or ``number``
+        compress_after: Keep this many recent entries uncompressed; older
+            text/json bodies are zlib-compressed (None disables compression)
+        memory_limit: Bytes of bodies kept in memory before the oldest
+            entries are spilled to disk (None disables spilling)
+        spill_path: Spill file, removed on ``close()`` (or when the store is
+            garbage collected); a temporary file by default
+    """
+
+    def __init__(self, columns: Sequence[Tuple[str, str]], compress_after: Optional[int] = 20,
+                 memory_limit: Optional[int] = 1 << 20, spill_path: Optional[str] = None):
+        for name, kind in columns:
+            if kind not in KINDS:
+                raise ValueError(f"Column '{name}' has unknown kind '{kind}'")
+        self.columns = [(sys.intern(name), kind) for name, kind in columns]
+        self._bodies = [name for name, kind in self.columns if kind in ("text", "json")]
+        self.compress_after = compress_after
+        self.memory_limit = memory_limit
+        self.spill_path = spill_path
+        self._spill_name: Optional[str] = None  # set once something is spilled
+        self._cleanup = None
+        self.clear()
+
+    def clear(self) -> None:
+        """Drop all entries (and truncate the spill file)."""
+        self.timestamps = array("d")
+        self._data: Dict[str, Any] = {}
+        self._enums: Dict[str, List[Any]] = {}
+        for name, kind in self.columns:
+            if kind == "number":
+                self._data[name] = array("d")
+            elif kind == "enum":
+                self._data[name] = array("B")
+                self._enums[name] = []
+            else:
+                self._data[name] = []
+        # Spilled entries: offset and length of the row in the spill file
+        self._spill_offsets = array("q")
+        self._spill_lengths = array("q")
+        self._compressed = 0  # entries [0, _compressed) have compressed bodies
+        self._spilled = 0     # entries [0, _spilled) live in the spill file
+        self.memory_bytes = 0  # bytes of bodies held in memory
+        if self._spill_name is not None:
+            open(self._spill_name, "wb").close()
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def append(self, timestamp: Optional[float] = None, **values) -> None:
+        """Add an entry; missing fields are stored as None."""
+        self.timestamps.append(time.time() if timestamp is None else timestamp)
+        for name, kind in self.columns:
+            value = values.get(name)
+            if kind == "number":
+                self._data[name].append(math.nan if value is None else float(value))
+            elif kind == "enum":
+                table = self._enums[name]
+                try:
+                    code = table.index(value)
+                except ValueError:
+                    if len(table) == 255:
+                        raise ValueError(f"Enum column '{name}' has more than 255 values") from None
+                    table.append(value)
+                    code = len(table) - 1
+                self._data[name].append(code)
+            else:
+                body = value if kind == "text" or value is None else json.dumps(value, ensure_ascii=False)
+                self._data[name].append(body)
+                self.memory_bytes += len(body) if body is not None else 0
+        self._age()
+
+    def _age(self) -> None:
+        """Compress and spill older entries as the store grows."""
+        if self.compress_after is not None:
+            while self._compressed < len(self) - self.compress_after:
+                i = self._compressed
+                for name in self._bodies:
+                    body = self._data[name][i]
+                    if isinstance(body, str) and len(body) >= MIN_COMPRESS:
+                        packed = zlib.compress(body.encode("utf-8"))
+                        if len(packed) < len(body):
+                            self._data[name][i] = packed
+                            self.memory_bytes += len(packed) - len(body)
+                self._compressed += 1
+        if self.memory_limit is not None and self.memory_bytes > self.memory_limit:
+            # Spill down to half the limit so spilling happens in batches
+            with self._spill_file("ab") as f:
+                while self._spilled < len(self) - 1 and self.memory_bytes > self.memory_limit // 2:
+                    self._spill_row(f, self._spilled)
+                    self._spilled += 1
+
+    @contextmanager
+    def _spill_file(self, mode: str):
+        """Open the spill file for one batch of writes or reads."""
+        if self._spill_name is None:
+            if self.spill_path:
+                self._spill_name = self.spill_path
+                open(self._spill_name, "wb").close()
+            else:
+                fd, self._spill_name = tempfile.mkstemp(prefix="history-", suffix=".spill")
+                os.close(fd)
+            # Agents rarely call close(), so also remove the file with the store
+            self._cleanup = weakref.finalize(self, _remove, self._spill_name)
+        with open(self._spill_name, mode) as f:
+            yield f
+
+    def _spill_row(self, f, i: int) -> None:
+        bodies = [self._data[name][i] for name in self._bodies]
+        # Row layout: one uint32 length per body (0xFFFFFFFF = None, high bit = compressed)
+        header, payload = array("I"), []
+        for body in bodies:
+            if body is None:
+                header.append(0xFFFFFFFF)
+                continue
+            raw = body if isinstance(body, bytes) else body.encode("utf-8")
+            header.append(len(raw) | (0x80000000 if isinstance(body, bytes) else 0))
+            payload.append(raw)
+            self.memory_bytes -= len(body)
+        data = header.tobytes() + b"".join(payload)
+        self._spill_offsets.append(f.tell())
+        self._spill_lengths.append(len(data))
+        f.write(data)
+        for name in self._bodies:
+            self._data[name][i] = None
+
+    def _load_row(self, f, i: int) -> Dict[str, Union[str, bytes, None]]:
+        f.seek(self._spill_offsets[i])
+        data = f.read(self._spill_lengths[i])
+        header = array("I")
+        header.frombytes(data[:header.itemsize * len(self._bodies)])
+        position, row = header.itemsize * len(self._bodies), {}
+        for name, size in zip(self._bodies, header):
+            if size == 0xFFFFFFFF:
+                row[name] = None
+                continue
+            length = size & 0x7FFFFFFF
+            raw = data[position:position + length]
+            position += length
+            row[name] = raw if size & 0x80000000 else raw.decode("utf-8")
+        return row
+
+    def _entry(self, i: int, f=None) -> Dict[str, Any]:
+        spilled = None
+        if i < self._spilled:
+            if f is None:
+                with self._spill_file("rb") as f:
+                    spilled = self._load_row(f, i)
+            else:
+                spilled = self._load_row(f, i)
+        entry: Dict[str, Any] = {"timestamp": self.timestamps[i]}
+        for name, kind in self.columns:
+            if kind == "number":
+                value = self._data[name][i]
+                entry[name] = None if math.isnan(value) else value
+            elif kind == "enum":
+                entry[name] = self._enums[name][self._data[name][i]]
+            else:
+                body = spilled[name] if spilled is not None else self._data[name][i]
+                if isinstance(body, bytes):
+                    body = zlib.decompress(body).decode("utf-8")
+                entry[name] = json.loads(body) if kind == "json" and body is not None else body
+        return entry
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            indices = range(*index.indices(len(self)))
+            if not indices or min(indices[0], indices[-1]) >= self._spilled:
+                return [self._entry(i) for i in indices]
+            with self._spill_file("rb") as f:
+                return [self._entry(i, f) for i in indices]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("history index out of range")
+        return self._entry(index)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        # Spilled entries come first: read them through one open file
+        if self._spilled:
+            with self._spill_file("rb") as f:
+                for i in range(self._spilled):
+                    yield self._entry(i, f)
+        for i in range(self._spilled, len(self)):
+            yield self._entry(i)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def stats(self) -> Dict[str, int]:
+        """Entry counts per storage tier and bytes in memory and on disk."""
+        return {
+            "entries": len(self),
+            "compressed": self._compressed,
+            "spilled": self._spilled,
+            "memory_bytes": self.memory_bytes,
+            "disk_bytes": sum(self._spill_lengths),
+        }
+
+    def close(self) -> None:
+        """Drop all entries and delete the spill file."""
+        if self._cleanup is not None:
+            self._cleanup()
+            self._cleanup = self._spill_name = None
+        self.clear()
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -0,0 +1,339 @@
+"""
+Instrumentation for model and HTTP calls.
+
+Every call made by an agent is recorded as a ``Span`` (agent, method, model,
+token counts, latency, retries, cache hit, scheduler queue wait, structured
+output parse failures) and handed to the sinks registered
+on the process-wide ``Tracer``. Three sinks are provided:
+
+- ``InMemorySink``   - aggregated counters and latency histograms
+- ``JsonlSink``      - one JSON object per span appended to a file
+- ``PrometheusSink`` - ``InMemorySink`` rendered in Prometheus text format,
+                       optionally served over HTTP
+"""
+
+import atexit
+import json
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Latency histogram bucket upper bounds, in seconds
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, float("inf"))
+
+# USD per 1M tokens as (input, output). List prices at the time of writing;
+# pass ``pricing=`` to a sink to override.
+DEFAULT_PRICING = {
+    "gemini-2.5-pro": (1.25, 10.00),
+    "gemini-2.5-flash": (0.30, 2.50),
+    "gemini-2.0-flash": (0.10, 0.40),
+    "gemini-1.5-flash": (0.075, 0.30),
+}
+
+
+@dataclass
+class Span:
+    """A single timed model or HTTP call."""
+    agent: str
+    method: str
+    model: str = ""
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+    latency: float = 0.0
+    retries: int = 0
+    cache_hit: bool = False
+    queue_wait: float = 0.0
+    parse_failures: int = 0
+    error: Optional[str] = None
+    started_at: float = field(default_factory=time.time)
+
+    def record_usage(self, response) -> None:
+        """Copy token counts from a Gemini response's ``usage_metadata``."""
+        usage = getattr(response, "usage_metadata", None)
+        if usage is None:
+            return
+        self.prompt_tokens = getattr(usage, "prompt_token_count", 0) or 0
+        self.output_tokens = getattr(usage, "candidates_token_count", 0) or 0
+
+
+class Tracer:
+    """Creates spans and fans them out to the registered sinks."""
+
+    def __init__(self, sinks: Optional[List] = None):
+        self._sinks = list(sinks or [])
+        self._lock = threading.Lock()
+
+    def add_sink(self, sink) -> None:
+        with self._lock:
+            self._sinks.append(sink)
+
+    def remove_sink(self, sink) -> None:
+        with self._lock:
+            if sink in self._sinks:
+                self._sinks.remove(sink)
+
+    @contextmanager
+    def span(self, agent: str, method: str, model: str = "") -> Iterator[Span]:
+        """
+        Time the enclosed block and emit it as a span.
+
+        Exceptions are recorded on the span and re-raised.
+        """
+        span = Span(agent=agent, method=method, model=model)
+        start = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            span.error = type(e).__name__
+            raise
+        finally:
+            span.latency = time.perf_counter() - start
+            self.emit(span)
+
+    def emit(self, span: Span) -> None:
+        """Send a finished span to every sink."""
+        for sink in list(self._sinks):
+            sink.record(span)
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """Return the process-wide tracer."""
+    return _tracer
+
+
+class _Series:
+    """Aggregated metrics for one (agent, method, model) key."""
+
+    __slots__ = ("count", "errors", "retries", "cache_hits", "prompt_tokens", "output_tokens",
+                 "latency_sum", "latency_max", "queue_wait_sum", "parse_failures", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.retries = 0
+        self.cache_hits = 0
+        self.prompt_tokens = 0
+        self.output_tokens = 0
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.queue_wait_sum = 0.0
+        self.parse_failures = 0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+
+    def add(self, span: Span) -> None:
+        self.count += 1
+        self.errors += span.error is not None
+        self.retries += span.retries
+        self.cache_hits += span.cache_hit
+        self.prompt_tokens += span.prompt_tokens
+        self.output_tokens += span.output_tokens
+        self.latency_sum += span.latency
+        self.latency_max = max(self.latency_max, span.latency)
+        self.queue_wait_sum += span.queue_wait
+        self.parse_failures += span.parse_failures
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if span.latency <= bound:
+                self.buckets[i] += 1
+                break
+
+    def quantile(self, q: float) -> float:
+        """Estimate a latency quantile from the histogram buckets."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for bound, n in zip(LATENCY_BUCKETS, self.buckets):
+            if n and seen + n >= rank:
+                upper = min(bound, self.latency_max)
+                return lower + (upper - lower) * ((rank - seen) / n)
+            seen += n
+            lower = bound
+        return self.latency_max
+
+
+class InMemorySink:
+    """Keeps per (agent, method, model) counters and latency histograms."""
+
+    def __init__(self, pricing: Optional[Dict[str, Tuple[float, float]]] = None):
+        self.pricing = DEFAULT_PRICING if pricing is None else pricing
+        self._series: Dict[Tuple[str, str, str], _Series] = {}
+        self._lock = threading.Lock()
+
+    def record(self, span: Span) -> None:
+        key = (span.agent, span.method, span.model)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series()
+            series.add(span)
+
+    def cost(self, model: str, prompt_tokens: int, output_tokens: int) -> Optional[float]:
+        """Estimated USD cost, or None if the model has no known price."""
+        price = self.pricing.get(model)
+        if price is None:
+            return None
+        return (prompt_tokens * price[0] + output_tokens * price[1]) / 1_000_000
+
+    def summary(self) -> List[Dict]:
+        """Return one row per (agent, method, model) with aggregated metrics."""
+        rows = []
+        with self._lock:
+            items = sorted(self._series.items())
+        for (agent, method, model), s in items:
+            rows.append({
+                "agent": agent,
+                "method": method,
+                "model": model,
+                "calls": s.count,
+                "errors": s.errors,
+                "retries": s.retries,
+                "cache_hits": s.cache_hits,
+                "prompt_tokens": s.prompt_tokens,
+                "output_tokens": s.output_tokens,
+                "latency_avg": s.latency_sum / s.count if s.count else 0.0,
+                "latency_p50": s.quantile(0.50),
+                "latency_p99": s.quantile(0.99),
+                "latency_max": s.latency_max,
+                "queue_wait_avg": s.queue_wait_sum / s.count if s.count else 0.0,
+                "parse_failures": s.parse_failures,
+                "cost_usd": self.cost(model, s.prompt_tokens, s.output_tokens),
+            })
+        return rows
+
+    def format_summary(self) -> str:
+        """Render ``summary()`` as a text table."""
+        rows = self.summary()
+        if not rows:
+            return "No model or HTTP calls recorded."
+
+        lines = [
+            "=" * 96,
+            "SESSION PROFILE",
+            "=" * 96,
+            f"{'agent.method':<36}{'calls':>6}{'err':>5}{'retry':>6}"
+            f"{'tok in':>9}{'tok out':>9}{'p50 s':>8}{'p99 s':>8}{'cost $':>9}",
+            "-" * 96,
+        ]
+        total_cost = 0.0
+        for row in rows:
+            name = f"{row['agent']}.{row['method']}"
+            cost = row["cost_usd"]
+            total_cost += cost or 0.0
+            cost_text = "-" if cost is None else f"{cost:.4f}"
+            lines.append(
+                f"{name[:35]:<36}{row['calls']:>6}{row['errors']:>5}{row['retries']:>6}"
+                f"{row['prompt_tokens']:>9}{row['output_tokens']:>9}"
+                f"{row['latency_p50']:>8.2f}{row['latency_p99']:>8.2f}{cost_text:>9}"
+            )
+        lines.append("-" * 96)
+        parsed = [row for row in rows if row["method"].endswith(".parse")]
+        if parsed:
+            replies = sum(row["calls"] for row in parsed)
+            failures = sum(row["parse_failures"] for row in parsed)
+            repairs = sum(row["retries"] for row in parsed)
+            lines.append(f"Structured output: {replies} replies, {failures} parse failures, "
+                         f"{repairs} repairs ({repairs / replies:.1%} retry rate), "
+                         f"{sum(row['errors'] for row in parsed)} unusable")
+        lines.append(f"Estimated cost: ${total_cost:.4f}")
+        return "\n".join(lines)
+
+
+class JsonlSink:
+    """Appends every span as one JSON line to a file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def record(self, span: Span) -> None:
+        line = json.dumps(asdict(span), ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class PrometheusSink(InMemorySink):
+    """``InMemorySink`` that renders its metrics in Prometheus text format."""
+
+    def render(self) -> str:
+        with self._lock:
+            items = [(f'agent="{a}",method="{m}",model="{mo}"', s)
+                     for (a, m, mo), s in sorted(self._series.items())]
+
+        out = []
+        for name, attr in (("agent_calls_total", "count"),
+                           ("agent_errors_total", "errors"),
+                           ("agent_retries_total", "retries"),
+                           ("agent_cache_hits_total", "cache_hits"),
+                           ("agent_parse_failures_total", "parse_failures")):
+            out.append(f"# TYPE {name} counter")
+            out.extend(f"{name}{{{labels}}} {getattr(s, attr)}" for labels, s in items)
+
+        out.append("# TYPE agent_queue_wait_seconds_total counter")
+        out.extend(f"agent_queue_wait_seconds_total{{{labels}}} {s.queue_wait_sum}" for labels, s in items)
+
+        out.append("# TYPE agent_tokens_total counter")
+        for labels, s in items:
+            out.append(f'agent_tokens_total{{{labels},kind="prompt"}} {s.prompt_tokens}')
+            out.append(f'agent_tokens_total{{{labels},kind="output"}} {s.output_tokens}')
+
+        out.append("# TYPE agent_call_latency_seconds histogram")
+        for labels, s in items:
+            cumulative = 0
+            for bound, n in zip(LATENCY_BUCKETS, s.buckets):
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                out.append(f'agent_call_latency_seconds_bucket{{{labels},le="{le}"}} {cumulative}')
+            out.append(f"agent_call_latency_seconds_sum{{{labels}}} {s.latency_sum}")
+            out.append(f"agent_call_latency_seconds_count{{{labels}}} {s.count}")
+        return "\n".join(out) + "\n"
+
+    def serve(self, port: int = 9464, host: str = "127.0.0.1"):
+        """
+        Serve ``/metrics`` from a background thread.
+
+        Returns:
+            The running ``ThreadingHTTPServer``; call ``shutdown()`` to stop it.
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        sink = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = sink.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+def enable_session_profile() -> InMemorySink:
+    """
+    Record all calls for the rest of the process and print a breakdown on exit.
+
+    Used by the ``--profile`` switch of the CLI entry points.
+    """
+    sink = InMemorySink()
+    get_tracer().add_sink(sink)
+    atexit.register(lambda: print("\n" + sink.format_summary() + "\n"))
+    return sink
@@ -0,0 +1,111 @@
+"""
+Thin wrappers around Gemini models and chat sessions.
+
+Agents wrap every ``genai.GenerativeModel`` they create with ``wrap_model`` so
+that all ``generate_content`` and ``send_message`` calls go through a single
+code path, where they are scheduled (see ``scheduler``), instrumented and
+retried (see ``resilience``).
+"""
+
+import threading
+from typing import Optional
+
+from .instrumentation import Tracer, get_tracer
+from .resilience import QueueTimeoutError, Resilience, get_breaker
+from .scheduler import INTERACTIVE, estimate_tokens, get_scheduler
+
+
+class ModelProxy:
+    """Drop-in stand-in for ``genai.GenerativeModel`` that instruments and retries calls."""
+
+    def __init__(self, model, agent: str, tracer: Optional[Tracer] = None,
+                 resilience: Optional[Resilience] = None, priority: int = INTERACTIVE):
+        self._model = model
+        self.agent = agent
+        self.tracer = tracer or get_tracer()
+        self.model_id = str(getattr(model, "model_name", "")).replace("models/", "")
+        self.resilience = resilience or Resilience(breaker=get_breaker("gemini"))
+        self.priority = priority
+
+    def generate_content(self, *args, hedge: Optional[bool] = None, **kwargs):
+        """
+        Same as ``GenerativeModel.generate_content``.
+
+        Pass ``hedge=True`` on latency-sensitive paths to send a backup
+        request when the first one is slower than usual.
+        """
+        hedge = self.resilience.hedge if hedge is None else hedge
+        return self._call("generate_content", self._model.generate_content, *args,
+                          _hedge=hedge, **kwargs)
+
+    def start_chat(self, *args, **kwargs):
+        return ChatProxy(self._model.start_chat(*args, **kwargs), self)
+
+    def _call(self, method: str, fn, *args, _hedge: bool = False, **kwargs):
+        scheduler = get_scheduler()
+        estimate = estimate_tokens(args[0] if args else kwargs.get("content", kwargs.get("contents", "")))
+        # Hedged attempts run on two threads and both add to the span
+        wait_lock = threading.Lock()
+
+        def attempt(timeout):
+            # Every attempt, including retries and hedges, counts against the rate
+            # limits, and queueing for a slot uses up the attempt's share of the deadline
+            ticket = scheduler.acquire(self.agent, self.priority, estimate, timeout=timeout)
+            with wait_lock:
+                span.queue_wait += ticket.wait
+            if timeout is not None:
+                timeout -= ticket.wait
+                if timeout <= 0:
+                    raise QueueTimeoutError(f"deadline spent waiting {ticket.wait:.1f}s for a request slot")
+                options = dict(kwargs.get("request_options") or {})
+                options.setdefault("timeout", timeout)
+                response = fn(*args, **dict(kwargs, request_options=options))
+            else:
+                response = fn(*args, **kwargs)
+            usage = getattr(response, "usage_metadata", None)
+            if usage is not None:
+                scheduler.release(ticket, getattr(usage, "total_token_count", None))
+            return response
+
+        with self.tracer.span(self.agent, method, self.model_id) as span:
+            response = self.resilience.call(attempt, span=span, hedge=_hedge)
+            span.record_usage(response)
+        return response
+
+    def __getattr__(self, name):
+        return getattr(self._model, name)
+
+
+class ChatProxy:
+    """Drop-in stand-in for ``genai.ChatSession`` that instruments calls."""
+
+    def __init__(self, chat, model: ModelProxy):
+        self._chat = chat
+        self._model = model
+
+    def send_message(self, *args, **kwargs):
+        # Chat turns append to the session history, so they are never hedged
+        return self._model._call("send_message", self._chat.send_message, *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._chat, name)
+
+
+def wrap_model(model, agent: str, hedge: bool = False, deadline: Optional[float] = 120.0,
+               priority: int = INTERACTIVE) -> ModelProxy:
+    """
+    Wrap a Gemini model so every call made through it is instrumented and
+    retried with backoff behind the shared ``gemini`` circuit breaker.
+
+    Args:
+        model: A ``genai.GenerativeModel`` (or anything with the same interface)
+        agent: Name reported on spans, usually the agent class name
+        hedge: Hedge slow ``generate_content`` calls with a backup request
+        deadline: Seconds allowed per call across all retries (None = no limit)
+        priority: Scheduler class, ``INTERACTIVE`` or ``BATCH``
+
+    Returns:
+        A ``ModelProxy`` exposing the same interface as ``model``
+    """
+    resilience = Resilience(breaker=get_breaker("gemini"), deadline=deadline, hedge=hedge)
+    return ModelProxy(model, agent, resilience=resilience, priority=priority)
@@ -0,0 +1,347 @@
+"""
+Sampling profiler for interactive turns.
+
+When a chat turn or calculation feels slow, the session profile
+(``--profile``) shows how long the model calls took, but not where the
+rest of the turn went. ``TurnProfiler`` samples the Python stack of the
+thread running each turn from a background thread, every ``interval``
+seconds and only while a turn is in progress:
+
+- each sample is weighted by the wall time since the previous sample and
+  by the CPU time the sampled thread used in that period (from its
+  per-thread CPU clock where the platform has one), so stacks that
+  wait on the network get wall time but almost no CPU time
+- stacks are rooted at ``turn:<label>`` and can be written as collapsed
+  stacks (``flamegraph.pl``, speedscope, inferno) or as a speedscope file
+  holding a wall-time and a CPU-time profile
+- per turn it records wall time, the turn thread's CPU time, and the time
+  covered by model/HTTP spans on the shared tracer ("network"). Wall minus
+  network is the turn's local overhead: SDK request building and response
+  parsing, HTML parsing, prompt and string building, printing
+
+Turns are marked with ``profile_turn(label)``, which does nothing unless
+``enable_turn_profiler()`` was called, so the entry points can mark turns
+unconditionally.
+"""
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .instrumentation import Span, get_tracer
+
+DEFAULT_INTERVAL = 0.005
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# (component, path fragments); the innermost frame that matches decides
+COMPONENTS = (
+    ("HTTP / sockets", ("requests/", "urllib3/", "http/client.py", "socket.py", "ssl.py", "selectors.py")),
+    ("HTML parsing", ("bs4/", "html/parser.py", "html5lib/", "lxml/")),
+    ("Gemini SDK", ("google/", "grpc/", "proto/", "httpx/", "httpcore/")),
+    ("JSON", ("json/",)),
+    ("agents", ("agents/",)),
+)
+
+
+def _thread_cpu_clock(thread_id: int) -> Optional[int]:
+    """Clock id of ``thread_id``'s CPU time, or None where unsupported."""
+    try:
+        return time.pthread_getcpuclockid(thread_id)
+    except (AttributeError, OSError):
+        return None
+
+
+class Turn:
+    """Timing of one profiled turn."""
+
+    __slots__ = ("label", "thread_id", "cpu_clock", "started_at", "wall", "cpu", "network")
+
+    def __init__(self, label: str, thread_id: int):
+        self.label = label
+        self.thread_id = thread_id
+        self.cpu_clock = _thread_cpu_clock(thread_id)
+        self.started_at = time.time()
+        self.wall = self.cpu = self.network = 0.0
+
+    @property
+    def overhead(self) -> float:
+        """Wall time not spent waiting on model or HTTP calls."""
+        return max(self.wall - self.network, 0.0)
+
+
+class TurnProfiler:
+    """
+    Stack sampler scoped to turns.
+
+    Args:
+        interval: Seconds between samples
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL):
+        self.interval = interval
+        self.turns: List[Turn] = []
+        # stack (root first) -> [wall seconds, cpu seconds]
+        self.stacks: Dict[Tuple[str, ...], List[float]] = {}
+        self.samples = 0
+        self._labels: Dict[object, str] = {}
+        self._current: Optional[Turn] = None
+        self._spans: List[Span] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # Span sink interface: collect the calls made during turns
+    def record(self, span: Span) -> None:
+        if self._current is not None and span.model:
+            with self._lock:
+                self._spans.append(span)
+
+    @contextmanager
+    def turn(self, label: str) -> Iterator[Turn]:
+        """Profile the enclosed block as one turn."""
+        if self._thread is None:
+            get_tracer().add_sink(self)
+            self._thread = threading.Thread(target=self._run, name="turn-profiler", daemon=True)
+            self._thread.start()
+        turn = Turn(label, threading.get_ident())
+        wall, cpu = time.perf_counter(), time.thread_time()
+        with self._lock:
+            self._current = turn
+            self._last = (wall, self._cpu_now(turn))
+        try:
+            yield turn
+        finally:
+            turn.wall = time.perf_counter() - wall
+            turn.cpu = time.thread_time() - cpu
+            with self._lock:
+                self._current = None
+                spans, self._spans = self._spans, []
+            turn.network = _covered(spans, turn.started_at, turn.started_at + turn.wall)
+            self.turns.append(turn)
+
+    def _cpu_now(self, turn: Turn) -> float:
+        return time.clock_gettime(turn.cpu_clock) if turn.cpu_clock is not None else 0.0
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            with self._lock:
+                turn = self._current
+                if turn is not None:
+                    self._sample(turn)
+
+    def _sample(self, turn: Turn) -> None:
+        frame = sys._current_frames().get(turn.thread_id)
+        if frame is None:
+            return
+        now, cpu = time.perf_counter(), self._cpu_now(turn)
+        wall_delta, cpu_delta = now - self._last[0], cpu - self._last[1]
+        self._last = (now, cpu)
+        stack = []
+        while frame is not None:
+            stack.append(self._label(frame.f_code))
+            frame = frame.f_back
+        stack.append(f"turn:{turn.label}")
+        weights = self.stacks.setdefault(tuple(reversed(stack)), [0.0, 0.0])
+        weights[0] += wall_delta
+        weights[1] += cpu_delta
+        self.samples += 1
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+        return label
+
+    def components(self) -> List[Tuple[str, float, float]]:
+        """``(component, wall s, cpu s)`` by the innermost frame's package, largest first."""
+        totals: Dict[str, List[float]] = {}
+        for stack, (wall, cpu) in self.snapshot().items():
+            name = _component(stack)
+            entry = totals.setdefault(name, [0.0, 0.0])
+            entry[0] += wall
+            entry[1] += cpu
+        return sorted(((name, w, c) for name, (w, c) in totals.items()), key=lambda row: -row[1])
+
+    def snapshot(self) -> Dict[Tuple[str, ...], Tuple[float, float]]:
+        with self._lock:
+            return {stack: (w, c) for stack, (w, c) in self.stacks.items()}
+
+    def format_report(self) -> str:
+        """Per-turn wall, CPU, network and overhead times, then time by component."""
+        if not self.turns:
+            return "No turns profiled."
+        lines = [
+            "=" * 78,
+            f"TURN PROFILE ({len(self.turns)} turns, {self.samples} samples every {self.interval * 1000:g} ms)",
+            "=" * 78,
+            f"{'#':>3}  {'turn':<24}{'wall s':>9}{'cpu s':>9}{'network s':>11}{'overhead s':>12}{'overhead':>9}",
+            "-" * 78,
+        ]
+        for i, turn in enumerate(self.turns, 1):
+            share = turn.overhead / turn.wall if turn.wall else 0.0
+            lines.append(f"{i:>3}  {turn.label[:23]:<24}{turn.wall:>9.3f}{turn.cpu:>9.3f}"
+                         f"{turn.network:>11.3f}{turn.overhead:>12.3f}{share:>9.1%}")
+        lines.append("-" * 78)
+        wall = sum(t.wall for t in self.turns)
+        overhead = sum(t.overhead for t in self.turns)
+        lines.append(f"     {'total':<24}{wall:>9.3f}{sum(t.cpu for t in self.turns):>9.3f}"
+                     f"{sum(t.network for t in self.turns):>11.3f}{overhead:>12.3f}"
+                     f"{overhead / wall if wall else 0.0:>9.1%}")
+        lines.append(f"Overhead per turn: {overhead / len(self.turns) * 1000:.1f} ms "
+                     "(wall time outside model and HTTP calls)")
+        components = self.components()
+        if components:
+            lines.append("")
+            lines.append(f"{'sampled time by component':<34}{'wall s':>9}{'cpu s':>9}")
+            for name, w, c in components:
+                lines.append(f"  {name:<32}{w:>9.3f}{c:>9.3f}")
+        return "\n".join(lines)
+
+    def write_collapsed(self, path: str, weight: str = "wall") -> None:
+        """Write ``frame;frame;... <microseconds>`` lines weighted by wall or CPU time."""
+        column = 0 if weight == "wall" else 1
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, weights in sorted(self.snapshot().items()):
+                value = int(round(weights[column] * 1e6))
+                if value > 0:
+                    f.write(";".join(frame.replace(";", ":") for frame in stack) + f" {value}\n")
+
+    def write_speedscope(self, path: str, name: str = "agent turns") -> None:
+        """Write a speedscope file with a wall-time and a CPU-time profile."""
+        frames: List[Dict] = []
+        index: Dict[str, int] = {}
+        samples = []
+        stacks = self.snapshot()
+        for stack in stacks:
+            ids = []
+            for frame in stack:
+                if frame not in index:
+                    index[frame] = len(frames)
+                    frames.append({"name": frame})
+                ids.append(index[frame])
+            samples.append(ids)
+        profiles = []
+        for column, kind in ((0, "wall time"), (1, "CPU time")):
+            weights = [weights[column] for weights in stacks.values()]
+            profiles.append({
+                "type": "sampled",
+                "name": f"{name} ({kind})",
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            })
+        document = {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": profiles,
+            "name": name,
+            "exporter": "agents.common.profiler",
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(document, f)
+
+    def save(self, path: str) -> List[str]:
+        """
+        Write the samples to ``path``: speedscope JSON for ``.json``, otherwise
+        collapsed stacks (wall time, plus CPU time in ``<name>.cpu<ext>``).
+
+        Returns:
+            The files written
+        """
+        if path.endswith(".json"):
+            self.write_speedscope(path)
+            return [path]
+        stem, ext = os.path.splitext(path)
+        cpu_path = f"{stem}.cpu{ext}"
+        self.write_collapsed(path, "wall")
+        self.write_collapsed(cpu_path, "cpu")
+        return [path, cpu_path]
+
+    def close(self) -> None:
+        """Stop sampling and detach from the tracer."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            get_tracer().remove_sink(self)
+
+
+def _short_path(filename: str) -> str:
+    """Path relative to the repository or site-packages, with ``/`` separators."""
+    if filename.startswith(_REPO_ROOT + os.sep):
+        filename = os.path.relpath(filename, _REPO_ROOT)
+    else:
+        for marker in ("site-packages" + os.sep, "dist-packages" + os.sep):
+            if marker in filename:
+                filename = filename.split(marker, 1)[1]
+                break
+        else:
+            filename = os.sep.join(filename.split(os.sep)[-2:])
+    return filename.replace(os.sep, "/")
+
+
+def _component(stack: Tuple[str, ...]) -> str:
+    for frame in reversed(stack[1:]):
+        location = frame.rsplit("(", 1)[-1]
+        for name, fragments in COMPONENTS:
+            if any(fragment in location for fragment in fragments):
+                return name
+    return "other"
+
+
+def _covered(spans: List[Span], start: float, end: float) -> float:
+    """Seconds of ``[start, end]`` covered by at least one span."""
+    intervals = sorted((max(s.started_at, start), min(s.started_at + s.latency, end)) for s in spans)
+    covered, reach = 0.0, start
+    for lo, hi in intervals:
+        lo = max(lo, reach)
+        if hi > lo:
+            covered += hi - lo
+            reach = hi
+    return covered
+
+
+_profiler: Optional[TurnProfiler] = None
+
+
+def enable_turn_profiler(output: Optional[str] = None, interval: float = DEFAULT_INTERVAL) -> TurnProfiler:
+    """
+    Sample every ``profile_turn`` block for the rest of the process.
+
+    Prints the turn report on exit and, if ``output`` is given, writes the
+    samples there (see ``TurnProfiler.save``). Used by the ``--flamegraph``
+    switch of the interactive entry points.
+    """
+    global _profiler
+    _profiler = TurnProfiler(interval)
+
+    def report(profiler=_profiler):
+        profiler.close()
+        print("\n" + profiler.format_report() + "\n")
+        if output and profiler.stacks:
+            for path in profiler.save(output):
+                print(f"🔥 Flame graph samples written to {path}")
+
+    atexit.register(report)
+    return _profiler
+
+
+def get_turn_profiler() -> Optional[TurnProfiler]:
+    """The profiler enabled with ``enable_turn_profiler``, if any."""
+    return _profiler
+
+
+@contextmanager
+def profile_turn(label: str) -> Iterator[Optional[Turn]]:
+    """Profile the enclosed block as a turn if profiling is enabled."""
+    if _profiler is None:
+        yield None
+        return
+    with _profiler.turn(label) as turn:
+        yield turn
@@ -0,0 +1,287 @@
+"""
+Retry, deadline, hedging and circuit breaking for model and HTTP calls.
+
+``Resilience.call`` runs an attempt function with:
+
+- jittered exponential backoff on transient errors (429, 5xx, timeouts,
+  connection resets), honoring server retry-after hints
+- a per-call deadline shared by all attempts and passed down as the
+  per-attempt timeout
+- optional hedging: if an attempt is slower than the recent p95 latency,
+  a second identical request is started and the first success wins
+- a circuit breaker shared per upstream that fails fast while it is down
+"""
+
+import random
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional
+
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+_TRANSIENT_NAMES = {"ConnectionError", "Timeout", "ConnectTimeout", "ReadTimeout", "ChunkedEncodingError"}
+
+_RETRY_IN = re.compile(r"retry in ([\d.]+)\s*s", re.IGNORECASE)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised without calling upstream while its circuit breaker is open."""
+
+
+class DeadlineExceededError(TimeoutError):
+    """Raised when the per-call deadline leaves no time for another attempt."""
+
+
+class QueueTimeoutError(DeadlineExceededError):
+    """Raised when the deadline runs out while waiting for a local request slot."""
+
+
+def status_code(exc: BaseException) -> Optional[int]:
+    """Best-effort HTTP status of an SDK or ``requests`` exception."""
+    code = getattr(exc, "code", None)
+    if isinstance(code, int):
+        return code
+    response = getattr(exc, "response", None)
+    code = getattr(response, "status_code", None)
+    if isinstance(code, int):
+        return code
+    code = getattr(exc, "status_code", None)
+    return code if isinstance(code, int) else None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """True for rate limits, server errors, timeouts and connection failures."""
+    if isinstance(exc, (CircuitOpenError, DeadlineExceededError)):
+        return False
+    code = status_code(exc)
+    if code is not None:
+        return code in RETRYABLE_STATUS
+    if isinstance(exc, (ConnectionError, TimeoutError)):
+        return True
+    # requests' ConnectionError/Timeout do not derive from the builtins above
+    return any(cls.__name__ in _TRANSIENT_NAMES for cls in type(exc).__mro__)
+
+
+def retry_after(exc: BaseException) -> Optional[float]:
+    """
+    Extract a server-provided retry delay in seconds, if any.
+
+    Checks a ``Retry-After`` response header, gRPC ``RetryInfo`` details
+    and the "Please retry in 12.3s" hint in Gemini error messages.
+    """
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("Retry-After") if hasattr(headers, "get") else None
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+
+    for detail in getattr(exc, "details", None) or []:
+        delay = getattr(detail, "retry_delay", None)
+        if delay is not None:
+            return getattr(delay, "seconds", 0) + getattr(delay, "nanos", 0) / 1e9
+
+    match = _RETRY_IN.search(str(exc))
+    return float(match.group(1)) if match else None
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter."""
+
+    def __init__(self, max_attempts: int = 4, base_delay: float = 0.5,
+                 max_delay: float = 20.0, multiplier: float = 2.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+
+    def backoff(self, retry: int) -> float:
+        """Delay before retry number ``retry`` (0-based)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * self.multiplier ** retry))
+
+
+class CircuitBreaker:
+    """
+    Classic closed / open / half-open circuit breaker.
+
+    After ``failure_threshold`` consecutive transient failures the circuit
+    opens and calls fail immediately with ``CircuitOpenError``. After
+    ``reset_timeout`` seconds one trial call is let through; its outcome
+    closes or re-opens the circuit.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, name: str = "", failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+            raise CircuitOpenError(f"circuit '{self.name}' is open; upstream is failing, not calling it")
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """Give up a half-open trial without an outcome, so another call can try."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """Return the process-wide circuit breaker for an upstream."""
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(name)
+        return breaker
+
+
+_hedge_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="hedge")
+
+
+class Resilience:
+    """
+    Retry / deadline / hedging / circuit-breaker policy for one upstream.
+
+    Args:
+        breaker: Circuit breaker shared by all callers of the upstream
+        policy: Retry policy (default: 4 attempts, 0.5s base, 20s cap)
+        deadline: Total seconds allowed per call across all attempts (None = no limit)
+        hedge: Send a backup request when an attempt runs longer than the
+            recent p95 latency. Only use for idempotent calls.
+        hedge_delay: Hedge delay used until enough latencies were observed
+    """
+
+    def __init__(self, breaker: Optional[CircuitBreaker] = None, policy: Optional[RetryPolicy] = None,
+                 deadline: Optional[float] = 120.0, hedge: bool = False, hedge_delay: float = 2.0):
+        self.breaker = breaker or CircuitBreaker()
+        self.policy = policy or RetryPolicy()
+        self.deadline = deadline
+        self.hedge = hedge
+        self.hedge_delay = hedge_delay
+        self._latencies = deque(maxlen=200)
+
+    def call(self, attempt: Callable[[Optional[float]], object], span=None, hedge: Optional[bool] = None):
+        """
+        Run ``attempt(timeout)`` until it succeeds, fails permanently or runs
+        out of attempts or time.
+
+        Args:
+            attempt: Performs one request; receives the seconds left before the deadline
+            span: Optional instrumentation span whose ``retries`` is updated
+            hedge: Override the instance's hedging setting for this call
+
+        Returns:
+            The first successful result of ``attempt``
+        """
+        hedge = self.hedge if hedge is None else hedge
+        deadline = time.monotonic() + self.deadline if self.deadline else None
+        retry = 0
+        while True:
+            self.breaker.before_call()
+            timeout = deadline - time.monotonic() if deadline else None
+            start = time.monotonic()
+            try:
+                if hedge:
+                    result = self._hedged(attempt, timeout)
+                else:
+                    result = attempt(timeout)
+            except Exception as e:
+                if not is_retryable(e):
+                    # Every exit must settle a half-open trial. A client error
+                    # (4xx) means upstream answered, so it counts as up; a
+                    # queue timeout never reached it, so it says nothing.
+                    code = status_code(e)
+                    if isinstance(e, QueueTimeoutError):
+                        self.breaker.release_trial()
+                    elif code is not None and 400 <= code < 500:
+                        self.breaker.record_success()
+                    else:
+                        self.breaker.record_failure()
+                    raise
+                self.breaker.record_failure()
+                if retry + 1 >= self.policy.max_attempts:
+                    raise
+                hint = retry_after(e)
+                delay = hint if hint is not None else self.policy.backoff(retry)
+                if deadline and time.monotonic() + delay >= deadline:
+                    raise DeadlineExceededError(
+                        f"deadline of {self.deadline}s exceeded after {retry + 1} attempt(s)") from e
+                retry += 1
+                if span is not None:
+                    span.retries = retry
+                time.sleep(delay)
+            except BaseException:
+                self.breaker.release_trial()
+                raise
+            else:
+                self._latencies.append(time.monotonic() - start)
+                self.breaker.record_success()
+                return result
+
+    def _hedge_after(self) -> float:
+        if len(self._latencies) < 20:
+            return self.hedge_delay
+        ordered = sorted(self._latencies)
+        return ordered[int(len(ordered) * 0.95) - 1]
+
+    def _hedged(self, attempt, timeout):
+        delay = self._hedge_after()
+        primary = _hedge_pool.submit(attempt, timeout)
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+
+        remaining = timeout - delay if timeout else None
+        pending = {primary, _hedge_pool.submit(attempt, remaining)}
+        error = None
+        while pending:
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                raise DeadlineExceededError("hedged request timed out")
+            for future in done:
+                if future.exception() is None:
+                    # The slower request keeps running in the background; its result is dropped
+                    return future.result()
+                error = future.exception()
+        raise error
@@ -0,0 +1,227 @@
+"""
+Process-wide client-side rate limiting and scheduling of model calls.
+
+All wrapped models acquire a slot from the shared ``RequestScheduler``
+before each request. The scheduler enforces requests-per-minute and
+tokens-per-minute token buckets and decides who goes next:
+
+- strict priority between classes: ``INTERACTIVE`` calls (chat turns,
+  calculations) always go before ``BATCH`` calls (article generation,
+  prompt batches), so batch work cannot starve interactive users
+- round-robin between agents within a class, so one busy agent cannot
+  monopolise the quota
+
+Limits come from ``configure_scheduler`` or the ``GEMINI_RPM`` /
+``GEMINI_TPM`` environment variables; without them calls are never delayed.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+from .resilience import QueueTimeoutError
+
+INTERACTIVE = 0
+BATCH = 1
+
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BATCH: "batch"}
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``per_minute / 60`` tokens per second."""
+
+    def __init__(self, per_minute: float, burst: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = burst or per_minute
+        self.tokens = self.capacity
+        self._last = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` tokens are available (0 if available now)."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float) -> None:
+        """Take tokens; may go negative when reconciling an underestimate."""
+        self._refill()
+        self.tokens -= amount
+
+
+class Ticket:
+    """A caller waiting for (or holding) a request slot."""
+
+    __slots__ = ("agent", "priority", "tokens", "enqueued_at", "wait")
+
+    def __init__(self, agent: str, priority: int, tokens: int):
+        self.agent = agent
+        self.priority = priority
+        self.tokens = tokens
+        self.enqueued_at = time.monotonic()
+        self.wait = 0.0
+
+
+class RequestScheduler:
+    """
+    Token-bucket rate limiter with priority classes and per-agent fair queuing.
+
+    Args:
+        rpm: Requests per minute (None = unlimited)
+        tpm: Tokens per minute (None = unlimited)
+    """
+
+    def __init__(self, rpm: Optional[float] = None, tpm: Optional[float] = None):
+        self.rpm = TokenBucket(rpm) if rpm else None
+        self.tpm = TokenBucket(tpm) if tpm else None
+        self._cond = threading.Condition()
+        # priority -> agent -> FIFO of tickets; agent order is the round-robin order
+        self._queues: Dict[int, "OrderedDict[str, deque]"] = {}
+        self._waits: Dict[tuple, deque] = {}
+
+    def _head(self) -> Optional[Ticket]:
+        for priority in sorted(self._queues):
+            agents = self._queues[priority]
+            if agents:
+                return next(iter(agents.values()))[0]
+        return None
+
+    def _dequeue(self, ticket: Ticket) -> None:
+        agents = self._queues[ticket.priority]
+        queue = agents[ticket.agent]
+        queue.popleft()
+        if queue:
+            agents.move_to_end(ticket.agent)
+        else:
+            del agents[ticket.agent]
+
+    def _abandon(self, ticket: Ticket) -> None:
+        """Remove a ticket that gave up waiting, wherever it is in its queue."""
+        agents = self._queues[ticket.priority]
+        queue = agents[ticket.agent]
+        queue.remove(ticket)
+        if not queue:
+            del agents[ticket.agent]
+        self._cond.notify_all()
+
+    def acquire(self, agent: str, priority: int = INTERACTIVE, tokens: int = 0,
+                timeout: Optional[float] = None) -> Ticket:
+        """
+        Block until this caller may send a request.
+
+        Args:
+            agent: Name used for fair queuing between agents
+            priority: ``INTERACTIVE`` or ``BATCH``
+            tokens: Estimated prompt + output tokens of the request
+            timeout: Seconds to wait at most (None = no limit)
+
+        Returns:
+            A ``Ticket``; pass it to ``release`` with the actual token usage
+
+        Raises:
+            QueueTimeoutError: No slot became free within ``timeout``; the
+                caller has left the queue and consumed no quota
+        """
+        ticket = Ticket(agent, priority, tokens)
+        expires = ticket.enqueued_at + timeout if timeout is not None else None
+        with self._cond:
+            self._queues.setdefault(priority, OrderedDict()).setdefault(agent, deque()).append(ticket)
+            while True:
+                delay = None
+                if self._head() is ticket:
+                    delay = max(self.rpm.wait_time(1) if self.rpm else 0.0,
+                                self.tpm.wait_time(tokens) if self.tpm else 0.0)
+                    if delay <= 0:
+                        break
+                if expires is not None:
+                    remaining = expires - time.monotonic()
+                    if remaining <= 0:
+                        self._abandon(ticket)
+                        raise QueueTimeoutError(f"no request slot for {agent} within {timeout:.1f}s")
+                    delay = remaining if delay is None else min(delay, remaining)
+                self._cond.wait(delay)
+
+            if self.rpm:
+                self.rpm.consume(1)
+            if self.tpm:
+                self.tpm.consume(tokens)
+            self._dequeue(ticket)
+            ticket.wait = time.monotonic() - ticket.enqueued_at
+            self._waits.setdefault((agent, priority), deque(maxlen=1000)).append(ticket.wait)
+            self._cond.notify_all()
+        return ticket
+
+    def release(self, ticket: Ticket, actual_tokens: Optional[int] = None) -> None:
+        """Correct the tokens-per-minute bucket once the real usage is known."""
+        if self.tpm and actual_tokens is not None and actual_tokens != ticket.tokens:
+            with self._cond:
+                self.tpm.consume(actual_tokens - ticket.tokens)
+                self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, agent: str, priority: int = INTERACTIVE, tokens: int = 0,
+             timeout: Optional[float] = None) -> Iterator[Ticket]:
+        """Context manager form of ``acquire``; the caller may call ``release``."""
+        yield self.acquire(agent, priority, tokens, timeout)
+
+    def queue_depth(self) -> int:
+        """Number of callers currently waiting."""
+        with self._cond:
+            return sum(len(q) for agents in self._queues.values() for q in agents.values())
+
+    def stats(self) -> List[Dict]:
+        """Queue-wait statistics per (agent, priority)."""
+        rows = []
+        with self._cond:
+            items = sorted((k, sorted(v)) for k, v in self._waits.items())
+        for (agent, priority), waits in items:
+            rows.append({
+                "agent": agent,
+                "priority": PRIORITY_NAMES.get(priority, str(priority)),
+                "requests": len(waits),
+                "wait_avg": sum(waits) / len(waits),
+                "wait_p50": waits[len(waits) // 2],
+                "wait_p99": waits[min(len(waits) - 1, int(len(waits) * 0.99))],
+                "wait_max": waits[-1],
+            })
+        return rows
+
+
+_scheduler: Optional[RequestScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def _env_limit(name: str) -> Optional[float]:
+    value = os.getenv(name)
+    return float(value) if value else None
+
+
+def get_scheduler() -> RequestScheduler:
+    """Return the process-wide scheduler, creating it from the environment on first use."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = RequestScheduler(rpm=_env_limit("GEMINI_RPM"), tpm=_env_limit("GEMINI_TPM"))
+        return _scheduler
+
+
+def configure_scheduler(rpm: Optional[float] = None, tpm: Optional[float] = None) -> RequestScheduler:
+    """Replace the process-wide scheduler with one using the given limits."""
+    global _scheduler
+    with _scheduler_lock:
+        _scheduler = RequestScheduler(rpm=rpm, tpm=tpm)
+        return _scheduler
+
+
+def estimate_tokens(contents, max_output_tokens: int = 512) -> int:
+    """Rough token estimate for a request: ~4 characters per token plus the output budget."""
+    return len(str(contents)) // 4 + max_output_tokens
@@ -0,0 +1,90 @@
+"""
+Request coalescing ("single-flight") for identical in-flight calls.
+
+When several threads ask for the same key at the same time, only the first
+one (the leader) runs the upstream call; the others wait for it and receive
+the same result or exception. Nothing is cached once the call finishes.
+"""
+
+import threading
+from typing import Callable, Dict, Hashable
+
+from .instrumentation import get_tracer
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key.
+
+    Args:
+        agent: Agent name reported on spans for coalesced calls
+        method: Method name reported on spans for coalesced calls
+    """
+
+    def __init__(self, agent: str, method: str):
+        self.agent = agent
+        self.method = method
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.upstream_calls = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], object]):
+        """
+        Return ``fn()``, sharing one execution among concurrent callers with the same key.
+
+        Coalesced callers are recorded as spans with ``cache_hit=True``.
+        """
+        with self._lock:
+            self.requests += 1
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                leader = True
+                self.upstream_calls += 1
+            else:
+                call.waiters += 1
+                leader = False
+                self.coalesced += 1
+
+        if not leader:
+            with get_tracer().span(self.agent, self.method) as span:
+                span.cache_hit = True
+                call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> Dict:
+        """Counters for requests, upstream calls and coalesced requests."""
+        with self._lock:
+            return {
+                "agent": self.agent,
+                "method": self.method,
+                "requests": self.requests,
+                "upstream_calls": self.upstream_calls,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls),
+            }
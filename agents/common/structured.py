@@ -0,0 +1,191 @@
+"""
+Schema-constrained JSON output for model calls.
+
+Instead of scraping answers out of free text with regexes, agents ask the
+model for JSON matching a schema (Gemini's ``response_mime_type`` /
+``response_schema``) and parse the reply with ``parse``: a single
+``json.loads`` plus a validator for the schema subset Gemini accepts
+(``type``, ``properties``, ``required``, ``items``, ``enum``,
+``nullable``). A reply that still does not parse or validate gets exactly
+one repair request, which shows the model its output and the errors.
+
+Every structured call is recorded as a span named ``<method>.parse`` on
+the shared tracer, with ``parse_failures`` set to the number of replies
+that failed to parse, ``retries`` to the number of repair requests and
+``error`` set when the repair failed too, so ``--profile`` and the
+Prometheus sink report parse-failure and retry rates per agent.
+"""
+
+import json
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from .instrumentation import get_tracer
+
+_TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "boolean": bool,
+    "integer": int,
+    "number": (int, float),
+}
+_FENCE = re.compile(r"^```(?:json)?\s*(.*?)\s*```$", re.DOTALL)
+
+
+class ParseError(ValueError):
+    """A model reply that is not valid JSON or does not match its schema."""
+
+    def __init__(self, message: str, text: str = "", errors: Optional[List[str]] = None):
+        super().__init__(message)
+        self.text = text
+        self.errors = errors or [message]
+
+
+def json_config(schema: Dict, **options) -> Dict:
+    """``generation_config`` asking for JSON that matches ``schema``."""
+    return {"response_mime_type": "application/json", "response_schema": schema, **options}
+
+
+def validate(value: Any, schema: Dict, path: str = "$") -> List[str]:
+    """Return the ways ``value`` violates ``schema`` (empty if it matches)."""
+    if value is None:
+        return [] if schema.get("nullable") else [f"{path}: null is not allowed"]
+    kind = schema.get("type", "").lower()
+    expected = _TYPES.get(kind)
+    # bool is an int subclass but never a valid integer/number here
+    if expected and (not isinstance(value, expected) or (kind in ("integer", "number") and isinstance(value, bool))):
+        return [f"{path}: expected {kind}, got {type(value).__name__}"]
+    if "enum" in schema and value not in schema["enum"]:
+        return [f"{path}: {value!r} is not one of {schema['enum']}"]
+
+    errors = []
+    if kind == "object":
+        for name in schema.get("required", ()):
+            if name not in value:
+                errors.append(f"{path}: missing required field '{name}'")
+        for name, subschema in schema.get("properties", {}).items():
+            if name in value:
+                errors.extend(validate(value[name], subschema, f"{path}.{name}"))
+    elif kind == "array" and "items" in schema:
+        for i, item in enumerate(value):
+            errors.extend(validate(item, schema["items"], f"{path}[{i}]"))
+    return errors
+
+
+def parse(text: str, schema: Dict) -> Any:
+    """
+    Parse a JSON reply and validate it against ``schema``.
+
+    A surrounding markdown code fence is tolerated (models sometimes add one
+    outside JSON mode); nothing else is guessed.
+
+    Raises:
+        ParseError: The reply is not JSON or does not match the schema
+    """
+    body = text.strip()
+    fenced = _FENCE.match(body)
+    if fenced:
+        body = fenced.group(1)
+    try:
+        value = json.loads(body)
+    except ValueError as e:
+        raise ParseError(f"invalid JSON: {e}", text) from None
+    errors = validate(value, schema)
+    if errors:
+        raise ParseError("; ".join(errors[:5]), text, errors)
+    return value
+
+
+REPAIR_PROMPT = """Your previous reply was supposed to be JSON matching this schema:
+{schema}
+
+It had these problems:
+{errors}
+
+Previous reply:
+{text}
+
+Reply with the corrected JSON only."""
+
+
+class StructuredOutput:
+    """
+    Request, parse and (once) repair JSON replies for one agent method.
+
+    Args:
+        model: ``wrap_model`` proxy used for repair requests
+        schema: Response schema (OpenAPI subset, as accepted by Gemini)
+        agent: Agent name reported on spans
+        method: Method name; spans are reported as ``<method>.parse``
+    """
+
+    def __init__(self, model, schema: Dict, agent: str, method: str):
+        self.model = model
+        self.schema = schema
+        self.agent = agent
+        self.method = method
+        self.config = json_config(schema)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.parse_failures = 0
+        self.repairs = 0
+        self.unrecoverable = 0
+
+    def generate(self, prompt: str, send: Optional[Callable[..., Any]] = None, **kwargs) -> Any:
+        """
+        Send ``prompt`` in JSON mode and return the validated value.
+
+        Args:
+            prompt: Prompt to send
+            send: Call to make instead of ``model.generate_content``, e.g. a
+                chat session's ``send_message``; it receives the prompt,
+                ``generation_config`` and ``kwargs``
+            **kwargs: Passed on to ``send`` (e.g. ``hedge=True``)
+
+        Raises:
+            ParseError: The reply and the repaired reply were both unusable
+        """
+        send = send or self.model.generate_content
+        response = send(prompt, generation_config=self.config, **kwargs)
+        return self.parse_reply(response.text)
+
+    def parse_reply(self, text: str) -> Any:
+        """Parse ``text``, with one repair request if it is unusable."""
+        with get_tracer().span(self.agent, f"{self.method}.parse") as span:
+            with self._lock:
+                self.requests += 1
+            try:
+                return parse(text, self.schema)
+            except ParseError as first:
+                span.parse_failures += 1
+                span.retries += 1
+                with self._lock:
+                    self.parse_failures += 1
+                    self.repairs += 1
+                error = first
+            prompt = REPAIR_PROMPT.format(schema=json.dumps(self.schema), text=text[:4000],
+                                          errors="\n".join(f"- {e}" for e in error.errors[:10]))
+            repaired = self.model.generate_content(prompt, generation_config=self.config).text
+            try:
+                return parse(repaired, self.schema)
+            except ParseError:
+                span.parse_failures += 1
+                with self._lock:
+                    self.parse_failures += 1
+                    self.unrecoverable += 1
+                raise
+
+    def stats(self) -> Dict:
+        """Counters for requests, parse failures, repairs and unrecoverable replies."""
+        with self._lock:
+            return {
+                "agent": self.agent,
+                "method": self.method,
+                "requests": self.requests,
+                "parse_failures": self.parse_failures,
+                "repairs": self.repairs,
+                "unrecoverable": self.unrecoverable,
+                "retry_rate": self.repairs / self.requests if self.requests else 0.0,
+            }
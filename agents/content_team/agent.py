@@ -1,14 +1,19 @@
 """Multi-agent system for content creation"""
-import google.generativeai as genai
+import argparse
 from typing import Dict
 
+import google.generativeai as genai
+
+from agents.common import BATCH, wrap_model
+from agents.common.config import configure_gemini
+
 
 class WriterAgent:
     def __init__(self):
-        self.model = genai.GenerativeModel(
+        self.model = wrap_model(genai.GenerativeModel(
             'gemini-1.5-flash',
             system_instruction="You are a creative writer. Write engaging, clear content."
-        )
+        ), agent="WriterAgent", priority=BATCH)
     
     def write_content(self, topic: str, style: str = "professional") -> str:
         """Write content on a topic"""
@@ -19,14 +24,14 @@ class WriterAgent:
 
 class EditorAgent:
     def __init__(self):
-        self.model = genai.GenerativeModel(
+        self.model = wrap_model(genai.GenerativeModel(
             'gemini-1.5-flash',
             system_instruction="""You are an editor. Review content for:
             - Grammar and spelling
             - Clarity and coherence
             - Structure and flow
             - Fact-checking"""
-        )
+        ), agent="EditorAgent", priority=BATCH)
     
     def edit_content(self, content: str) -> str:
         """Edit and improve content"""
@@ -60,3 +65,19 @@ class ContentCreationTeam:
             "draft": draft,
             "edited": edited
         }
+
+
+def main(argv=None):
+    """Write and edit an article on a topic."""
+    parser = argparse.ArgumentParser(description="Content Creation Team - writer and editor agents")
+    parser.add_argument("topic", help="topic to write about")
+    parser.add_argument("--style", default="professional", help="writing style (default: professional)")
+    args = parser.parse_args(argv)
+
+    configure_gemini()
+    result = ContentCreationTeam().create_content(args.topic, args.style)
+    print("\n" + result["edited"])
+
+
+if __name__ == "__main__":
+    main()
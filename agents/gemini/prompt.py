@@ -1,13 +1,283 @@
-import google.generativeai as genai
-from dotenv import load_dotenv
+"""
+Gemini prompt runner: one query, or large prompt files in batch.
+
+Examples::
+
+    python -m agents prompt "What are AI agents?"
+    python -m agents prompt --input prompts.jsonl --output results.jsonl --concurrency 8
+    cat queries.txt | python -m agents prompt --input - --output results.jsonl
+
+Input lines are JSON objects with a ``prompt`` (sent as is) or a ``query``
+(wrapped in ``--template``) and an optional ``id``; plain text lines are
+treated as queries. Lines are read as a stream, so files of any size work.
+A record with neither ``prompt`` nor ``query`` is reported and skipped.
+
+Each result is appended to the output JSONL as soon as it finishes, so the
+output doubles as the checkpoint: running the same command again skips
+every id that already has a response and retries the ones that failed
+(the last line for an id is the one that counts).
+"""
+
+import argparse
+import json
 import os
-load_dotenv()
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, Iterator, Optional, Set, TextIO, Tuple
+
+from agents.common import BATCH, wrap_model
+from agents.common.config import configure_gemini
+
+DEFAULT_MODEL = 'gemini-2.5-flash'
+DEFAULT_TEMPLATE = "Search and summarize: {query}"
+
+
+def make_model(model_name: str = DEFAULT_MODEL):
+    # Imported here so the batch reader and runner work without the SDK
+    import google.generativeai as genai
+
+    return wrap_model(genai.GenerativeModel(model_name), agent="prompt", priority=BATCH)
+
+
+def ask(query: str, model=None, template: str = DEFAULT_TEMPLATE) -> str:
+    """Search and summarize ``query`` with Gemini."""
+    if model is None:
+        model = make_model()
+    return model.generate_content(template.format(query=query)).text
+
+
+def read_prompts(stream: TextIO, template: str = DEFAULT_TEMPLATE,
+                 on_invalid: Optional[Callable[[int, str], None]] = None) -> Iterator[Tuple[str, str]]:
+    """
+    Yield ``(id, prompt)`` pairs from a JSONL or plain-text stream, lazily.
+
+    Records without an ``id`` are identified by their line number, which
+    stays stable as long as the input does.
+
+    Args:
+        stream: Input lines
+        template: Prompt template for ``query`` records
+        on_invalid: Called with the line number and reason for each record
+            that has neither ``prompt`` nor ``query``, which is then skipped;
+            without it such a record raises ValueError
+    """
+    for number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        record = None
+        if line.startswith("{"):
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                pass
+        if record is None:
+            record = {"query": line}
+        record_id = str(record.get("id", f"line-{number}"))
+        if "prompt" in record:
+            yield record_id, record["prompt"]
+        elif "query" in record:
+            yield record_id, template.format(query=record["query"])
+        elif on_invalid is None:
+            raise ValueError(f"Input line {number} has neither 'prompt' nor 'query'")
+        else:
+            on_invalid(number, "neither 'prompt' nor 'query'")
+
+
+def load_checkpoint(path: str) -> Set[str]:
+    """
+    Return the ids already answered in an existing output file.
+
+    A line cut short by an interrupted run is truncated away so new results
+    are appended after the last complete line.
+    """
+    done: Set[str] = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, "rb+") as f:
+        data = f.read()
+        end = data.rfind(b"\n") + 1
+        if end < len(data):
+            f.truncate(end)
+    for line in data[:end].splitlines():
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if "response" in record:
+            done.add(record["id"])
+        else:
+            done.discard(record.get("id"))
+    return done
+
+
+class Progress:
+    """
+    Counters plus a live throughput line on ``stream`` (rewritten in place
+    on a terminal). With ``stream=None`` only the counters are kept.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = sys.stderr, interval: float = 1.0):
+        self.stream = stream
+        self.interval = interval
+        self.tty = stream is not None and stream.isatty()
+        self.started = time.perf_counter()
+        self.last = 0.0
+        self.done = self.failed = self.skipped = self.invalid = self.tokens = self.in_flight = 0
+
+    def line(self) -> str:
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        return (f"✓ {self.done} done, {self.failed} failed, {self.skipped} skipped | "
+                f"{self.done / elapsed:.2f} prompts/s, {self.tokens / elapsed:,.0f} tokens/s | "
+                f"{self.in_flight} in flight | {elapsed:,.0f}s")
+
+    def update(self, force: bool = False) -> None:
+        now = time.perf_counter()
+        if self.stream is None or (not force and now - self.last < self.interval):
+            return
+        self.last = now
+        if self.tty:
+            self.stream.write("\r\033[K" + self.line())
+        else:
+            self.stream.write(self.line() + "\n")
+        self.stream.flush()
+
+    def close(self) -> None:
+        self.update(force=True)
+        if self.tty:
+            self.stream.write("\n")
+
+
+class BatchRunner:
+    """
+    Run prompts through a model with bounded concurrency.
+
+    Args:
+        model: A ``wrap_model`` proxy (or anything with ``generate_content``)
+        concurrency: Maximum number of requests in flight
+        progress: Optional ``Progress`` to update as results arrive
+    """
+
+    def __init__(self, model, concurrency: int = 8, progress: Optional[Progress] = None):
+        self.model = model
+        self.concurrency = max(1, concurrency)
+        self.progress = progress if progress is not None else Progress(stream=None)
+
+    def _call(self, record_id: str, prompt: str) -> Dict:
+        started = time.perf_counter()
+        try:
+            response = self.model.generate_content(prompt)
+            result = {"id": record_id, "prompt": prompt, "response": response.text}
+            usage = getattr(response, "usage_metadata", None)
+            if usage is not None:
+                result["tokens"] = getattr(usage, "total_token_count", 0) or 0
+        except Exception as e:
+            result = {"id": record_id, "prompt": prompt, "error": f"{type(e).__name__}: {e}"}
+        result["latency_s"] = round(time.perf_counter() - started, 3)
+        return result
+
+    def run(self, prompts: Iterable[Tuple[str, str]], output: TextIO,
+            skip: Optional[Set[str]] = None) -> Progress:
+        """
+        Stream ``prompts`` through the model, appending each result to ``output``.
+
+        Input is only read as fast as slots free up, so at most
+        ``concurrency`` prompts are held in memory. On KeyboardInterrupt,
+        or an error while reading ``prompts``, no new prompts are started;
+        requests in flight are finished and written before the exception
+        propagates.
+        """
+        skip = set(skip or ())
+        progress = self.progress
+        pending = set()
+        prompts = iter(prompts)
+        exhausted = False
+
+        def drain(done_futures):
+            for future in done_futures:
+                result = future.result()
+                output.write(json.dumps(result, ensure_ascii=False) + "\n")
+                if "response" in result:
+                    progress.done += 1
+                    progress.tokens += result.get("tokens", 0)
+                else:
+                    progress.failed += 1
+            output.flush()
+            progress.in_flight = len(pending)
+            progress.update()
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            try:
+                while pending or not exhausted:
+                    while not exhausted and len(pending) < self.concurrency:
+                        item = next(prompts, None)
+                        if item is None:
+                            exhausted = True
+                        elif item[0] in skip:
+                            progress.skipped += 1
+                        else:
+                            skip.add(item[0])  # ignore later duplicates of this id
+                            pending.add(executor.submit(self._call, *item))
+                    if pending:
+                        finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        drain(finished)
+            except BaseException:
+                finished, pending = wait(pending)
+                drain(finished)
+                progress.close()
+                raise
+        progress.close()
+        return progress
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run prompts through Gemini, one-shot or in batch")
+    parser.add_argument("query", nargs="*", help="one-shot query (default: What are AI agents?)")
+    parser.add_argument("--input", help="JSONL or text file of prompts, or '-' for stdin")
+    parser.add_argument("--output", help="results JSONL, also used as the resume checkpoint")
+    parser.add_argument("--concurrency", type=int, default=8, help="requests in flight (default: 8)")
+    parser.add_argument("--model", default=DEFAULT_MODEL, help=f"model name (default: {DEFAULT_MODEL})")
+    parser.add_argument("--template", default=DEFAULT_TEMPLATE,
+                        help="prompt template for queries (default: %(default)r)")
+    parser.add_argument("--restart", action="store_true", help="ignore existing results and start over")
+    args = parser.parse_args(argv)
+
+    configure_gemini()
+    model = make_model(args.model)
+
+    if not args.input:
+        query = " ".join(args.query) or "What are AI agents?"
+        print(f"Query: {query}\n\nAnswer:\n{ask(query, model, args.template)}")
+        return
+    if not args.output:
+        parser.error("--output is required with --input")
+
+    if args.restart and os.path.exists(args.output):
+        os.remove(args.output)
+    done = load_checkpoint(args.output)
+    if done:
+        print(f"↻ Resuming: {len(done)} prompts already answered in {args.output}", file=sys.stderr)
+
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    progress = Progress()
+    runner = BatchRunner(model, args.concurrency, progress)
+
+    def invalid(number, reason):
+        progress.invalid += 1
+        print(f"\n⚠️  Skipping input line {number}: {reason}", file=sys.stderr)
 
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-model = genai.GenerativeModel('gemini-2.5-flash')
+    try:
+        with source, open(args.output, "a", encoding="utf-8") as output:
+            runner.run(read_prompts(source, args.template, invalid), output, skip=done)
+    except KeyboardInterrupt:
+        print("\n⏸️  Interrupted. Run the same command again to resume.", file=sys.stderr)
+        sys.exit(130)
+    print(f"\n✓ {progress.done} answered, {progress.failed} failed, {progress.skipped} skipped, "
+          f"{progress.invalid} invalid → {args.output}", file=sys.stderr)
+    if progress.failed:
+        print("  Failed prompts are retried when you run the same command again.", file=sys.stderr)
 
-query = "What are AI agents?"
-prompt = f"Search and summarize: {query}"
-response = model.generate_content(prompt)
 
-print(f"Query: {query}\n\nAnswer:\n{response.text}")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,20 @@
+import argparse
 import google.generativeai as genai
 import os
 from datetime import datetime
 from typing import Optional
 
-# Try to load .env file if python-dotenv is available
-try:
-    from dotenv import load_dotenv
-    load_dotenv()  # Load environment variables from .env file
-except ImportError:
-    pass  # python-dotenv not installed, will use system env variables
+from agents.common import enable_session_profile, wrap_model
+from agents.common.config import load_env
+from agents.common.history import HistoryStore
+from agents.common.profiler import enable_turn_profiler, profile_turn
+
+HISTORY_COLUMNS = (("user", "text"), ("bot", "text"))
+
+
+def format_timestamp(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
+
 
 class GeminiChatbot:
     """
@@ -30,9 +36,10 @@ class GeminiChatbot:
         
         genai.configure(api_key=self.api_key)
         self.model_name = model_name
-        self.model = genai.GenerativeModel(model_name)
+        self.model = wrap_model(genai.GenerativeModel(model_name), agent="GeminiChatbot")
         self.chat = None
-        self.conversation_history = []
+        # Columnar store: older messages are compressed, very long sessions spill to disk
+        self.conversation_history = HistoryStore(HISTORY_COLUMNS)
         self.bot_name = "Gemini"
         
     def set_personality(self, personality: str):
@@ -49,11 +56,11 @@ class GeminiChatbot:
             max_output_tokens=2048,
         )
         
-        self.model = genai.GenerativeModel(
+        self.model = wrap_model(genai.GenerativeModel(
             model_name=self.model_name,
             generation_config=generation_config,
             system_instruction=personality
-        )
+        ), agent="GeminiChatbot")
         self.chat = self.model.start_chat(history=[])
         print(f"✓ Personality set: {personality[:50]}...\n")
         
@@ -61,7 +68,7 @@ class GeminiChatbot:
         """Start a new conversation session."""
         if not self.chat:
             self.chat = self.model.start_chat(history=[])
-        self.conversation_history = []
+        self.conversation_history.clear()
         print(f"🤖 {self.bot_name}: Hello! I'm ready to chat. How can I help you today?\n")
         
     def send_message(self, user_message: str) -> str:
@@ -83,11 +90,7 @@ class GeminiChatbot:
             bot_response = response.text
             
             # Store in history
-            self.conversation_history.append({
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'user': user_message,
-                'bot': bot_response
-            })
+            self.conversation_history.append(user=user_message, bot=bot_response)
             
             return bot_response
             
@@ -104,7 +107,7 @@ class GeminiChatbot:
         summary = f"Conversation Summary ({len(self.conversation_history)} exchanges):\n"
         summary += "=" * 50 + "\n"
         for i, entry in enumerate(self.conversation_history, 1):
-            summary += f"\n[{entry['timestamp']}]\n"
+            summary += f"\n[{format_timestamp(entry['timestamp'])}]\n"
             summary += f"You: {entry['user'][:100]}{'...' if len(entry['user']) > 100 else ''}\n"
             summary += f"Bot: {entry['bot'][:100]}{'...' if len(entry['bot']) > 100 else ''}\n"
         return summary
@@ -115,7 +118,7 @@ class GeminiChatbot:
             f.write(f"Gemini Chatbot Conversation Log\n")
             f.write(f"{'=' * 50}\n\n")
             for entry in self.conversation_history:
-                f.write(f"[{entry['timestamp']}]\n")
+                f.write(f"[{format_timestamp(entry['timestamp'])}]\n")
                 f.write(f"USER: {entry['user']}\n")
                 f.write(f"BOT: {entry['bot']}\n")
                 f.write(f"{'-' * 50}\n\n")
@@ -124,7 +127,7 @@ class GeminiChatbot:
     def clear_conversation(self):
         """Clear conversation history and start fresh."""
         self.chat = self.model.start_chat(history=[])
-        self.conversation_history = []
+        self.conversation_history.clear()
         print("✓ Conversation cleared!\n")
 
 
@@ -142,8 +145,21 @@ def print_commands():
     print("=" * 50 + "\n")
 
 
-def main():
+def main(argv=None):
     """Main function to run the chatbot."""
+    parser = argparse.ArgumentParser(description="Gemini Chatbot - Powered by Google AI")
+    parser.add_argument("--profile", action="store_true",
+                        help="print a per-session latency/token/cost breakdown on exit")
+    parser.add_argument("--flamegraph", metavar="PATH",
+                        help="sample each turn, report wall/CPU/network time on exit and write the "
+                             "stacks to PATH (.json: speedscope, otherwise collapsed stacks)")
+    args = parser.parse_args(argv)
+    if args.profile:
+        enable_session_profile()
+    if args.flamegraph:
+        enable_turn_profiler(args.flamegraph)
+    load_env()
+
     print("\n" + "🤖 " + "=" * 48)
     print("   GEMINI CHATBOT - Powered by Google AI")
     print("=" * 50 + "\n")
@@ -209,8 +225,9 @@ def main():
                         continue
                 
                 # Send message and display response
-                response = chatbot.send_message(user_input)
-                print(f"\n🤖 {chatbot.bot_name}: {response}\n")
+                with profile_turn("send_message"):
+                    response = chatbot.send_message(user_input)
+                    print(f"\n🤖 {chatbot.bot_name}: {response}\n")
                 
             except KeyboardInterrupt:
                 print(f"\n\n👋 {chatbot.bot_name}: Goodbye!")
@@ -1,25 +1,107 @@
+import argparse
+import time
+from itertools import repeat
+
+from agents.goal_based_agent.planning import DStarLite, search
+
+
 class GoalBasedAgent:
-    def __init__(self, goal):
+    def __init__(self, goal, world=None, algorithm="astar", start=0, replanning=None):
+        """
+        Args:
+            goal: Goal state (a position on the line, or a state of ``world``)
+            world: Optional world from ``planning`` (GridWorld, GraphWorld, ...).
+                Without one the agent lives on a line and only moves forward.
+            algorithm: Planner used with a world: astar, dijkstra or bfs
+            start: Initial state
+            replanning: What to do when the world changes during execution:
+                None (ignore), "full" (plan again from scratch) or
+                "incremental" (repair the plan with D* Lite)
+        """
         self.goal = goal
-        self.position = 0
-    
+        self.world = world
+        self.algorithm = algorithm
+        self.position = start
+        self.replanning = replanning
+        self.replan_times = []
+
     def plan(self, current_state, goal_state):
-        """Create a plan to reach the goal"""
-        steps = []
-        while current_state < goal_state:
-            steps.append("move_forward")
-            current_state += 1
-        return steps
-    
-    def execute_plan(self):
-        """Execute the planned actions"""
-        plan = self.plan(self.position, self.goal)
-        for step in plan:
+        """Create a plan to reach the goal (an iterable of actions, produced lazily)"""
+        if self.world is None:
+            return repeat("move_forward", max(0, goal_state - current_state))
+        plan = search(self.world, current_state, goal_state, self.algorithm)
+        if not plan.found:
+            raise ValueError(f"Goal {goal_state} is unreachable from {current_state}")
+        return plan
+
+    def execute_plan(self, observe=None):
+        """
+        Execute the planned actions
+
+        Args:
+            observe: Optional ``observe(position)`` called after every step; it
+                returns ``{state: new_cost}`` for parts of the world that changed
+                (empty if nothing changed). Changes trigger replanning according
+                to ``self.replanning``.
+        """
+        if self.world is None:
+            for step in self.plan(self.position, self.goal):
+                print(f"Executing: {step}")
+                self.position += 1
+                print(f"Current position: {self.position}")
+            print(f"Goal reached at position {self.goal}!")
+            return
+
+        planner = None
+        if self.replanning == "incremental":
+            planner = DStarLite(self.world, self.position, self.goal)
+            plan = planner.plan()
+            if not plan.found:
+                raise ValueError(f"Goal {self.goal} is unreachable from {self.position}")
+        else:
+            plan = self.plan(self.position, self.goal)
+        steps = plan.steps()
+
+        while self.position != self.goal:
+            step, state = next(steps)
             print(f"Executing: {step}")
-            self.position += 1
+            self.position = state
             print(f"Current position: {self.position}")
+
+            changes = observe(self.position) if observe else None
+            if not changes or self.replanning is None:
+                continue
+            started = time.perf_counter()
+            if planner is not None:
+                planner.move_to(self.position)
+                plan = planner.update_costs(changes)
+            else:
+                for cell, cost in changes.items():
+                    self.world.set_cost(cell, cost)
+                plan = search(self.world, self.position, self.goal, self.algorithm)
+            self.replan_times.append(time.perf_counter() - started)
+            if not plan.found:
+                raise ValueError(f"Goal {self.goal} became unreachable from {self.position}")
+            steps = plan.steps()
         print(f"Goal reached at position {self.goal}!")
 
-# Usage
-agent = GoalBasedAgent(goal=5)
-agent.execute_plan()
+
+def main(argv=None):
+    """Walk an agent to its goal on a line, or across a random grid."""
+    parser = argparse.ArgumentParser(description="Goal-based agent demo")
+    parser.add_argument("--goal", type=int, default=5, help="goal position on the line (default: 5)")
+    parser.add_argument("--grid", type=int, metavar="SIZE", help="plan across a random SIZE x SIZE grid instead")
+    parser.add_argument("--algorithm", choices=["astar", "dijkstra", "bfs"], default="astar")
+    args = parser.parse_args(argv)
+
+    if args.grid:
+        from agents.goal_based_agent.planning import GridWorld
+        world = GridWorld.random(args.grid, args.grid, 0.2, seed=1)
+        agent = GoalBasedAgent(goal=world.size - 1, world=world, algorithm=args.algorithm)
+    else:
+        agent = GoalBasedAgent(goal=args.goal)
+    agent.execute_plan()
+
+
+if __name__ == "__main__":
+    main()
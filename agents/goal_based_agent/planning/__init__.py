@@ -0,0 +1,20 @@
+"""
+Search-based planning for the goal-based agent.
+"""
+
+from .dstar_lite import DStarLite
+from .search import ALGORITHMS, Plan, astar, bidirectional_bfs, dijkstra, search
+from .worlds import GraphWorld, GridWorld, LineWorld
+
+__all__ = [
+    'ALGORITHMS',
+    'DStarLite',
+    'GraphWorld',
+    'GridWorld',
+    'LineWorld',
+    'Plan',
+    'astar',
+    'bidirectional_bfs',
+    'dijkstra',
+    'search',
+]
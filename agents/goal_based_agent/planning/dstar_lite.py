@@ -0,0 +1,209 @@
+"""
+Incremental replanning with D* Lite (Koenig & Likhachev, 2002).
+
+D* Lite searches backwards from the goal and keeps its search state (g and
+rhs values, open list) between plans. When edge costs change it only
+re-expands the states whose distance to the goal actually changed, so a
+plan invalidated by a new obstacle is repaired instead of rebuilt.
+"""
+
+import heapq
+import time
+from array import array
+from typing import Dict, Iterable, Tuple
+
+from .search import Plan
+
+INF = float("inf")
+# Keys and costs are sums of float step costs (diagonal moves cost sqrt(2)),
+# so values that are equal in exact arithmetic can differ in the last bits
+EPS = 1e-9
+
+
+def _less(a: Tuple[float, float], b: Tuple[float, float]) -> bool:
+    """Key order with a tolerance: near-ties compare by the second component."""
+    if a[0] < b[0] - EPS:
+        return True
+    if a[0] > b[0] + EPS:
+        return False
+    return a[1] < b[1] - EPS
+
+
+def _done(top: Tuple[float, float], start: Tuple[float, float]) -> bool:
+    """
+    True once ``top`` is clearly past the start's key.
+
+    The heap orders near-ties by their exact (noisy) first component, so a
+    state whose first component ties with the start's may sit below one that
+    does not need expanding. Near-ties are therefore always expanded, which
+    is safe: expanding more than needed never makes g values wrong.
+    """
+    return top[0] > start[0] + EPS
+
+
+def _differ(a: float, b: float) -> bool:
+    """True unless ``a`` and ``b`` are equal up to rounding (INF only equals INF)."""
+    if a == INF or b == INF:
+        return a != b
+    return abs(a - b) > EPS
+
+
+class DStarLite:
+    """
+    D* Lite planner bound to one world and goal.
+
+    Args:
+        world: A world with ``successors``, ``neighbors`` and ``heuristic``
+            (e.g. ``GridWorld``)
+        start: Current state of the agent
+        goal: Goal state
+
+    Typical use::
+
+        planner = DStarLite(world, start, goal)
+        plan = planner.plan()
+        ...                                   # agent moves along the plan
+        planner.move_to(current_state)
+        plan = planner.update_costs({cell: 0})  # a cell became blocked
+    """
+
+    def __init__(self, world, start, goal):
+        self.world = world
+        self.start = start
+        self.goal = goal
+        self.km = 0.0
+        self._last = start
+        self.g: Dict = {}
+        self.rhs: Dict = {goal: 0.0}
+        self._queue = []
+        self._queued: Dict = {}
+        self._is_free = getattr(world, "is_free", lambda state: True)
+        self.expansions = 0
+        self.last_expansions = 0
+        self.last_elapsed = 0.0
+        self._push(goal)
+
+    def _h(self, state) -> float:
+        return self.world.heuristic(self.start, state)
+
+    def _key(self, state) -> Tuple[float, float]:
+        best = min(self.g.get(state, INF), self.rhs.get(state, INF))
+        return (best + self._h(state) + self.km, best)
+
+    def _push(self, state) -> None:
+        key = self._key(state)
+        self._queued[state] = key
+        heapq.heappush(self._queue, (key, state))
+
+    def _top(self):
+        # Entries whose key no longer matches are stale (lazy deletion)
+        queue = self._queue
+        while queue and self._queued.get(queue[0][1]) != queue[0][0]:
+            heapq.heappop(queue)
+        return queue[0] if queue else None
+
+    def _update_vertex(self, state) -> None:
+        if state != self.goal:
+            best = INF
+            if self._is_free(state):
+                g = self.g
+                for nxt, cost in self.world.successors(state):
+                    value = cost + g.get(nxt, INF)
+                    if value < best:
+                        best = value
+            self.rhs[state] = best
+        self._queued.pop(state, None)
+        if _differ(self.g.get(state, INF), self.rhs.get(state, INF)):
+            self._push(state)
+
+    def _compute(self) -> None:
+        began = time.perf_counter()
+        expansions = 0
+        g, rhs = self.g, self.rhs
+        neighbors = self.world.neighbors
+        while True:
+            top = self._top()
+            start_consistent = not _differ(g.get(self.start, INF), rhs.get(self.start, INF))
+            if top is None or (_done(top[0], self._key(self.start)) and start_consistent):
+                break
+            key_old, state = heapq.heappop(self._queue)
+            del self._queued[state]
+            key_new = self._key(state)
+            expansions += 1
+            if _less(key_old, key_new):
+                self._push(state)
+            elif g.get(state, INF) > rhs.get(state, INF):
+                g[state] = rhs[state]
+                for pred in neighbors(state):
+                    self._update_vertex(pred)
+            else:
+                g[state] = INF
+                self._update_vertex(state)
+                for pred in neighbors(state):
+                    self._update_vertex(pred)
+        self.expansions += expansions
+        self.last_expansions = expansions
+        self.last_elapsed = time.perf_counter() - began
+
+    def _extract(self, began: float) -> Plan:
+        """Follow the cheapest successors from the start; not found unless that reaches the goal."""
+        empty = array("q") if self.world.size is not None else []
+        if self.g.get(self.start, INF) == INF:
+            return Plan(self.world, empty, INF, self.last_expansions, time.perf_counter() - began)
+        g = self.g
+        state = self.start
+        states = array("q") if self.world.size is not None else []
+        states.append(state)
+        visited = {state}
+        cost = 0.0
+        while state != self.goal:
+            best, best_value, best_step = None, INF, 0.0
+            for nxt, step in self.world.successors(state):
+                value = step + g.get(nxt, INF)
+                if value < best_value:
+                    best, best_value, best_step = nxt, value, step
+            if best is None or best in visited:
+                # Dead end or a cycle: the g values do not lead to the goal
+                return Plan(self.world, empty, INF, self.last_expansions, time.perf_counter() - began)
+            cost += best_step
+            state = best
+            states.append(state)
+            visited.add(state)
+        return Plan(self.world, states, cost, self.last_expansions, time.perf_counter() - began)
+
+    def plan(self) -> Plan:
+        """Compute (or finish computing) the shortest path from the current start."""
+        began = time.perf_counter()
+        self._compute()
+        return self._extract(began)
+
+    def move_to(self, state) -> None:
+        """Tell the planner the agent now stands on ``state``."""
+        self.start = state
+
+    def update_costs(self, changes: Dict) -> Plan:
+        """
+        Apply cost changes and repair the plan.
+
+        Args:
+            changes: ``{state: new_cost}``; for ``GridWorld`` a cost of 0 blocks the cell
+
+        Returns:
+            The repaired ``Plan`` from the current start
+        """
+        began = time.perf_counter()
+        self.km += self.world.heuristic(self._last, self.start)
+        self._last = self.start
+        for state, cost in changes.items():
+            self.world.set_cost(state, cost)
+        self._touch(changes)
+        self._compute()
+        return self._extract(began)
+
+    def _touch(self, states: Iterable) -> None:
+        # Entering a changed state costs differently, so every state that can
+        # step into it needs its rhs recomputed
+        for state in states:
+            self._update_vertex(state)
+            for pred in self.world.neighbors(state):
+                self._update_vertex(pred)
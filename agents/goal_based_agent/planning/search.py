@@ -0,0 +1,239 @@
+"""
+Graph search planners: A*, Dijkstra and bidirectional BFS.
+
+For worlds whose states are the integers ``0..size-1`` (``world.size`` set,
+e.g. ``GridWorld``) the planners use compact structures:
+
+- the closed set is a bitset in a ``bytearray`` (1 bit per state, 12.5 MB
+  for a 10k x 10k grid)
+- open-list entries are single ints packing ``(f, state)`` instead of tuples
+- g-scores and parents are only stored for states actually reached
+- the resulting path is an ``array('q')`` of states; actions are produced
+  lazily while iterating the ``Plan``
+"""
+
+import heapq
+import time
+from array import array
+from itertools import count
+from typing import Dict, Hashable, Iterator, Tuple
+
+# Fixed-point scale used when packing f-scores into open-list ints
+_F_SCALE = 1024
+
+
+class Plan:
+    """
+    Result of a search.
+
+    Iterating a plan lazily yields action names; ``steps()`` yields
+    ``(action, next_state)`` pairs. ``states`` holds the visited states,
+    start and goal included.
+    """
+
+    def __init__(self, world, states, cost: float, expansions: int, elapsed: float):
+        self.world = world
+        self.states = states
+        self.cost = cost
+        self.expansions = expansions
+        self.elapsed = elapsed
+
+    @property
+    def found(self) -> bool:
+        return len(self.states) > 0
+
+    def __len__(self) -> int:
+        return max(0, len(self.states) - 1)
+
+    def __iter__(self) -> Iterator[str]:
+        for action, _ in self.steps():
+            yield action
+
+    def steps(self) -> Iterator[Tuple[str, Hashable]]:
+        states = self.states
+        action_name = self.world.action_name
+        for i in range(1, len(states)):
+            yield action_name(states[i - 1], states[i]), states[i]
+
+    @property
+    def expansions_per_sec(self) -> float:
+        return self.expansions / self.elapsed if self.elapsed else 0.0
+
+    def __repr__(self):
+        return (f"Plan(steps={len(self)}, cost={self.cost:g}, expansions={self.expansions}, "
+                f"elapsed={self.elapsed:.3f}s)")
+
+
+def _path(world, parents: Dict, start, goal):
+    """Walk parent links back from ``goal`` and return the states in order."""
+    states = array("q") if world.size is not None else []
+    state = goal
+    while state != start:
+        states.append(state)
+        state = parents[state]
+    states.append(start)
+    states.reverse()
+    return states
+
+
+def _empty(world):
+    return array("q") if world.size is not None else []
+
+
+def astar(world, start, goal, heuristic: bool = True) -> Plan:
+    """
+    A* search from ``start`` to ``goal``.
+
+    Args:
+        world: A world (see ``worlds``)
+        start: Start state
+        goal: Goal state
+        heuristic: Use the world's heuristic; False turns A* into Dijkstra
+
+    Returns:
+        A ``Plan``; ``plan.found`` is False if the goal is unreachable
+    """
+    began = time.perf_counter()
+    h = world.heuristic if heuristic else (lambda state, goal: 0.0)
+    successors = world.successors
+    g: Dict = {start: 0.0}
+    parents: Dict = {}
+    expansions = 0
+
+    if world.size is not None:
+        # Packed int entries: (f * scale) << bits | state
+        bits = world.size.bit_length()
+        mask = (1 << bits) - 1
+        closed = bytearray((world.size >> 3) + 1)
+        heap = [(int(h(start, goal) * _F_SCALE) << bits) | start]
+        while heap:
+            state = heapq.heappop(heap) & mask
+            byte, bit = state >> 3, 1 << (state & 7)
+            if closed[byte] & bit:
+                continue
+            closed[byte] |= bit
+            expansions += 1
+            if state == goal:
+                return Plan(world, _path(world, parents, start, goal), g[goal],
+                            expansions, time.perf_counter() - began)
+            g_state = g[state]
+            for nxt, cost in successors(state):
+                if closed[nxt >> 3] & (1 << (nxt & 7)):
+                    continue
+                tentative = g_state + cost
+                if tentative < g.get(nxt, float("inf")):
+                    g[nxt] = tentative
+                    parents[nxt] = state
+                    f = tentative + h(nxt, goal)
+                    heapq.heappush(heap, (int(f * _F_SCALE) << bits) | nxt)
+    else:
+        closed_set = set()
+        tie = count()
+        heap = [(h(start, goal), next(tie), start)]
+        while heap:
+            _, _, state = heapq.heappop(heap)
+            if state in closed_set:
+                continue
+            closed_set.add(state)
+            expansions += 1
+            if state == goal:
+                return Plan(world, _path(world, parents, start, goal), g[goal],
+                            expansions, time.perf_counter() - began)
+            g_state = g[state]
+            for nxt, cost in successors(state):
+                if nxt in closed_set:
+                    continue
+                tentative = g_state + cost
+                if tentative < g.get(nxt, float("inf")):
+                    g[nxt] = tentative
+                    parents[nxt] = state
+                    heapq.heappush(heap, (tentative + h(nxt, goal), next(tie), nxt))
+
+    return Plan(world, _empty(world), float("inf"), expansions, time.perf_counter() - began)
+
+
+def dijkstra(world, start, goal) -> Plan:
+    """Uniform-cost search (A* without a heuristic)."""
+    return astar(world, start, goal, heuristic=False)
+
+
+def bidirectional_bfs(world, start, goal) -> Plan:
+    """
+    Breadth-first search from both ends, expanding the smaller frontier.
+
+    Finds a plan with the fewest steps, ignoring action costs. Requires
+    ``world.predecessors``.
+    """
+    began = time.perf_counter()
+    if start == goal:
+        return Plan(world, _path(world, {}, start, goal), 0.0, 0, time.perf_counter() - began)
+
+    indexed = world.size is not None
+    forward: Dict = {start: None}
+    backward: Dict = {goal: None}
+    front = array("q", [start]) if indexed else [start]
+    back = array("q", [goal]) if indexed else [goal]
+    expansions = 0
+    meet = None
+
+    while front and back and meet is None:
+        if len(front) <= len(back):
+            frontier, seen, other, neighbors = front, forward, backward, world.successors
+        else:
+            frontier, seen, other, neighbors = back, backward, forward, world.predecessors
+        next_frontier = array("q") if indexed else []
+        for state in frontier:
+            expansions += 1
+            for nxt, _ in neighbors(state):
+                if nxt in seen:
+                    continue
+                seen[nxt] = state
+                if nxt in other:
+                    meet = nxt
+                    break
+                next_frontier.append(nxt)
+            if meet is not None:
+                break
+        if frontier is front:
+            front = next_frontier
+        else:
+            back = next_frontier
+
+    if meet is None:
+        return Plan(world, _empty(world), float("inf"), expansions, time.perf_counter() - began)
+
+    states = _empty(world)
+    state = meet
+    while state is not None:
+        states.append(state)
+        state = forward[state]
+    states.reverse()
+    state = backward[meet]
+    while state is not None:
+        states.append(state)
+        state = backward[state]
+    return Plan(world, states, float(len(states) - 1), expansions, time.perf_counter() - began)
+
+
+ALGORITHMS = {
+    "astar": astar,
+    "dijkstra": dijkstra,
+    "bfs": bidirectional_bfs,
+}
+
+
+def search(world, start, goal, algorithm: str = "astar") -> Plan:
+    """
+    Plan a path from ``start`` to ``goal``.
+
+    Args:
+        world: A world (see ``worlds``)
+        start: Start state
+        goal: Goal state
+        algorithm: ``astar``, ``dijkstra`` or ``bfs`` (bidirectional BFS)
+    """
+    try:
+        planner = ALGORITHMS[algorithm]
+    except KeyError:
+        raise ValueError(f"Unknown algorithm '{algorithm}'. Choose from: {', '.join(ALGORITHMS)}")
+    return planner(world, start, goal)
@@ -0,0 +1,186 @@
+"""
+State/action models the planners search over.
+
+A world exposes:
+
+- ``successors(state)``   -> iterable of ``(next_state, cost)``
+- ``predecessors(state)`` -> same, for searching backwards (bidirectional BFS)
+- ``heuristic(state, goal)`` -> admissible cost estimate (0 is always valid)
+- ``action_name(state, next_state)`` -> name of the action between two states
+- ``size`` -> number of states if they are the integers ``0..size-1``,
+  which lets the planners use compact array-backed closed sets; else None
+
+Worlds used for incremental replanning (``DStarLite``) also expose
+``neighbors(state)``: every state whose edges to ``state`` may change when
+the cost of ``state`` changes.
+"""
+
+import math
+import random
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+SQRT2 = math.sqrt(2)
+
+
+class LineWorld:
+    """The original 1-D world of ``GoalBasedAgent``: integer positions on a line."""
+
+    size = None
+
+    def successors(self, state: int) -> Iterable[Tuple[int, float]]:
+        return ((state + 1, 1.0), (state - 1, 1.0))
+
+    predecessors = successors
+
+    def heuristic(self, state: int, goal: int) -> float:
+        return abs(goal - state)
+
+    def action_name(self, state: int, next_state: int) -> str:
+        return "move_forward" if next_state > state else "move_backward"
+
+
+class GridWorld:
+    """
+    A width x height grid with per-cell entry costs.
+
+    Cells are the integers ``y * width + x``. Costs live in one ``bytearray``
+    (one byte per cell): 0 means blocked, 1-255 is the cost of entering the
+    cell. A 10k x 10k grid therefore takes 100 MB.
+
+    Args:
+        width: Number of columns
+        height: Number of rows
+        costs: Optional ``bytearray`` of ``width * height`` entry costs (default: all 1)
+        diagonal: Allow 8-connected moves (diagonal moves cost sqrt(2) x entry cost)
+    """
+
+    ACTIONS = {
+        (1, 0): "move_east", (-1, 0): "move_west", (0, 1): "move_south", (0, -1): "move_north",
+        (1, 1): "move_southeast", (-1, 1): "move_southwest",
+        (1, -1): "move_northeast", (-1, -1): "move_northwest",
+    }
+
+    def __init__(self, width: int, height: int, costs: Optional[bytearray] = None, diagonal: bool = False):
+        self.width = width
+        self.height = height
+        self.size = width * height
+        self.costs = costs if costs is not None else bytearray(b"\x01") * self.size
+        if len(self.costs) != self.size:
+            raise ValueError("costs must have width * height entries")
+        self.diagonal = diagonal
+        self.min_cost = 1
+
+    @classmethod
+    def random(cls, width: int, height: int, obstacle_ratio: float = 0.2,
+               seed: int = 0, diagonal: bool = False) -> "GridWorld":
+        """Grid with randomly placed obstacles; corners are always free."""
+        cutoff = int(obstacle_ratio * 256)
+        table = bytes(0 if b < cutoff else 1 for b in range(256))
+        costs = bytearray(random.Random(seed).randbytes(width * height).translate(table))
+        costs[0] = costs[-1] = 1
+        return cls(width, height, costs, diagonal)
+
+    def cell(self, x: int, y: int) -> int:
+        return y * self.width + x
+
+    def xy(self, cell: int) -> Tuple[int, int]:
+        return cell % self.width, cell // self.width
+
+    def is_free(self, cell: int) -> bool:
+        return self.costs[cell] != 0
+
+    def set_cost(self, cell: int, cost: int) -> None:
+        """Change the cost of entering ``cell`` (0 blocks it)."""
+        self.costs[cell] = cost
+
+    def successors(self, state: int) -> List[Tuple[int, float]]:
+        w = self.width
+        costs = self.costs
+        x = state % w
+        out = []
+        if x + 1 < w and costs[state + 1]:
+            out.append((state + 1, costs[state + 1]))
+        if x > 0 and costs[state - 1]:
+            out.append((state - 1, costs[state - 1]))
+        if state + w < self.size and costs[state + w]:
+            out.append((state + w, costs[state + w]))
+        if state >= w and costs[state - w]:
+            out.append((state - w, costs[state - w]))
+        if self.diagonal:
+            for dx, dy in ((1, 1), (-1, 1), (1, -1), (-1, -1)):
+                nx = x + dx
+                n = state + dy * w + dx
+                if 0 <= nx < w and 0 <= n < self.size and costs[n]:
+                    out.append((n, costs[n] * SQRT2))
+        return out
+
+    def neighbors(self, state: int) -> List[int]:
+        """All in-bounds adjacent cells, blocked or not."""
+        w = self.width
+        x = state % w
+        out = []
+        if x + 1 < w:
+            out.append(state + 1)
+        if x > 0:
+            out.append(state - 1)
+        if state + w < self.size:
+            out.append(state + w)
+        if state >= w:
+            out.append(state - w)
+        if self.diagonal:
+            for dx, dy in ((1, 1), (-1, 1), (1, -1), (-1, -1)):
+                n = state + dy * w + dx
+                if 0 <= x + dx < w and 0 <= n < self.size:
+                    out.append(n)
+        return out
+
+    def predecessors(self, state: int) -> List[Tuple[int, float]]:
+        # Entry costs make the grid directed; for BFS only connectivity matters
+        if not self.costs[state]:
+            return []
+        cost = self.costs[state]
+        return [(n, cost) for n, _ in self.successors(state)]
+
+    def heuristic(self, state: int, goal: int) -> float:
+        w = self.width
+        dx = abs(state % w - goal % w)
+        dy = abs(state // w - goal // w)
+        if self.diagonal:
+            return self.min_cost * (max(dx, dy) + (SQRT2 - 1) * min(dx, dy))
+        return self.min_cost * (dx + dy)
+
+    def action_name(self, state: int, next_state: int) -> str:
+        w = self.width
+        return self.ACTIONS[(next_state % w - state % w, next_state // w - state // w)]
+
+
+class GraphWorld:
+    """
+    An explicit weighted graph.
+
+    Args:
+        edges: ``{node: [(neighbor, cost), ...]}``
+        heuristic: Optional ``heuristic(node, goal)`` function
+    """
+
+    size = None
+
+    def __init__(self, edges: Dict[Hashable, List[Tuple[Hashable, float]]], heuristic=None):
+        self.edges = edges
+        self._heuristic = heuristic
+        self._reverse: Dict[Hashable, List[Tuple[Hashable, float]]] = {}
+        for node, neighbors in edges.items():
+            for neighbor, cost in neighbors:
+                self._reverse.setdefault(neighbor, []).append((node, cost))
+
+    def successors(self, state):
+        return self.edges.get(state, ())
+
+    def predecessors(self, state):
+        return self._reverse.get(state, ())
+
+    def heuristic(self, state, goal) -> float:
+        return self._heuristic(state, goal) if self._heuristic else 0.0
+
+    def action_name(self, state, next_state) -> str:
+        return f"move_to:{next_state}"
@@ -3,9 +3,59 @@ Learning Path Advisor
 A simple agent that creates personalized learning paths for any topic.
 """
 
+import argparse
+import copy
+import os
 import google.generativeai as genai
 from datetime import datetime
-from typing import Dict
+from typing import Dict, List, Optional, Sequence
+
+from agents.common import BATCH, enable_session_profile, wrap_model
+from agents.common.profiler import enable_turn_profiler, profile_turn
+from agents.common.singleflight import SingleFlight
+from agents.common.structured import StructuredOutput
+from agents.learning_advisor.prefetch import DEFAULT_FOLLOW_UPS, FollowUpPrefetcher
+
+# Concurrent identical learning-path requests share one generation
+_path_flight = SingleFlight("LearningPathAdvisor", "create_learning_path")
+
+_STRINGS = {"type": "array", "items": {"type": "string"}}
+LEARNING_PATH_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "overview": {"type": "string"},
+        "phases": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string"},
+                    "duration": {"type": "string"},
+                    "objectives": _STRINGS,
+                    "concepts": _STRINGS,
+                    "exercises": _STRINGS,
+                    "milestone_project": {"type": "string"},
+                },
+                "required": ["name", "objectives", "concepts", "exercises", "milestone_project"],
+            },
+        },
+    },
+    "required": ["overview", "phases"],
+}
+
+
+def format_learning_path(data: Dict) -> str:
+    """Render a structured learning path as readable text."""
+    lines: List[str] = [data["overview"]]
+    for number, phase in enumerate(data["phases"], 1):
+        duration = f" ({phase['duration']})" if phase.get("duration") else ""
+        lines.append(f"\nPhase {number}: {phase['name']}{duration}")
+        for title, key in (("Objectives", "objectives"), ("Key concepts", "concepts"),
+                           ("Exercises", "exercises")):
+            lines.append(f"  {title}:")
+            lines.extend(f"    - {item}" for item in phase[key])
+        lines.append(f"  Milestone project: {phase['milestone_project']}")
+    return "\n".join(lines)
 
 
 class LearningPathAdvisor:
@@ -18,10 +68,27 @@ class LearningPathAdvisor:
     - Receive curated resource suggestions
     """
     
-    def __init__(self):
-        """Initialize the Learning Path Advisor with Gemini AI"""
-        self.model = genai.GenerativeModel('gemini-2.0-flash')
+    def __init__(self, prefetch: bool = False, follow_ups: Optional[Sequence[str]] = None,
+                 prefetch_budget: int = 20):
+        """
+        Initialize the Learning Path Advisor with Gemini AI
+
+        Args:
+            prefetch: Start answering common follow-up questions in the
+                background as soon as a learning path is created
+            follow_ups: Questions to prefetch (defaults to ``DEFAULT_FOLLOW_UPS``)
+            prefetch_budget: Total speculative answers the session may generate
+        """
+        model = genai.GenerativeModel('gemini-2.0-flash')
+        self.model = wrap_model(model, agent="LearningPathAdvisor")
+        self.structured = StructuredOutput(self.model, LEARNING_PATH_SCHEMA, "LearningPathAdvisor",
+                                           "create_learning_path")
         self.learning_paths = {}
+        self.prefetcher = None
+        if prefetch:
+            # Speculative calls are reported separately and yield to interactive ones
+            self.prefetch_model = wrap_model(model, agent="LearningPathPrefetch", priority=BATCH)
+            self.prefetcher = FollowUpPrefetcher(follow_ups or DEFAULT_FOLLOW_UPS, budget=prefetch_budget)
     
     def create_learning_path(
         self,
@@ -40,7 +107,8 @@ class LearningPathAdvisor:
             time_commitment: Available time per day/week
             
         Returns:
-            Dictionary containing the learning path or error message
+            Dictionary containing the learning path (``phases`` as structured
+            data, ``content`` as readable text) or error message
         """
         try:
             prompt = f"""Create a structured learning path with these details:
@@ -50,13 +118,16 @@ class LearningPathAdvisor:
             Time: {time_commitment}
             
             Include:
-            1. 3-5 phases with clear objectives
-            2. Key concepts for each phase
-            3. Practical exercises
-            4. Milestone projects
+            1. A short overview
+            2. 3-5 phases with clear objectives
+            3. Key concepts for each phase
+            4. Practical exercises
+            5. A milestone project per phase
             """
             
-            response = self.model.generate_content(prompt)
+            # Callers sharing a coalesced request each get their own copy
+            data = copy.deepcopy(_path_flight.do(prompt, lambda: self.structured.generate(prompt)))
+            content = format_learning_path(data)
             
             # Store the learning path
             path_id = f"{topic.lower().replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}"
@@ -67,7 +138,9 @@ class LearningPathAdvisor:
                 "goal": goal,
                 "time_commitment": time_commitment,
                 "created_at": datetime.now().isoformat(),
-                "content": response.text,
+                "overview": data["overview"],
+                "phases": data["phases"],
+                "content": content,
                 "context": f"""Learning Path Details:
                 Topic: {topic}
                 Level: {current_level}
@@ -77,16 +150,37 @@ class LearningPathAdvisor:
             }
             
             self.learning_paths[path_id] = learning_path
+            if self.prefetcher is not None:
+                self.prefetcher.start(path_id, lambda question: self.prefetch_model.generate_content(
+                    self._question_prompt(learning_path, question)).text)
             return learning_path
             
         except Exception as e:
             print(f"\n❌ Error generating learning path: {str(e)}")
             return {"error": str(e)}
     
+    def _question_prompt(self, path: Dict, question: str) -> str:
+        return f"""You are a helpful learning assistant. Answer the following question 
+        about the learning path. Be specific and refer to the learning path details.
+        
+        Learning Path Context:
+        {path['context']}
+        
+        Learning Path Content:
+        {path['content']}
+        
+        Question: {question}
+        
+        Please provide a clear, concise answer that helps the learner understand better.
+        """
+
     def answer_question(self, path_id: str, question: str) -> str:
         """
         Answer a question about the learning path
         
+        With prefetching enabled, a question close enough to one of the
+        prefetched follow-ups is answered from that generation.
+        
         Args:
             path_id: ID of the learning path
             question: The question to answer
@@ -99,32 +193,53 @@ class LearningPathAdvisor:
             
         path = self.learning_paths[path_id]
         
-        prompt = f"""You are a helpful learning assistant. Answer the following question 
-        about the learning path. Be specific and refer to the learning path details.
-        
-        Learning Path Context:
-        {path['context']}
-        
-        Learning Path Content:
-        {path['content']}
-        
-        Question: {question}
-        
-        Please provide a clear, concise answer that helps the learner understand better.
-        """
+        if self.prefetcher is not None:
+            answer = self.prefetcher.lookup(path_id, question)
+            if answer is not None:
+                return answer
         
         try:
-            response = self.model.generate_content(prompt)
+            response = self.model.generate_content(self._question_prompt(path, question), hedge=True)
             return response.text
         except Exception as e:
             return f"❌ Error generating answer: {str(e)}"
 
+    def prefetch_stats(self) -> Optional[Dict]:
+        """Prefetch hit/miss counts and hit rate, or None when prefetching is off."""
+        return self.prefetcher.stats() if self.prefetcher is not None else None
 
-def main():
+
+def say_goodbye(advisor: LearningPathAdvisor) -> None:
+    """Print the prefetch hit rate (when enabled) and a farewell."""
+    stats = advisor.prefetch_stats()
+    if stats is not None and stats["started"]:
+        print(f"\n⚡ Prefetch: {stats['hits']}/{stats['hits'] + stats['misses']} questions answered "
+              f"from {stats['started']} speculative answers ({stats['hit_rate']:.0%} hit rate, "
+              f"{stats['unused']} unused)")
+        advisor.prefetcher.close()
+    print("\n👋 Happy learning! Goodbye!")
+
+
+def main(argv=None):
     """Main interactive loop for the Learning Path Advisor"""
-    import os
     from dotenv import load_dotenv
     
+    parser = argparse.ArgumentParser(description="Learning Path Advisor")
+    parser.add_argument("--profile", action="store_true",
+                        help="print a per-session latency/token/cost breakdown on exit")
+    parser.add_argument("--flamegraph", metavar="PATH",
+                        help="sample each turn, report wall/CPU/network time on exit and write the "
+                             "stacks to PATH (.json: speedscope, otherwise collapsed stacks)")
+    parser.add_argument("--prefetch", action="store_true",
+                        help="answer common follow-up questions in the background while you read")
+    parser.add_argument("--prefetch-budget", type=int, default=20,
+                        help="maximum speculative answers per session (default: 20)")
+    args = parser.parse_args(argv)
+    if args.profile:
+        enable_session_profile()
+    if args.flamegraph:
+        enable_turn_profiler(args.flamegraph)
+    
     # Load environment variables
     load_dotenv()
     
@@ -144,7 +259,7 @@ def main():
     print("\nWelcome! I'll help you create a personalized learning path.")
     print("Type 'quit' or 'exit' to end the session.\n")
     
-    advisor = LearningPathAdvisor()
+    advisor = LearningPathAdvisor(prefetch=args.prefetch, prefetch_budget=args.prefetch_budget)
     
     while True:
         print("\n" + "-"*80)
@@ -155,7 +270,7 @@ def main():
             continue
             
         if topic.lower() in ['quit', 'exit', 'q']:
-            print("\n👋 Happy learning! Goodbye!")
+            say_goodbye(advisor)
             break
         
         level = input("Your current level? [beginner/intermediate/advanced] ").strip().lower()
@@ -166,11 +281,12 @@ def main():
         
         print("\n⏳ Creating your learning path...")
         
-        path = advisor.create_learning_path(
-            topic=topic,
-            current_level=level,
-            goal=goal
-        )
+        with profile_turn("create_learning_path"):
+            path = advisor.create_learning_path(
+                topic=topic,
+                current_level=level,
+                goal=goal
+            )
         
         if "error" in path:
             print("\n❌ Failed to create learning path. Please try again.")
@@ -192,7 +308,7 @@ def main():
             if user_input.startswith('/'):
                 cmd = user_input[1:].lower()
                 if cmd in ['exit', 'quit', 'q']:
-                    print("\n👋 Happy learning! Goodbye!")
+                    say_goodbye(advisor)
                     return
                 elif cmd in ['new', 'newpath', 'create']:
                     print("\nCreating a new learning path...\n")
@@ -208,13 +324,14 @@ def main():
                 continue
                 
             # Process as a question
-            answer = advisor.answer_question(path["id"], user_input)
-            print("\n" + "💡 " + answer + "\n")
+            with profile_turn("answer_question"):
+                answer = advisor.answer_question(path["id"], user_input)
+                print("\n" + "💡 " + answer + "\n")
         
         # Ask if user wants to create another learning path
         again = input("\nWould you like to create another learning path? (y/n) ").strip().lower()
         if again != 'y':
-            print("\n👋 Happy learning! Goodbye!")
+            say_goodbye(advisor)
             break
 
 
@@ -0,0 +1,198 @@
+"""
+Speculative prefetch of common follow-up questions.
+
+Right after a learning path is created, learners almost always ask one of
+a few questions ("what resources for phase 1?", "how long will this
+take?"). ``FollowUpPrefetcher`` starts generating answers to a configurable
+list of such questions in the background while the learner reads the path.
+A later question that matches one of them is answered from that prefetched
+generation, immediately if it has finished or as soon as the request
+already in flight returns. Answers can be served more than once.
+
+Matching is lexical (stdlib only, no embedding calls): both questions are
+normalized (lowercased, stop words dropped, crude stemming, number words
+turned into digits) and compared by cosine similarity. Questions that name
+different numbers ("phase 1" vs "phase 2") never match. Pass
+``similarity=`` to plug in an embedding-based measure instead.
+
+Speculation costs tokens, so the prefetcher has a budget: the total number
+of speculative generations it may start. Hits, misses and unused answers
+are counted so the hit rate can be checked against that cost.
+"""
+
+import math
+import re
+import threading
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+DEFAULT_FOLLOW_UPS = (
+    "What resources do you recommend for phase 1?",
+    "How long will this take to complete?",
+    "What should I learn first?",
+    "What prerequisites do I need before starting?",
+    "Can you explain the milestone project for phase 1?",
+)
+
+STOPWORDS = frozenset("""a an the i me my we you your it its this that these those is are was were be
+been do does did can could would should will shall may might must to of in on for with about at by
+from as and or but so if then than there here what which who whom how why when where please tell
+give any some much more also just really need know""".split())
+NUMBER_WORDS = {"one": "1", "first": "1", "two": "2", "second": "2", "three": "3", "third": "3",
+                "four": "4", "fourth": "4", "five": "5", "fifth": "5", "six": "6", "sixth": "6"}
+# Number words only count as numbers next to one of these ("phase one", "first week")
+UNITS = frozenset(("phase", "stage", "step", "part", "module", "week", "month", "day"))
+SYNONYMS = {"resource": "resource", "material": "resource", "book": "resource", "course": "resource",
+            "long": "duration", "duration": "duration", "time": "duration", "week": "duration",
+            "month": "duration", "start": "first", "begin": "first", "prerequisite": "prerequisite",
+            "requirement": "prerequisite", "prior": "prerequisite", "project": "project",
+            "milestone": "milestone", "stage": "phase", "step": "phase", "part": "phase"}
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def _stem(word: str) -> str:
+    for suffix in ("ations", "ation", "ings", "ing", "ies", "es", "s", "ed"):
+        if len(word) > len(suffix) + 2 and word.endswith(suffix):
+            return word[:-len(suffix)] + ("y" if suffix == "ies" else "")
+    return word
+
+
+def normalize(question: str) -> Tuple[Counter, frozenset]:
+    """Bag of normalized terms and the set of numbers mentioned in ``question``."""
+    terms, numbers = Counter(), set()
+    words = _WORD.findall(question.lower())
+    for i, word in enumerate(words):
+        if word in NUMBER_WORDS and {_stem(w) for w in words[max(i - 1, 0):i + 2]} & UNITS:
+            word = NUMBER_WORDS[word]
+        if word.isdigit():
+            numbers.add(word)
+            continue
+        if word in STOPWORDS:
+            continue
+        stem = _stem(word)
+        terms[SYNONYMS.get(stem, stem)] += 1
+    return terms, frozenset(numbers)
+
+
+def lexical_similarity(a: str, b: str) -> float:
+    """Cosine similarity of normalized terms; 0 when the questions name different numbers."""
+    (ta, na), (tb, nb) = normalize(a), normalize(b)
+    if na != nb or not ta or not tb:
+        return 0.0
+    dot = sum(count * tb[term] for term, count in ta.items())
+    return dot / math.sqrt(sum(v * v for v in ta.values()) * sum(v * v for v in tb.values()))
+
+
+class FollowUpPrefetcher:
+    """
+    Background generation of answers to likely follow-up questions.
+
+    Args:
+        follow_ups: Questions to prefetch for every new learning path
+        budget: Total speculative generations this prefetcher may start
+        threshold: Minimum similarity for a question to use a prefetched answer
+        max_workers: Speculative generations running at the same time
+        similarity: ``f(question, follow_up) -> float`` in [0, 1]
+    """
+
+    def __init__(self, follow_ups=DEFAULT_FOLLOW_UPS, budget: int = 20, threshold: float = 0.6,
+                 max_workers: int = 2, similarity: Callable[[str, str], float] = lexical_similarity):
+        self.follow_ups = list(follow_ups)
+        self.budget = budget
+        self.threshold = threshold
+        self.similarity = similarity
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self._lock = threading.Lock()
+        self._pending: Dict[str, List[Tuple[str, Future]]] = {}
+        self._used: Dict[str, Set[str]] = {}
+        self.started = self.hits = self.misses = self.unused = self.failed = 0
+
+    def start(self, key: str, answer: Callable[[str], str]) -> int:
+        """
+        Start prefetching the follow-ups for ``key`` (a learning path id).
+
+        Earlier prefetches for other keys are cancelled if not yet running.
+
+        Returns:
+            Number of generations started (limited by the remaining budget)
+        """
+        with self._lock:
+            for other in list(self._pending):
+                if other != key:
+                    self._discard(other)
+            entries = self._pending.setdefault(key, [])
+            known = {question for question, _ in entries}
+            count = 0
+            for question in self.follow_ups:
+                if question in known or self.started >= self.budget:
+                    continue
+                entries.append((question, self._executor.submit(answer, question)))
+                self.started += 1
+                count += 1
+            return count
+
+    def _discard(self, key: str) -> None:
+        for question, future in self._pending.pop(key, ()):
+            if not future.cancel() and question not in self._used.get(key, ()):
+                self.unused += 1
+        self._used.pop(key, None)
+
+    def lookup(self, key: str, question: str, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Prefetched answer for a question similar enough to ``question``, or None.
+
+        A matching generation that is already running is waited for (up to
+        ``timeout``), since it finishes sooner than a new request would; one
+        still queued is cancelled and left to the caller.
+        """
+        with self._lock:
+            entries = self._pending.get(key, [])
+            scored = [(self.similarity(question, q), i) for i, (q, _) in enumerate(entries)]
+            best = max(scored, default=(0.0, -1))
+            if best[0] < self.threshold:
+                self.misses += 1
+                return None
+            match = entries[best[1]]
+            if match[1].cancel():
+                # Still queued behind other speculation: asking directly is faster
+                entries.remove(match)
+                self.misses += 1
+                return None
+        try:
+            result = match[1].result(timeout=timeout)
+        except Exception:
+            with self._lock:
+                # Drop the failed generation so later questions go straight to the model
+                if match in entries:
+                    entries.remove(match)
+                self.failed += 1
+                self.misses += 1
+            return None
+        with self._lock:
+            self._used.setdefault(key, set()).add(match[0])
+            self.hits += 1
+        return result
+
+    def stats(self) -> Dict:
+        """Started, hit, miss and unused counts, and the hit rate over lookups."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            waiting = sum(1 for key, entries in self._pending.items()
+                          for question, _ in entries if question not in self._used.get(key, ()))
+            return {
+                "started": self.started,
+                "budget": self.budget,
+                "hits": self.hits,
+                "misses": self.misses,
+                "failed": self.failed,
+                "unused": self.unused + waiting,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def close(self) -> None:
+        """Cancel queued generations and stop the worker threads."""
+        with self._lock:
+            for key in list(self._pending):
+                self._discard(key)
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,111 @@
+"""
+Article workflow: search → (research ∥ code examples) → writer → editor.
+
+The agents of this repository run as nodes of a ``Workflow``
+(``agents/orchestrator/dag.py``): the research and code-example branches
+both depend only on the search results, so they run at the same time.
+With ``--cache`` node outputs are memoized on disk, so changing only the
+style re-runs the writer and editor and reuses everything upstream.
+
+Examples::
+
+    python -m agents workflow "Vector databases" --cache .workflow_cache.json
+    python -m agents workflow "Vector databases" --style casual --cache .workflow_cache.json --trace trace.json
+"""
+
+import argparse
+import sys
+from typing import Dict, List, Optional
+
+from agents.common.config import configure_gemini
+from agents.orchestrator.dag import MemoCache, Workflow, WorkflowError
+
+
+def format_sources(results: List[Dict]) -> str:
+    return "\n".join(f"- {r['title']} ({r['link']}): {r['snippet']}" for r in results) or "- none found"
+
+
+def build_article_workflow(cache: Optional[MemoCache] = None, num_results: int = 5,
+                           search_url: Optional[str] = None) -> Workflow:
+    """
+    The search → (research ∥ code) → writer → editor workflow.
+
+    Inputs: ``topic``, ``style`` and ``language``. Each node imports and
+    creates its agent when it runs, so nodes served from the cache never
+    load the agent's dependencies and fully cached runs never build a model.
+
+    Args:
+        cache: Memo cache for node outputs (in memory by default)
+        num_results: Web results fetched by the search node
+        search_url: Search endpoint override (see ``SimpleSearchAgent``)
+    """
+    def search(topic):
+        from agents.search_agent.agent import SimpleSearchAgent
+
+        agent = SimpleSearchAgent(search_url) if search_url else SimpleSearchAgent()
+        results = agent.search(topic, num_results=num_results)
+        if not results:
+            # search() reports failures as an empty list; raising keeps them
+            # out of the memo cache so the next run searches again
+            raise RuntimeError(f"search returned no results for {topic!r}")
+        return results
+
+    def research(topic, search):
+        from agents.research_agent.research_agent import ResearchAgent
+
+        return ResearchAgent().research(f"{topic}\n\nRecent web results:\n{format_sources(search)}")
+
+    def code(topic, language, search):
+        from agents.code_agent.agent import CodeAgent
+
+        return CodeAgent().generate_code(
+            f"Short, runnable examples that illustrate: {topic}\n\n"
+            f"Related material:\n{format_sources(search[:3])}", language)
+
+    def writer(topic, style, research, code):
+        from agents.content_team.agent import WriterAgent
+
+        brief = (f"{topic}\n\nBase the article on these research notes:\n{research}\n\n"
+                 f"Include and explain these code examples where they help:\n{code}")
+        return WriterAgent().write_content(brief, style)
+
+    def editor(writer):
+        from agents.content_team.agent import EditorAgent
+
+        return EditorAgent().edit_content(writer)
+
+    flow = Workflow("article", cache=cache)
+    for fn in (search, research, code, writer, editor):
+        flow.add(fn.__name__, fn)
+    return flow
+
+
+def main(argv=None):
+    """Run the article workflow for a topic."""
+    parser = argparse.ArgumentParser(description="Article workflow: search → (research ∥ code) → writer → editor")
+    parser.add_argument("topic", help="topic to write about")
+    parser.add_argument("--style", default="professional", help="writing style (default: professional)")
+    parser.add_argument("--language", default="python", help="language of the code examples (default: python)")
+    parser.add_argument("--workers", type=int, default=4, help="nodes run at the same time (default: 4)")
+    parser.add_argument("--cache", help="JSON file memoizing node outputs across runs")
+    parser.add_argument("--trace", help="write the node timing trace (Chrome trace JSON, or .jsonl)")
+    args = parser.parse_args(argv)
+
+    configure_gemini()
+    flow = build_article_workflow(MemoCache(args.cache))
+    try:
+        result = flow.run({"topic": args.topic, "style": args.style, "language": args.language},
+                          max_workers=args.workers)
+    except WorkflowError as e:
+        print(f"❌ {e}\n\n{e.result.format_trace()}")
+        sys.exit(1)
+
+    print("\n" + result.outputs["editor"])
+    print("\n⏱️  Workflow trace\n" + result.format_trace())
+    if args.trace:
+        result.save_trace(args.trace)
+        print(f"\n✓ Trace saved to {args.trace}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,341 @@
+"""
+Small DAG engine for composing agents into workflows.
+
+A ``Workflow`` is a set of named nodes. Each node is a function whose
+parameters name its dependencies: workflow inputs or other nodes, whose
+outputs are passed in as keyword arguments::
+
+    flow = Workflow("article")
+    flow.add("search", lambda topic: searcher.search(topic))
+    flow.add("notes", lambda topic, search: researcher.research(topic))
+    result = flow.run({"topic": "AI agents"})
+    print(result.outputs["notes"], result.format_trace())
+
+``run`` starts every node whose dependencies are done, so independent
+branches run at the same time on a thread pool. Node outputs are memoized
+by a hash of the node's name, version and input values: when a workflow
+runs again with partly changed inputs, only the nodes whose inputs changed
+(and the nodes downstream of them whose inputs then change) run again.
+Each run records a ``NodeRun`` per node, which can be printed as a timeline
+or exported in Chrome trace format (open in https://ui.perfetto.dev).
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from agents.common import get_tracer
+
+MEMO_VERSION = 1
+
+
+class WorkflowError(Exception):
+    """Raised by ``Workflow.run`` when a node failed; ``result`` holds the partial run."""
+
+    def __init__(self, message: str, result: "WorkflowResult"):
+        super().__init__(message)
+        self.result = result
+
+
+@dataclass
+class Node:
+    name: str
+    fn: Callable[..., Any]
+    deps: List[str]
+    version: str = ""
+    memoize: bool = True
+
+
+@dataclass
+class NodeRun:
+    """Timing and outcome of one node in one run (times relative to the run start)."""
+    name: str
+    status: str  # "ran", "cached", "failed" or "skipped"
+    start: float = 0.0
+    end: float = 0.0
+    thread: str = ""
+    key: str = ""
+    error: Optional[str] = None
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+@dataclass
+class WorkflowResult:
+    workflow: str
+    outputs: Dict[str, Any] = field(default_factory=dict)
+    trace: List[NodeRun] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def ran(self) -> List[str]:
+        return [r.name for r in self.trace if r.status == "ran"]
+
+    @property
+    def cached(self) -> List[str]:
+        return [r.name for r in self.trace if r.status == "cached"]
+
+    def format_trace(self, width: int = 40) -> str:
+        """Per-node timeline, one row per node in start order."""
+        scale = width / self.elapsed if self.elapsed else 0.0
+        lines = [f"{'node':<16}{'status':<9}{'start':>8}{'time':>9}  timeline",
+                 "-" * (44 + width)]
+        for r in sorted(self.trace, key=lambda r: (r.start, r.name)):
+            offset = int(r.start * scale)
+            bar = " " * offset + ("█" * max(1, int(r.duration * scale)) if r.status == "ran" else "·")
+            lines.append(f"{r.name:<16}{r.status:<9}{r.start:>7.2f}s{r.duration:>8.2f}s  {bar}")
+        busy = sum(r.duration for r in self.trace if r.status == "ran")
+        lines.append(f"\nwall {self.elapsed:.2f}s, node time {busy:.2f}s, "
+                     f"{len(self.ran)} ran, {len(self.cached)} cached")
+        return "\n".join(lines)
+
+    def chrome_trace(self) -> Dict:
+        """The trace as Chrome trace-event JSON (complete events, microseconds)."""
+        threads: Dict[str, int] = {}
+        events = []
+        for r in self.trace:
+            if r.status not in ("ran", "cached", "failed"):
+                continue
+            events.append({
+                "name": r.name, "cat": r.status, "ph": "X", "pid": 1,
+                "tid": threads.setdefault(r.thread or "main", len(threads) + 1),
+                "ts": round(r.start * 1e6), "dur": max(1, round(r.duration * 1e6)),
+                "args": {"status": r.status, "key": r.key, "error": r.error},
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms",
+                "otherData": {"workflow": self.workflow, "elapsed_s": self.elapsed}}
+
+    def save_trace(self, path: str) -> None:
+        """Write ``chrome_trace()`` to ``path``, or the plain node runs if it ends in ``.jsonl``."""
+        with open(path, "w", encoding="utf-8") as f:
+            if path.endswith(".jsonl"):
+                for r in self.trace:
+                    f.write(json.dumps({"workflow": self.workflow, **asdict(r)}) + "\n")
+            else:
+                json.dump(self.chrome_trace(), f)
+
+
+class MemoCache:
+    """
+    Node outputs by input hash, optionally persisted as JSON.
+
+    Only JSON-serializable outputs are persisted; others are kept in memory
+    for the life of the cache.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.entries: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == MEMO_VERSION:
+                self.entries = data.get("outputs", {})
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries
+
+    def get(self, key: str) -> Any:
+        return self.entries[key]
+
+    def put(self, key: str, value: Any) -> None:
+        with self._lock:
+            self.entries[key] = value
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        persistable = {}
+        for key, value in self.entries.items():
+            try:
+                json.dumps(value)
+            except (TypeError, ValueError):
+                continue
+            persistable[key] = value
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": MEMO_VERSION, "outputs": persistable}, f)
+        os.replace(tmp, self.path)
+
+
+def fingerprint(value: Any) -> str:
+    """Stable hash of a node input (JSON when possible, ``repr`` otherwise)."""
+    try:
+        data = json.dumps(value, sort_keys=True, ensure_ascii=False)
+    except (TypeError, ValueError):
+        data = repr(value)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class Workflow:
+    """
+    A DAG of agent calls.
+
+    Args:
+        name: Name used in traces and spans
+        cache: ``MemoCache`` shared across runs; a fresh in-memory one by default
+    """
+
+    def __init__(self, name: str = "workflow", cache: Optional[MemoCache] = None):
+        self.name = name
+        self.cache = cache if cache is not None else MemoCache()
+        self.nodes: Dict[str, Node] = {}
+
+    def add(self, name: str, fn: Callable[..., Any], deps: Optional[Iterable[str]] = None,
+            version: str = "", memoize: bool = True) -> "Workflow":
+        """
+        Add a node.
+
+        Args:
+            name: Node name, also the keyword its output is passed under
+            fn: Called with one keyword argument per dependency
+            deps: Workflow inputs or nodes this node needs; defaults to the
+                names of ``fn``'s parameters
+            version: Change it to invalidate memoized outputs (e.g. after
+                editing the node's prompt)
+            memoize: Set False for nodes with side effects
+        """
+        if name in self.nodes:
+            raise ValueError(f"Node '{name}' already exists")
+        if deps is None:
+            deps = list(inspect.signature(fn).parameters)
+        self.nodes[name] = Node(name, fn, list(deps), version, memoize)
+        return self
+
+    def order(self, inputs: Iterable[str] = ()) -> List[str]:
+        """Nodes in a valid execution order; raises ValueError on unknown deps or cycles."""
+        known = set(inputs)
+        for node in self.nodes.values():
+            missing = [d for d in node.deps if d not in self.nodes and d not in known]
+            if missing:
+                raise ValueError(f"Node '{node.name}' depends on unknown {', '.join(missing)}")
+        indegree = {name: sum(d in self.nodes for d in node.deps) for name, node in self.nodes.items()}
+        ready = [name for name, count in indegree.items() if count == 0]
+        ordered = []
+        while ready:
+            name = ready.pop()
+            ordered.append(name)
+            for other in self.nodes.values():
+                if name in other.deps:
+                    indegree[other.name] -= 1
+                    if indegree[other.name] == 0:
+                        ready.append(other.name)
+        if len(ordered) != len(self.nodes):
+            cycle = sorted(set(self.nodes) - set(ordered))
+            raise ValueError(f"Workflow has a cycle through {', '.join(cycle)}")
+        return ordered
+
+    def _key(self, node: Node, hashes: Dict[str, str]) -> str:
+        parts = [self.name, node.name, node.version] + [f"{d}={hashes[d]}" for d in node.deps]
+        return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+    def run(self, inputs: Optional[Dict[str, Any]] = None, max_workers: int = 4,
+            targets: Optional[Iterable[str]] = None) -> WorkflowResult:
+        """
+        Run the workflow.
+
+        Args:
+            inputs: Values for the workflow inputs named in node dependencies
+            max_workers: Nodes run at the same time
+            targets: Only run these nodes and their dependencies
+
+        Returns:
+            WorkflowResult with every node's output and a ``NodeRun`` per node
+
+        Raises:
+            WorkflowError: A node raised; nodes downstream of it are skipped,
+                independent branches still finish
+        """
+        inputs = dict(inputs or {})
+        self.order(inputs)
+        needed = set(self.nodes)
+        if targets is not None:
+            needed, stack = set(), list(targets)
+            while stack:
+                name = stack.pop()
+                if name in self.nodes and name not in needed:
+                    needed.add(name)
+                    stack.extend(self.nodes[name].deps)
+
+        result = WorkflowResult(self.name)
+        values: Dict[str, Any] = dict(inputs)
+        hashes = {name: fingerprint(value) for name, value in inputs.items()}
+        runs: Dict[str, NodeRun] = {}
+        started = time.perf_counter()
+
+        def execute(node: Node) -> Any:
+            # Workers only read the outputs of finished dependencies; all
+            # writes to values/hashes/runs happen on the scheduling thread
+            run = runs[node.name]
+            run.thread = threading.current_thread().name
+            run.start = time.perf_counter() - started
+            try:
+                with get_tracer().span(self.name, node.name):
+                    return node.fn(**{d: values[d] for d in node.deps})
+            finally:
+                run.end = time.perf_counter() - started
+
+        failed = set()
+        waiting = set(needed)
+        pending = {}
+        with ThreadPoolExecutor(max_workers=max(1, max_workers),
+                                thread_name_prefix=f"{self.name}-node") as executor:
+            while waiting or pending:
+                progressed = False
+                for name in sorted(waiting):
+                    node = self.nodes[name]
+                    if any(d in failed for d in node.deps):
+                        runs[name] = NodeRun(name, "skipped", error="upstream failure")
+                    elif all(d in hashes for d in node.deps):
+                        key = self._key(node, hashes)
+                        if node.memoize and key in self.cache:
+                            now = time.perf_counter() - started
+                            runs[name] = NodeRun(name, "cached", now, now, key=key)
+                            values[name] = self.cache.get(key)
+                            hashes[name] = fingerprint(values[name])
+                        else:
+                            runs[name] = NodeRun(name, "ran", key=key)
+                            pending[executor.submit(execute, node)] = name
+                    else:
+                        continue
+                    if runs[name].status == "skipped":
+                        failed.add(name)
+                    waiting.discard(name)
+                    progressed = True
+                if not pending:
+                    if not progressed:
+                        raise RuntimeError(f"Workflow '{self.name}' cannot make progress")
+                    continue
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = pending.pop(future)
+                    run = runs[name]
+                    try:
+                        value = future.result()
+                    except Exception as e:
+                        run.status, run.error = "failed", f"{type(e).__name__}: {e}"
+                        failed.add(name)
+                        continue
+                    values[name] = value
+                    hashes[name] = fingerprint(value)
+                    if self.nodes[name].memoize:
+                        self.cache.put(run.key, value)
+
+        result.elapsed = time.perf_counter() - started
+        result.trace = [runs[name] for name in self.order(inputs) if name in runs]
+        result.outputs = {name: values[name] for name in needed if name in values}
+        self.cache.save()
+        errors = [r for r in result.trace if r.status == "failed"]
+        if errors:
+            raise WorkflowError(f"{len(errors)} node(s) failed: "
+                                + "; ".join(f"{r.name}: {r.error}" for r in errors), result)
+        return result
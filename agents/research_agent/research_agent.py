@@ -1,21 +1,58 @@
 """Research agent for in-depth topic analysis"""
+import argparse
+from typing import Optional, Union
+
 import google.generativeai as genai
 
+from agents.common import wrap_model
+from agents.common.config import configure_gemini
+from agents.common.singleflight import SingleFlight
+from agents.research_agent.retrieval import PassageIndex, format_context
+
+# Shared by all instances so identical concurrent prompts hit the API once
+_research_flight = SingleFlight("ResearchAgent", "research")
+_quick_fact_flight = SingleFlight("ResearchAgent", "quick_fact")
+
 
 class ResearchAgent:
-    def __init__(self):
-        self.model = genai.GenerativeModel(
+    """
+    Args:
+        index: Optional local ``PassageIndex`` (or its directory) whose best
+            matching passages are added to every prompt as cited context
+        top_k: Passages retrieved per question
+        max_context_chars: Cap on the retrieved text added to a prompt
+    """
+
+    def __init__(self, index: Optional[Union[PassageIndex, str]] = None, top_k: int = 4,
+                 max_context_chars: int = 4000):
+        self.index = PassageIndex(index) if isinstance(index, str) else index
+        self.top_k = top_k
+        self.max_context_chars = max_context_chars
+        self.model = wrap_model(genai.GenerativeModel(
             'gemini-1.5-flash',
             system_instruction="""You are a research assistant. Your job is to:
             1. Analyze questions thoroughly
             2. Provide well-structured, factual information
             3. Cite reasoning when making claims
             4. Ask clarifying questions when needed"""
-        )
+        ), agent="ResearchAgent")
+
+    def _grounding(self, question: str) -> str:
+        """Retrieved passages plus citation instructions, or '' without an index."""
+        if self.index is None:
+            return ""
+        passages = self.index.search(question, self.top_k)
+        if not passages:
+            return ""
+        return f"""Use these excerpts from local documents where relevant and cite them as [n]:
+
+{format_context(passages, self.max_context_chars)}
+
+"""
     
     def research(self, topic: str) -> str:
         """Research a topic and provide detailed information"""
-        prompt = f"""Research the following topic and provide a comprehensive overview:
+        prompt = self._grounding(topic) + f"""Research the following topic and provide a comprehensive overview:
         
         Topic: {topic}
         
@@ -25,11 +62,41 @@ class ResearchAgent:
         3. Important considerations
         4. Summary"""
         
-        response = self.model.generate_content(prompt)
-        return response.text
+        return _research_flight.do(prompt, lambda: self.model.generate_content(prompt).text)
     
     def quick_fact(self, question: str) -> str:
         """Get a quick factual answer"""
-        prompt = f"Provide a concise, factual answer: {question}"
-        response = self.model.generate_content(prompt)
-        return response.text
+        prompt = self._grounding(question) + f"Provide a concise, factual answer: {question}"
+        return _quick_fact_flight.do(
+            prompt, lambda: self.model.generate_content(prompt, hedge=True).text)
+
+
+def main(argv=None):
+    """Research a topic from the command line."""
+    parser = argparse.ArgumentParser(description="Research Agent - in-depth topic analysis")
+    parser.add_argument("topic", help="topic or question to research")
+    parser.add_argument("--quick", action="store_true", help="give a concise factual answer instead")
+    parser.add_argument("--index", help="local retrieval index directory to ground answers in")
+    parser.add_argument("--ingest", nargs="+", metavar="PATH",
+                        help="files or directories to (re)index into --index first")
+    parser.add_argument("--top-k", type=int, default=4, help="passages retrieved per question (default: 4)")
+    args = parser.parse_args(argv)
+    if args.ingest and not args.index:
+        parser.error("--ingest requires --index")
+
+    index = None
+    if args.index:
+        index = PassageIndex(args.index)
+        if args.ingest:
+            stats = index.ingest(args.ingest)
+            print(f"📚 Indexed {stats.files_indexed} changed files ({stats.passages_added} passages), "
+                  f"{stats.files_unchanged} unchanged, {stats.files_removed} removed "
+                  f"in {stats.elapsed:.1f}s")
+
+    configure_gemini()
+    agent = ResearchAgent(index=index, top_k=args.top_k)
+    print(agent.quick_fact(args.topic) if args.quick else agent.research(args.topic))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,553 @@
+"""
+Local retrieval index used to ground ``ResearchAgent`` answers.
+
+``PassageIndex`` splits text and markdown files into passages and keeps a
+BM25 inverted index on disk. Everything large is memory-mapped rather than
+loaded, so opening an index with millions of passages is instant and only
+the postings a query touches are paged in.
+
+On-disk layout (one directory)::
+
+    index.json        metadata: segments, counts, ingested sources
+    passages.bin      passages as JSON lines (source, title, text)
+    passages.off      uint64 start offset of every passage (+ end offset)
+    lengths.bin       uint32 token count of every passage
+    deleted.bin       one byte per passage, 1 = replaced or removed
+    seg-NNNN.terms    sorted terms, UTF-8, concatenated
+    seg-NNNN.toff     uint64 offset of every term in .terms (+ end offset)
+    seg-NNNN.poff     uint64 offset of every term's postings (+ end offset)
+    seg-NNNN.docs     int32 passage ids, per term
+    seg-NNNN.tfs      uint16 term frequencies, parallel to .docs
+
+Ingestion is incremental: files whose size and mtime (or content hash) did
+not change are skipped, changed files have their old passages marked
+deleted and their new passages written to a new segment. ``compact()``
+merges all segments and drops the postings of deleted passages.
+"""
+
+import hashlib
+import heapq
+import json
+import math
+import mmap
+import os
+import re
+import time
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+INDEX_VERSION = 1
+TEXT_EXTENSIONS = (".md", ".markdown", ".txt", ".rst")
+
+_WORD = re.compile(r"[^\W_]+", re.UNICODE)
+STOPWORDS = frozenset("""
+a an and are as at be but by for from has have he her his i if in into is it its
+of on or our she so than that the their them then there these they this to was
+we were what when where which who will with you your
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens without stopwords and single characters."""
+    return [w for w in _WORD.findall(text.lower()) if len(w) > 1 and w not in STOPWORDS]
+
+
+def split_passages(text: str, max_words: int = 120) -> Iterator[Tuple[str, str]]:
+    """
+    Split text/markdown into ``(title, passage)`` pairs.
+
+    Paragraphs are grouped up to ``max_words``; the closest markdown heading
+    becomes the passage title.
+    """
+    title = ""
+    current: List[str] = []
+    words = 0
+    in_code = False
+
+    def flush():
+        if current:
+            yield title, "\n\n".join(current)
+
+    for block in re.split(r"\n\s*\n", text):
+        block = block.strip()
+        if not block:
+            continue
+        heading_allowed = not in_code
+        if block.count("```") % 2:
+            in_code = not in_code
+        if heading_allowed and re.match(r"#{1,6}\s", block):
+            heading, _, rest = block.partition("\n")
+            yield from flush()
+            current, words = [], 0
+            title = heading.lstrip("#").strip()
+            block = rest.strip()
+            if not block:
+                continue
+        size = len(block.split())
+        if current and words + size > max_words:
+            yield from flush()
+            current, words = [], 0
+        current.append(block)
+        words += size
+    yield from flush()
+
+
+@dataclass
+class Passage:
+    id: int
+    score: float
+    source: str
+    title: str
+    text: str
+
+
+@dataclass
+class IngestStats:
+    files_seen: int = 0
+    files_indexed: int = 0
+    files_unchanged: int = 0
+    files_removed: int = 0
+    passages_added: int = 0
+    tokens: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def passages_per_sec(self) -> float:
+        return self.passages_added / self.elapsed if self.elapsed else 0.0
+
+
+def _map(path: str, typecode: Optional[str] = None):
+    """Read-only memory map of a file (as a typed memoryview if ``typecode``)."""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return None, (memoryview(array(typecode)) if typecode else b"")
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped)
+    return mapped, (view.cast(typecode) if typecode else view)
+
+
+class _Segment:
+    """One immutable, memory-mapped segment of postings."""
+
+    def __init__(self, base: str):
+        self._maps = []
+        self.terms = self._open(base + ".terms")
+        self.toff = self._open(base + ".toff", "Q")
+        self.poff = self._open(base + ".poff", "Q")
+        self.docs = self._open(base + ".docs", "i")
+        self.tfs = self._open(base + ".tfs", "H")
+        self.size = max(0, len(self.toff) - 1)
+
+    def _open(self, path: str, typecode: Optional[str] = None):
+        mapped, view = _map(path, typecode)
+        self._maps.append((mapped, view))
+        return view
+
+    def _term(self, i: int) -> bytes:
+        return bytes(self.terms[self.toff[i]:self.toff[i + 1]])
+
+    def lookup(self, term: bytes) -> Tuple[int, int]:
+        """Postings range of ``term`` (empty if absent), found by binary search."""
+        lo, hi = 0, self.size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._term(mid) < term:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.size and self._term(lo) == term:
+            return self.poff[lo], self.poff[lo + 1]
+        return 0, 0
+
+    def items(self) -> Iterator[Tuple[bytes, memoryview, memoryview]]:
+        for i in range(self.size):
+            start, end = self.poff[i], self.poff[i + 1]
+            yield self._term(i), self.docs[start:end], self.tfs[start:end]
+
+    def close(self) -> None:
+        for mapped, view in self._maps:
+            view.release()
+            if mapped is not None:
+                mapped.close()
+        self._maps = []
+
+
+def _write_segment(base: str, postings: Dict[bytes, Tuple[array, array]]) -> None:
+    toff, poff = array("Q", [0]), array("Q", [0])
+    with open(base + ".terms", "wb") as terms, open(base + ".docs", "wb") as docs, \
+            open(base + ".tfs", "wb") as tfs:
+        for term in sorted(postings):
+            ids, freqs = postings[term]
+            terms.write(term)
+            ids.tofile(docs)
+            freqs.tofile(tfs)
+            toff.append(toff[-1] + len(term))
+            poff.append(poff[-1] + len(ids))
+    with open(base + ".toff", "wb") as f:
+        toff.tofile(f)
+    with open(base + ".poff", "wb") as f:
+        poff.tofile(f)
+
+
+class PassageIndex:
+    """
+    Disk-backed BM25 index over passages of local documents.
+
+    Args:
+        path: Index directory (created if missing)
+        k1, b: BM25 parameters
+        max_words: Maximum words per passage when splitting documents
+        segment_size: Passages buffered in memory before a segment is written
+
+    Example::
+
+        index = PassageIndex(".research_index")
+        index.ingest(["docs"])
+        for passage in index.search("goal-based agents", k=3):
+            print(passage.score, passage.source, passage.title)
+    """
+
+    def __init__(self, path: str, k1: float = 1.2, b: float = 0.75, max_words: int = 120,
+                 segment_size: int = 200_000):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self.max_words = max_words
+        self.segment_size = segment_size
+        os.makedirs(path, exist_ok=True)
+        self.meta = {"version": INDEX_VERSION, "passages": 0, "live": 0, "total_length": 0,
+                     "next_segment": 0, "segments": [], "sources": {}}
+        meta_path = os.path.join(path, "index.json")
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding="utf-8") as f:
+                self.meta = json.load(f)
+            if self.meta.get("version") != INDEX_VERSION:
+                raise ValueError(f"Index at {path} has an unsupported version; rebuild it")
+        self._trim()
+        with open(self._file("deleted.bin"), "ab+") as f:
+            f.seek(0)
+            self.deleted = bytearray(f.read())
+        self._pending: Dict[bytes, Tuple[array, array]] = {}
+        self._pending_count = 0
+        self._segments: List[_Segment] = []
+        self._passage_maps = []
+        self._open_readers()
+
+    # -- storage -----------------------------------------------------------
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _trim(self) -> None:
+        """Drop data an interrupted ingest wrote past the last saved metadata."""
+        n = self.meta["passages"]
+        for name, size in (("passages.off", (n + 1) * 8), ("lengths.bin", n * 4), ("deleted.bin", n)):
+            path = self._file(name)
+            if os.path.exists(path) and os.path.getsize(path) > size:
+                os.truncate(path, size)
+        offsets = self._file("passages.off")
+        if n == 0 or not os.path.exists(offsets):
+            with open(offsets, "wb") as f:
+                array("Q", [0]).tofile(f)
+            for name in ("passages.bin", "lengths.bin", "deleted.bin"):
+                open(self._file(name), "wb").close()
+        else:
+            end = array("Q")
+            with open(offsets, "rb") as f:
+                f.seek(n * 8)
+                end.fromfile(f, 1)
+            if os.path.getsize(self._file("passages.bin")) > end[0]:
+                os.truncate(self._file("passages.bin"), end[0])
+
+    def _open_readers(self) -> None:
+        self._close_readers()
+        self._segments = [_Segment(self._file(name)) for name in self.meta["segments"]]
+        for name, typecode in (("passages.bin", None), ("passages.off", "Q"), ("lengths.bin", "I")):
+            self._passage_maps.append(_map(self._file(name), typecode))
+        self._text = self._passage_maps[0][1]
+        self._offsets = self._passage_maps[1][1]
+        self._lengths = self._passage_maps[2][1]
+
+    def _close_readers(self) -> None:
+        for segment in self._segments:
+            segment.close()
+        for mapped, view in self._passage_maps:
+            if isinstance(view, memoryview):
+                view.release()
+            if mapped is not None:
+                mapped.close()
+        self._segments, self._passage_maps = [], []
+
+    def _save_meta(self) -> None:
+        with open(self._file("deleted.bin"), "wb") as f:
+            f.write(self.deleted)
+        tmp = self._file("index.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.meta, f)
+        os.replace(tmp, self._file("index.json"))
+
+    def close(self) -> None:
+        self._close_readers()
+
+    def __enter__(self) -> "PassageIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.meta["live"]
+
+    # -- ingestion ---------------------------------------------------------
+
+    def _flush_segment(self) -> None:
+        if not self._pending:
+            return
+        name = f"seg-{self.meta['next_segment']:04d}"
+        _write_segment(self._file(name), self._pending)
+        self.meta["next_segment"] += 1
+        self.meta["segments"].append(name)
+        self._pending, self._pending_count = {}, 0
+
+    def _add_passages(self, items: Iterable[Tuple[str, str, str]], stats: IngestStats,
+                      passages_file, offsets_file, lengths_file) -> Tuple[int, int]:
+        """Append ``(source, title, text)`` passages; returns their id range."""
+        first = self.meta["passages"]
+        offset = passages_file.tell()
+        offsets, lengths = array("Q"), array("I")
+        pending = self._pending
+        for source, title, text in items:
+            doc = self.meta["passages"]
+            tokens = tokenize(title + " " + text)
+            counts: Dict[str, int] = {}
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            for token, tf in counts.items():
+                entry = pending.get(token.encode("utf-8"))
+                if entry is None:
+                    entry = pending[token.encode("utf-8")] = (array("i"), array("H"))
+                entry[0].append(doc)
+                entry[1].append(min(tf, 65535))
+            record = json.dumps({"source": source, "title": title, "text": text},
+                                ensure_ascii=False).encode("utf-8") + b"\n"
+            passages_file.write(record)
+            offset += len(record)
+            offsets.append(offset)
+            lengths.append(len(tokens))
+            self.deleted.append(0)
+            self.meta["passages"] += 1
+            self.meta["live"] += 1
+            self.meta["total_length"] += len(tokens)
+            stats.passages_added += 1
+            stats.tokens += len(tokens)
+            self._pending_count += 1
+            if self._pending_count >= self.segment_size:
+                offsets.tofile(offsets_file)
+                lengths.tofile(lengths_file)
+                offsets, lengths = array("Q"), array("I")
+                self._flush_segment()
+                pending = self._pending
+        offsets.tofile(offsets_file)
+        lengths.tofile(lengths_file)
+        return first, self.meta["passages"]
+
+    def _delete_range(self, start: int, end: int) -> None:
+        for doc in range(start, end):
+            if not self.deleted[doc]:
+                self.deleted[doc] = 1
+                self.meta["live"] -= 1
+                self.meta["total_length"] -= self._length(doc)
+
+    def _length(self, doc: int) -> int:
+        if doc < len(self._lengths):
+            return self._lengths[doc]
+        with open(self._file("lengths.bin"), "rb") as f:
+            f.seek(doc * 4)
+            value = array("I")
+            value.fromfile(f, 1)
+        return value[0]
+
+    def _open_appenders(self):
+        return (open(self._file("passages.bin"), "ab"), open(self._file("passages.off"), "ab"),
+                open(self._file("lengths.bin"), "ab"))
+
+    def ingest(self, paths: Iterable[str], extensions=TEXT_EXTENSIONS) -> IngestStats:
+        """
+        Index new and changed text/markdown files under ``paths``.
+
+        Files already indexed with the same size and mtime (or the same
+        content) are skipped. Files under an ingested directory that no
+        longer exist are removed from the index.
+        """
+        started = time.perf_counter()
+        stats = IngestStats()
+        sources = self.meta["sources"]
+        files = []
+        for path in paths:
+            if os.path.isdir(path):
+                root = os.path.abspath(path)
+                found = set()
+                for dirpath, dirnames, filenames in os.walk(root):
+                    dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+                    for filename in sorted(filenames):
+                        if filename.lower().endswith(tuple(extensions)):
+                            found.add(os.path.join(dirpath, filename))
+                files.extend(sorted(found))
+                for source in list(sources):
+                    if source.startswith(root + os.sep) and source not in found:
+                        self._delete_range(*sources.pop(source)["ids"])
+                        stats.files_removed += 1
+            else:
+                files.append(os.path.abspath(path))
+        files = list(dict.fromkeys(files))
+
+        appenders = self._open_appenders()
+        try:
+            for source in files:
+                stats.files_seen += 1
+                st = os.stat(source)
+                known = sources.get(source)
+                if known and known["size"] == st.st_size and known["mtime"] == st.st_mtime:
+                    stats.files_unchanged += 1
+                    continue
+                with open(source, encoding="utf-8", errors="replace") as f:
+                    text = f.read()
+                digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+                if known and known["sha1"] == digest:
+                    known.update(size=st.st_size, mtime=st.st_mtime)
+                    stats.files_unchanged += 1
+                    continue
+                if known:
+                    self._delete_range(*known["ids"])
+                items = ((source, title, passage) for title, passage in split_passages(text, self.max_words))
+                ids = self._add_passages(items, stats, *appenders)
+                sources[source] = {"size": st.st_size, "mtime": st.st_mtime, "sha1": digest, "ids": list(ids)}
+                stats.files_indexed += 1
+        finally:
+            for f in appenders:
+                f.close()
+        self._flush_segment()
+        self._save_meta()
+        self._open_readers()
+        stats.elapsed = time.perf_counter() - started
+        return stats
+
+    def add_texts(self, items: Iterable[Tuple[str, str, str]]) -> IngestStats:
+        """Index ``(source, title, text)`` passages directly (no file tracking)."""
+        started = time.perf_counter()
+        stats = IngestStats()
+        appenders = self._open_appenders()
+        try:
+            self._add_passages(items, stats, *appenders)
+        finally:
+            for f in appenders:
+                f.close()
+        self._flush_segment()
+        self._save_meta()
+        self._open_readers()
+        stats.elapsed = time.perf_counter() - started
+        return stats
+
+    def compact(self) -> None:
+        """Merge all segments into one, dropping postings of deleted passages."""
+        if len(self._segments) <= 1 and not any(self.deleted):
+            return
+        merged = self._live_postings()
+        old = list(self.meta["segments"])
+        self._close_readers()
+        name = f"seg-{self.meta['next_segment']:04d}"
+        _write_segment(self._file(name), merged)
+        self.meta["next_segment"] += 1
+        self.meta["segments"] = [name]
+        self._save_meta()
+        for segment in old:
+            for ext in (".terms", ".toff", ".poff", ".docs", ".tfs"):
+                os.remove(self._file(segment + ext))
+        self._open_readers()
+
+    def _live_postings(self) -> Dict[bytes, Tuple[array, array]]:
+        # Copies postings out of the segments so their maps can be closed
+        merged: Dict[bytes, Tuple[array, array]] = {}
+        deleted = self.deleted
+        for segment in self._segments:
+            for term, docs, tfs in segment.items():
+                entry = merged.get(term)
+                if entry is None:
+                    entry = merged[term] = (array("i"), array("H"))
+                for doc, tf in zip(docs, tfs):
+                    if not deleted[doc]:
+                        entry[0].append(doc)
+                        entry[1].append(tf)
+        return {term: entry for term, entry in merged.items() if entry[0]}
+
+    # -- queries -----------------------------------------------------------
+
+    def passage(self, doc: int, score: float = 0.0) -> Passage:
+        record = json.loads(bytes(self._text[self._offsets[doc]:self._offsets[doc + 1]]))
+        return Passage(doc, score, record["source"], record["title"], record["text"])
+
+    def search(self, query: str, k: int = 5) -> List[Passage]:
+        """
+        Top ``k`` live passages for ``query`` by BM25.
+
+        Terms are scored rarest first (MaxScore): once no passage outside the
+        current candidates could still reach the top ``k``, the remaining
+        frequent terms only update the candidates, found by binary search in
+        the doc-ordered postings, instead of scanning their long lists.
+        """
+        live = self.meta["live"]
+        if not live or k <= 0:
+            return []
+        avgdl = self.meta["total_length"] / live or 1.0
+        k1, b = self.k1, self.b
+        lengths, deleted = self._lengths, self.deleted
+        norm_base, norm_scale = k1 * (1 - b), k1 * b / avgdl
+
+        terms = []
+        for term in set(tokenize(query)):
+            key = term.encode("utf-8")
+            ranges = [(segment, start, end) for segment in self._segments
+                      for start, end in [segment.lookup(key)] if end > start]
+            df = sum(end - start for _, start, end in ranges)
+            if df:
+                idf = max(0.0, math.log(1 + (live - df + 0.5) / (df + 0.5)))
+                terms.append((df, idf * (k1 + 1), ranges))
+        terms.sort(key=lambda t: t[0])
+        # A term adds less than its weight to any passage (tf / (tf + norm) < 1)
+        remaining = sum(weight for _, weight, _ in terms)
+
+        scores: Dict[int, float] = {}
+        for df, weight, ranges in terms:
+            remaining -= weight
+            closed = (len(scores) >= k
+                      and weight + remaining < heapq.nlargest(k, scores.values())[-1])
+            for segment, start, end in ranges:
+                docs, tfs = segment.docs, segment.tfs
+                if closed and len(scores) * 16 < end - start:
+                    for doc in list(scores):
+                        at = bisect_left(docs, doc, start, end)
+                        if at < end and docs[at] == doc:
+                            tf = tfs[at]
+                            scores[doc] += weight * tf / (tf + norm_base + norm_scale * lengths[doc])
+                    continue
+                for doc, tf in zip(docs[start:end], tfs[start:end]):
+                    if deleted[doc] or (closed and doc not in scores):
+                        continue
+                    scores[doc] = scores.get(doc, 0.0) + weight * tf / (tf + norm_base + norm_scale * lengths[doc])
+        best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [self.passage(doc, score) for doc, score in best]
+
+
+def format_context(passages: List[Passage], max_chars: int = 4000) -> str:
+    """Numbered excerpts for a prompt, cut to ``max_chars``."""
+    parts, used = [], 0
+    for i, p in enumerate(passages, 1):
+        source = os.path.basename(p.source) + (f" — {p.title}" if p.title else "")
+        text = p.text[:max(0, max_chars - used)]
+        if not text:
+            break
+        parts.append(f"[{i}] ({source})\n{text}")
+        used += len(text)
+    return "\n\n".join(parts)
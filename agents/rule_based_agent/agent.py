@@ -1,27 +1,37 @@
+import argparse
+
+from agents.rule_based_agent.rules import THERMOSTAT_RULES, RuleSet
+
+
 class SimpleAgent:
-    def __init__(self, name):
+    def __init__(self, name, rules=None):
+        """
+        Args:
+            name: Agent name
+            rules: A compiled ``RuleSet`` or the path of a JSON rules file
+                (defaults to the thermostat rules next to this module)
+        """
         self.name = name
         self.knowledge = {}
+        if not isinstance(rules, RuleSet):
+            rules = RuleSet.from_file(rules or THERMOSTAT_RULES)
+        self.rules = rules
+        self.session = rules.session()
     
     def perceive(self, environment):
         """Observe the environment"""
         return environment.get_state()
     
     def decide(self, state):
-        """Make a decision based on rules"""
-        if state['temperature'] > 25:
-            return "turn_on_ac"
-        elif state['temperature'] < 18:
-            return "turn_on_heater"
-        else:
-            return "do_nothing"
+        """Make a decision based on rules (only conditions on changed fields are re-evaluated)"""
+        return self.session.decide(state)
     
     def act(self, action, environment):
         """Execute the action"""
         print(f"{self.name} is performing: {action}")
         environment.execute(action)
 
-# Usage
+
 class Environment:
     def __init__(self):
         self.temperature = 20
@@ -35,9 +45,24 @@ class Environment:
         elif action == "turn_on_heater":
             self.temperature += 2
 
-env = Environment()
-agent = SimpleAgent("ThermostatBot")
 
-state = agent.perceive(env)
-action = agent.decide(state)
-agent.act(action, env)
+def main(argv=None):
+    """Run a thermostat agent for a few perceive/decide/act cycles."""
+    parser = argparse.ArgumentParser(description="Rule-based thermostat agent demo")
+    parser.add_argument("--rules", help="JSON rules file (default: thermostat_rules.json)")
+    parser.add_argument("--temperature", type=int, default=20, help="initial temperature (default: 20)")
+    parser.add_argument("--steps", type=int, default=1, help="perceive/decide/act cycles (default: 1)")
+    args = parser.parse_args(argv)
+
+    env = Environment()
+    env.temperature = args.temperature
+    agent = SimpleAgent("ThermostatBot", rules=args.rules)
+
+    for _ in range(args.steps):
+        state = agent.perceive(env)
+        action = agent.decide(state)
+        agent.act(action, env)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Vectorized simulation of large fleets of rule-based agents.
+
+Instead of one ``SimpleAgent`` and one ``Environment`` per thermostat, the
+fleet keeps every environment's state in NumPy arrays, one array per field
+(struct-of-arrays), and applies the rules to all agents at once: each
+condition becomes a boolean mask over the fleet and each rule the AND of its
+condition masks.
+
+Example::
+
+    fleet = Fleet(1_000_000, temperature=20.0, noise=1.5, seed=1)
+    fleet.run(100)
+    print(fleet.action_counts())
+"""
+
+from typing import Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError as exc:  # pragma: no cover - depends on the environment
+    raise ImportError("The fleet simulation needs NumPy: pip install numpy") from exc
+
+from agents.rule_based_agent.rules import THERMOSTAT_RULES, RuleSet
+
+# Field changes made by each action; mirrors ``Environment.execute``
+THERMOSTAT_EFFECTS = {
+    "turn_on_ac": {"temperature": -2.0},
+    "turn_on_heater": {"temperature": 2.0},
+}
+
+_COMPARE = {
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "<": np.less,
+    "<=": np.less_equal,
+    "==": np.equal,
+    "!=": np.not_equal,
+}
+
+
+class FleetEnvironment:
+    """
+    Environment state for ``size`` agents, one array per field.
+
+    Args:
+        size: Number of environments
+        fields: Initial value per field (a scalar or an array of length ``size``)
+        dtype: Array dtype for the fields
+    """
+
+    def __init__(self, size: int, fields: Dict[str, object], dtype=np.float32):
+        self.size = size
+        self.fields = {name: np.full(size, value, dtype=dtype) if np.isscalar(value)
+                       else np.asarray(value, dtype=dtype).copy()
+                       for name, value in fields.items()}
+
+    def get_state(self) -> Dict[str, np.ndarray]:
+        return self.fields
+
+    def execute(self, actions: np.ndarray, names: List[str], effects: Dict[str, Dict[str, float]]) -> None:
+        """
+        Apply each agent's action to its environment.
+
+        Args:
+            actions: Action code per agent (an index into ``names``)
+            names: Action names by code
+            effects: ``{action: {field: delta}}``; actions without an entry do nothing
+        """
+        for code, name in enumerate(names):
+            deltas = effects.get(name)
+            if not deltas:
+                continue
+            mask = actions == code
+            for field, delta in deltas.items():
+                np.add(self.fields[field], delta, out=self.fields[field], where=mask)
+
+
+class VectorizedRules:
+    """
+    A ``RuleSet`` evaluated over whole arrays.
+
+    Rules are applied from the lowest to the highest rank so that, for each
+    agent, the last rule to match is the one ``RuleSession`` would pick.
+    Conditions shared by several rules are evaluated once per tick.
+    """
+
+    def __init__(self, ruleset: RuleSet):
+        self.ruleset = ruleset
+        self.names: List[str] = [ruleset.default]
+        codes: Dict[str, int] = {ruleset.default: 0}
+        rule_conds: List[List[int]] = [[] for _ in range(len(ruleset))]
+        for cid, rule_ids in enumerate(ruleset.cond_rules):
+            for rule_id in rule_ids:
+                rule_conds[rule_id].append(cid)
+        self._rules = []
+        for rule_id in sorted(range(len(ruleset)), key=ruleset.ranks.__getitem__, reverse=True):
+            action = ruleset.actions[rule_id]
+            if action not in codes:
+                codes[action] = len(self.names)
+                self.names.append(action)
+            self._rules.append((codes[action], rule_conds[rule_id]))
+        self.codes = codes
+        self.dtype = np.uint8 if len(self.names) < 256 else np.int32
+
+    def decide(self, state: Dict[str, np.ndarray]) -> np.ndarray:
+        """Action code for every agent."""
+        size = len(next(iter(state.values())))
+        actions = np.zeros(size, dtype=self.dtype)
+        masks: Dict[int, np.ndarray] = {}
+        conditions = self.ruleset.conditions
+        for code, conds in self._rules:
+            mask = None
+            for cid in conds:
+                cond_mask = masks.get(cid)
+                if cond_mask is None:
+                    field, op, value = conditions[cid]
+                    cond_mask = masks[cid] = _COMPARE[op](state[field], value)
+                mask = cond_mask if mask is None else mask & cond_mask
+            if mask is None:
+                actions.fill(code)
+            else:
+                actions[mask] = code
+        return actions
+
+
+class Fleet:
+    """
+    A fleet of thermostats simulated in lockstep.
+
+    Args:
+        size: Number of agents
+        rules: ``RuleSet`` or rules file path (defaults to the thermostat rules)
+        temperature: Initial temperature (scalar or per-agent array)
+        noise: Standard deviation of the random temperature drift per tick
+        seed: Seed for the drift
+        effects: Action effects (defaults to ``THERMOSTAT_EFFECTS``)
+    """
+
+    def __init__(self, size: int, rules=None, temperature=20.0, noise: float = 0.0,
+                 seed: Optional[int] = None, effects: Optional[Dict] = None):
+        if not isinstance(rules, RuleSet):
+            rules = RuleSet.from_file(rules or THERMOSTAT_RULES)
+        self.env = FleetEnvironment(size, {"temperature": temperature})
+        self.rules = VectorizedRules(rules)
+        self.effects = THERMOSTAT_EFFECTS if effects is None else effects
+        self.noise = noise
+        self.rng = np.random.default_rng(seed)
+        self.ticks = 0
+        self.actions = np.zeros(size, dtype=self.rules.dtype)
+        self.totals = np.zeros(len(self.rules.names), dtype=np.int64)
+
+    def step(self) -> np.ndarray:
+        """Perceive, decide and act for every agent; returns the action codes."""
+        state = self.env.get_state()
+        self.actions = self.rules.decide(state)
+        self.env.execute(self.actions, self.rules.names, self.effects)
+        if self.noise:
+            temperature = state["temperature"]
+            temperature += self.rng.standard_normal(self.env.size, dtype=temperature.dtype) * self.noise
+        self.totals += np.bincount(self.actions, minlength=len(self.totals))
+        self.ticks += 1
+        return self.actions
+
+    def run(self, ticks: int) -> None:
+        for _ in range(ticks):
+            self.step()
+
+    def action_counts(self) -> Dict[str, int]:
+        """Total number of times each action was taken across the fleet."""
+        return dict(zip(self.rules.names, self.totals.tolist()))
@@ -0,0 +1,266 @@
+"""
+Declarative, compiled rule engine for the rule-based agent.
+
+Rules are loaded from a JSON file::
+
+    {
+      "default": "do_nothing",
+      "rules": [
+        {"name": "too_hot",  "when": {"temperature": {">": 25}}, "then": "turn_on_ac"},
+        {"name": "too_cold", "when": {"temperature": {"<": 18}}, "then": "turn_on_heater"}
+      ]
+    }
+
+A rule fires when all of its conditions hold. If several rules fire, the
+highest ``priority`` wins (default 0), then the one listed first.
+
+``RuleSet`` compiles the rules into a shared network:
+
+- identical conditions are interned once and shared by every rule that
+  uses them (like Rete alpha memories)
+- ordered conditions (``>``, ``>=``, ``<``, ``<=``) are kept per field as
+  sorted threshold arrays, so a value change flips exactly the conditions
+  whose thresholds lie between the old and the new value (found by bisection)
+- equality conditions (``==``, ``!=``) are hash-indexed per field and value
+
+A ``RuleSession`` holds the working memory for one agent. Each tick it only
+looks at fields whose values changed and only touches the rules that use
+the conditions that flipped; each rule keeps a counter of satisfied
+conditions and is active when the counter reaches its condition count.
+"""
+
+import heapq
+import json
+import os
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, Hashable, List, Optional
+
+ORDERED_OPS = (">", ">=", "<", "<=")
+EQUALITY_OPS = ("==", "!=")
+
+# Rules reproducing the original thermostat if/elif chain
+THERMOSTAT_RULES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "thermostat_rules.json")
+
+
+class _FieldIndex:
+    """Compiled conditions on one field."""
+
+    __slots__ = ("thresholds", "cond_ids", "eq", "ne", "ne_all")
+
+    def __init__(self):
+        # op -> sorted thresholds / matching condition ids
+        self.thresholds: Dict[str, list] = {op: [] for op in ORDERED_OPS}
+        self.cond_ids: Dict[str, array] = {op: array("i") for op in ORDERED_OPS}
+        self.eq: Dict[Hashable, List[int]] = {}
+        self.ne: Dict[Hashable, List[int]] = {}
+        self.ne_all: List[int] = []
+
+    def flips(self, old, new):
+        """
+        Yield ``(condition_id, now_true)`` for every condition whose truth
+        changes when the field goes from ``old`` to ``new`` (None = missing).
+        """
+        for op in ORDERED_OPS:
+            ts = self.thresholds[op]
+            if not ts:
+                continue
+            ids = self.cond_ids[op]
+            if op in (">", ">="):
+                # True for a prefix of the ascending thresholds
+                find = bisect_left if op == ">" else bisect_right
+                a = find(ts, old) if old is not None else 0
+                b = find(ts, new) if new is not None else 0
+                lo, hi, now_true = (a, b, True) if b > a else (b, a, False)
+            else:
+                # True for a suffix of the ascending thresholds
+                n = len(ts)
+                find = bisect_right if op == "<" else bisect_left
+                a = find(ts, old) if old is not None else n
+                b = find(ts, new) if new is not None else n
+                lo, hi, now_true = (b, a, True) if b < a else (a, b, False)
+            for i in range(lo, hi):
+                yield ids[i], now_true
+
+        if old is not None:
+            for cid in self.eq.get(old, ()):
+                yield cid, False
+        if new is not None:
+            for cid in self.eq.get(new, ()):
+                yield cid, True
+
+        if self.ne_all:
+            if old is None and new is not None:
+                excluded = set(self.ne.get(new, ()))
+                for cid in self.ne_all:
+                    if cid not in excluded:
+                        yield cid, True
+            elif old is not None and new is None:
+                excluded = set(self.ne.get(old, ()))
+                for cid in self.ne_all:
+                    if cid not in excluded:
+                        yield cid, False
+            elif old is not None:
+                for cid in self.ne.get(old, ()):
+                    yield cid, True
+                for cid in self.ne.get(new, ()):
+                    yield cid, False
+
+
+class RuleSet:
+    """
+    A compiled, immutable set of rules.
+
+    Args:
+        rules: List of rule dicts (``name``, ``when``, ``then``, optional ``priority``)
+        default: Action returned when no rule fires
+    """
+
+    def __init__(self, rules: List[Dict], default: Optional[str] = None):
+        self.default = default
+        self.names: List[str] = []
+        self.actions: List[str] = []
+        self.ranks: List[tuple] = []
+        self.fields: Dict[str, _FieldIndex] = {}
+        self.conditions: List[tuple] = []
+        self.cond_rules: List[List[int]] = []
+        self.rule_needs = array("i")
+        self.unconditional: List[int] = []
+
+        interned: Dict[tuple, int] = {}
+        ordered: Dict[tuple, list] = {}
+        for rule_id, rule in enumerate(rules):
+            self.names.append(rule.get("name", f"rule_{rule_id}"))
+            self.actions.append(rule["then"])
+            self.ranks.append((-rule.get("priority", 0), rule_id))
+
+            conds = set()
+            for field, tests in rule.get("when", {}).items():
+                for op, value in tests.items():
+                    if op not in ORDERED_OPS and op not in EQUALITY_OPS:
+                        raise ValueError(f"Rule '{self.names[-1]}': unknown operator '{op}'")
+                    key = (field, op, value)
+                    cid = interned.get(key)
+                    if cid is None:
+                        cid = interned[key] = len(self.conditions)
+                        self.conditions.append(key)
+                        self.cond_rules.append([])
+                        index = self.fields.setdefault(field, _FieldIndex())
+                        if op in ORDERED_OPS:
+                            ordered.setdefault((field, op), []).append((value, cid))
+                        elif op == "==":
+                            index.eq.setdefault(value, []).append(cid)
+                        else:
+                            index.ne.setdefault(value, []).append(cid)
+                            index.ne_all.append(cid)
+                    conds.add(cid)
+            for cid in conds:
+                self.cond_rules[cid].append(rule_id)
+            self.rule_needs.append(len(conds))
+            if not conds:
+                self.unconditional.append(rule_id)
+
+        for (field, op), entries in ordered.items():
+            entries.sort()
+            index = self.fields[field]
+            index.thresholds[op] = [value for value, _ in entries]
+            index.cond_ids[op] = array("i", (cid for _, cid in entries))
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "RuleSet":
+        return cls(data.get("rules", []), data.get("default"))
+
+    @classmethod
+    def from_file(cls, path: str) -> "RuleSet":
+        """Load and compile rules from a JSON file."""
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def session(self) -> "RuleSession":
+        """Create fresh working memory for one agent."""
+        return RuleSession(self)
+
+
+class RuleSession:
+    """Incremental evaluation state for one agent over a ``RuleSet``."""
+
+    def __init__(self, ruleset: RuleSet):
+        self.ruleset = ruleset
+        self.values: Dict[str, object] = {}
+        self.rule_satisfied = array("i", bytes(4 * len(ruleset)))
+        self.rule_active = bytearray(len(ruleset))
+        self._agenda: List[tuple] = []
+        self.fields_changed = 0
+        self.conditions_flipped = 0
+        for rule_id in ruleset.unconditional:
+            self._activate(rule_id)
+
+    def _activate(self, rule_id: int) -> None:
+        self.rule_active[rule_id] = 1
+        agenda = self._agenda
+        if len(agenda) > 2 * len(self.rule_active) + 64:
+            # Too many stale entries: rebuild from the rules that are active now
+            ranks = self.ruleset.ranks
+            agenda[:] = [(ranks[i], i) for i, on in enumerate(self.rule_active) if on]
+            heapq.heapify(agenda)
+        else:
+            heapq.heappush(agenda, (self.ruleset.ranks[rule_id], rule_id))
+
+    def update(self, field: str, value) -> None:
+        """Set one field, propagating only the conditions that flip."""
+        old = self.values.get(field)
+        if old == value:
+            return
+        if value is None:
+            self.values.pop(field, None)
+        else:
+            self.values[field] = value
+        index = self.ruleset.fields.get(field)
+        if index is None:
+            return
+        self.fields_changed += 1
+
+        cond_rules = self.ruleset.cond_rules
+        needs = self.ruleset.rule_needs
+        satisfied = self.rule_satisfied
+        active = self.rule_active
+        for cid, now_true in index.flips(old, value):
+            self.conditions_flipped += 1
+            delta = 1 if now_true else -1
+            for rule_id in cond_rules[cid]:
+                satisfied[rule_id] += delta
+                if satisfied[rule_id] == needs[rule_id]:
+                    self._activate(rule_id)
+                elif active[rule_id]:
+                    active[rule_id] = 0
+
+    def decide(self, state: Dict) -> Optional[str]:
+        """
+        Update the working memory from ``state`` and return the winning action.
+
+        Fields missing from ``state`` are treated as unknown; conditions on
+        them do not hold.
+        """
+        values = self.values
+        for field in self.ruleset.fields:
+            value = state.get(field)
+            if values.get(field) != value:
+                self.update(field, value)
+        rule_id = self.winner()
+        return self.ruleset.default if rule_id is None else self.ruleset.actions[rule_id]
+
+    def winner(self) -> Optional[int]:
+        """Id of the highest-ranked active rule, or None."""
+        agenda = self._agenda
+        active = self.rule_active
+        # Drop rules that were deactivated since they were pushed (lazy deletion)
+        while agenda and not active[agenda[0][1]]:
+            heapq.heappop(agenda)
+        return agenda[0][1] if agenda else None
+
+    def active_rules(self) -> List[str]:
+        """Names of all rules whose conditions currently hold."""
+        return [self.ruleset.names[i] for i, on in enumerate(self.rule_active) if on]
@@ -4,9 +4,21 @@ Description: A basic AI agent that searches the web using DuckDuckGo (no API key
 Author: @lpatel29
 """
 
+import argparse
+import os
 import requests
 from bs4 import BeautifulSoup
 import time
+from typing import Optional, Union
+
+from agents.common import get_tracer
+from agents.common.resilience import Resilience, get_breaker
+from agents.common.singleflight import SingleFlight
+from agents.search_agent.aggregate import aggregate
+from agents.search_agent.archive import SearchArchive
+
+# Concurrent identical searches share one HTTP request
+_search_flight = SingleFlight("SimpleSearchAgent", "search")
 
 
 class SimpleSearchAgent:
@@ -20,8 +32,24 @@ class SimpleSearchAgent:
     - Summarize findings
     """
     
-    def __init__(self):
-        """Initialize the search agent"""
+    def __init__(self, search_url: str = "https://html.duckduckgo.com/html/",
+                 archive: Optional[Union[SearchArchive, str]] = None, replay: bool = False):
+        """
+        Initialize the search agent
+
+        Args:
+            search_url: DuckDuckGo HTML endpoint (override to point at a local stand-in)
+            archive: ``SearchArchive`` (or its directory) that live responses
+                are recorded into
+            replay: Serve every search from ``archive`` instead of the
+                network; unrecorded queries fail
+        """
+        if replay and archive is None:
+            raise ValueError("replay needs an archive")
+        self.search_url = search_url
+        self.archive = SearchArchive(archive) if isinstance(archive, str) else archive
+        self.replay = replay
+        self.resilience = Resilience(breaker=get_breaker("duckduckgo"), deadline=30.0)
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
@@ -40,34 +68,61 @@ class SimpleSearchAgent:
         print(f"🔍 Searching for: {query}\n")
         
         # Use DuckDuckGo HTML version (no API key needed)
-        search_url = "https://html.duckduckgo.com/html/"
         params = {'q': query}
         
         try:
-            response = requests.post(search_url, data=params, headers=self.headers)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            results = []
-            
-            # Find search result elements
-            for result in soup.find_all('div', class_='result')[:num_results]:
-                title_elem = result.find('a', class_='result__a')
-                snippet_elem = result.find('a', class_='result__snippet')
-                
-                if title_elem:
-                    results.append({
-                        'title': title_elem.get_text(strip=True),
-                        'link': title_elem.get('href', ''),
-                        'snippet': snippet_elem.get_text(strip=True) if snippet_elem else 'No description'
-                    })
-            
-            return results
+            # Only agents with the same mode and archive may share a request:
+            # a replay must never be served by a live fetch, and a recording
+            # agent must make (and record) its own request
+            archive = os.path.abspath(self.archive.path) if self.archive is not None else None
+            key = (self.search_url, query, num_results, self.replay, archive)
+            results = _search_flight.do(key, lambda: self._fetch_results(params, num_results))
+            # Callers sharing a coalesced request each get their own copies
+            return [dict(result) for result in results]
             
         except Exception as e:
             print(f"❌ Error during search: {e}")
             return []
     
+    def _fetch_results(self, params, num_results):
+        """Send the search request (or replay it) and parse the result page."""
+        if self.replay:
+            with get_tracer().span("SimpleSearchAgent", "search", "archive"):
+                response = self.archive.get("POST", self.search_url, params)
+            return self._parse_results(response.text, num_results)
+
+        def attempt(timeout):
+            response = requests.post(self.search_url, data=params, headers=self.headers,
+                                     timeout=timeout)
+            response.raise_for_status()
+            return response
+
+        with get_tracer().span("SimpleSearchAgent", "search", "duckduckgo") as span:
+            response = self.resilience.call(attempt, span=span)
+        if self.archive is not None:
+            self.archive.record("POST", self.search_url, params, response.status_code,
+                                response.headers.get("Content-Type", "text/html"), response.content)
+        return self._parse_results(response.text, num_results)
+
+    def _parse_results(self, html, num_results):
+        """Extract title, link and snippet from a DuckDuckGo result page."""
+        soup = BeautifulSoup(html, 'html.parser')
+        results = []
+        
+        # Find search result elements
+        for result in soup.find_all('div', class_='result')[:num_results]:
+            title_elem = result.find('a', class_='result__a')
+            snippet_elem = result.find('a', class_='result__snippet')
+            
+            if title_elem:
+                results.append({
+                    'title': title_elem.get_text(strip=True),
+                    'link': title_elem.get('href', ''),
+                    'snippet': snippet_elem.get_text(strip=True) if snippet_elem else 'No description'
+                })
+        
+        return results
+    
     def display_results(self, results):
         """
         Display search results in a readable format.
@@ -116,12 +171,13 @@ class SimpleSearchAgent:
         
         return results
     
-    def multi_query_research(self, queries):
+    def multi_query_research(self, queries, delay=1.0):
         """
         Perform multiple searches for comprehensive research.
         
         Args:
             queries: List of search queries
+            delay: Seconds to wait between queries (default: 1.0)
         """
         all_results = {}
         
@@ -129,29 +185,80 @@ class SimpleSearchAgent:
             print(f"\n🔎 Query: {query}")
             results = self.search(query, num_results=3)
             all_results[query] = results
-            time.sleep(1)  # Be nice to the server
+            if delay:
+                time.sleep(delay)  # Be nice to the server
         
         return all_results
 
+    def aggregated_research(self, queries, delay=1.0, num_results=5, limit=10):
+        """
+        Search several queries and merge the results into one ranking.
+
+        Duplicate pages (after URL canonicalization) and near-duplicate
+        snippets are merged, and the per-query rankings are fused with
+        reciprocal rank fusion (see ``agents/search_agent/aggregate.py``).
+
+        Args:
+            queries: List of search queries
+            delay: Seconds to wait between queries (default: 1.0)
+            num_results: Results fetched per query (default: 5)
+            limit: Maximum number of merged results (default: 10)
+
+        Returns:
+            List of result dicts with title, link, snippet, score, queries
+            and duplicates, best first
+        """
+        all_results = {}
+        for query in queries:
+            print(f"\n🔎 Query: {query}")
+            all_results[query] = self.search(query, num_results=num_results)
+            if delay:
+                time.sleep(delay)  # Be nice to the server
+
+        raw = sum(len(r) for r in all_results.values())
+        merged = aggregate(all_results, limit=limit)
+        print(f"\n🧹 Merged {raw} results from {len(queries)} queries into {len(merged)}")
+        return merged
+
+
+def main(argv=None):
+    """Search for the given queries, or run the built-in examples."""
+    parser = argparse.ArgumentParser(description="Simple Search Agent (DuckDuckGo)")
+    parser.add_argument("queries", nargs="*", help="queries to research (default: run the examples)")
+    parser.add_argument("--aggregate", action="store_true",
+                        help="merge the results of all queries into one deduplicated ranking")
+    archive = parser.add_mutually_exclusive_group()
+    archive.add_argument("--record", metavar="DIR",
+                         help="archive the raw search responses in DIR for later replay")
+    archive.add_argument("--replay", metavar="DIR",
+                         help="serve searches from the archive in DIR, without network access")
+    args = parser.parse_args(argv)
 
-# Example usage
-if __name__ == "__main__":
     # Create agent instance
-    agent = SimpleSearchAgent()
+    agent = SimpleSearchAgent(archive=args.record or args.replay, replay=bool(args.replay))
+    delay = 0 if args.replay else 1.0
+
+    if args.queries and args.aggregate:
+        agent.display_results(agent.aggregated_research(args.queries, delay=delay))
+        return
+    if args.queries:
+        for query in args.queries:
+            agent.research(query)
+        return
     
     # Example 1: Simple search
     print("\n" + "🚀 EXAMPLE 1: Simple Search" + "\n")
     agent.research("Python programming tutorials")
     
     # Wait a bit
-    time.sleep(2)
+    time.sleep(2 * delay)
     
     # Example 2: AI-related search
     print("\n\n" + "🚀 EXAMPLE 2: AI Research" + "\n")
     agent.research("What are AI agents?")
     
     # Wait a bit
-    time.sleep(2)
+    time.sleep(2 * delay)
     
     # Example 3: Multiple queries for comprehensive research
     print("\n\n" + "🚀 EXAMPLE 3: Multi-Query Research" + "\n")
@@ -161,8 +268,13 @@ if __name__ == "__main__":
         "How to build chatbots"
     ]
     
-    results = agent.multi_query_research(queries)
+    results = agent.aggregated_research(queries, delay=delay, num_results=3)
+    agent.display_results(results)
     
     print("\n📈 COMPREHENSIVE RESEARCH COMPLETE")
     print(f"Total queries: {len(queries)}")
-    print(f"Total results: {sum(len(r) for r in results.values())}")
\ No newline at end of file
+    print(f"Unique results: {len(results)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Aggregation of multi-query search results.
+
+``multi_query_research`` returns one raw result list per query; the same
+pages show up under several queries, often behind different URLs (DuckDuckGo
+redirect links, tracking parameters, ``www.``, trailing slashes) or as
+mirrors with near-identical snippets. ``aggregate`` turns those lists into
+one compact ranking:
+
+1. every link is canonicalized and exact duplicates are merged through a
+   dict keyed on the canonical URL,
+2. the per-query rankings are fused with reciprocal rank fusion (RRF): a
+   result scores ``sum(1 / (k + rank))`` over the queries that returned it,
+3. results whose title and snippet have SimHash fingerprints within a few
+   bits of each other are clustered, and each cluster is reported once
+   under its best-ranked member.
+"""
+
+import hashlib
+import re
+from typing import Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+RRF_K = 60
+SIMHASH_BITS = 64
+NEAR_DUPLICATE_DISTANCE = 3
+
+_TRACKING_PARAMS = {"gclid", "fbclid", "msclkid", "mc_cid", "mc_eid", "ref", "ref_src", "igshid", "yclid"}
+_DEFAULT_PORTS = {"http": "80", "https": "443"}
+_WORD = re.compile(r"\w+")
+
+
+def resolve_redirect(url: str) -> str:
+    """Target of a DuckDuckGo ``/l/?uddg=`` redirect link, or ``url`` itself."""
+    url = url.strip()
+    if url.startswith("//"):
+        url = "https:" + url
+    parts = urlsplit(url)
+    if parts.netloc.endswith("duckduckgo.com") and parts.path.startswith("/l/"):
+        target = dict(parse_qsl(parts.query)).get("uddg")
+        if target:
+            return target
+    return url
+
+
+def canonical_url(url: str) -> str:
+    """
+    Normalize ``url`` so the same page gets the same key.
+
+    Redirect links are resolved; scheme and host are lowercased, ``www.``,
+    default ports, fragments, tracking parameters (``utm_*``, ``gclid``, ...)
+    and trailing slashes are dropped, and the remaining query parameters
+    are sorted. ``http`` and ``https`` map to the same key.
+    """
+    url = resolve_redirect(url)
+    parts = urlsplit(url)
+    if not parts.netloc:
+        return url
+
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    port = str(parts.port) if parts.port else ""
+    if port and port != _DEFAULT_PORTS.get(parts.scheme.lower()):
+        host = f"{host}:{port}"
+    query = sorted((key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                   if not key.lower().startswith("utm_") and key.lower() not in _TRACKING_PARAMS)
+    path = re.sub(r"/{2,}", "/", parts.path).rstrip("/")
+    return urlunsplit(("https", host, path, urlencode(query), ""))
+
+
+def simhash(text: str, bits: int = SIMHASH_BITS) -> int:
+    """SimHash fingerprint of ``text`` over word 2-shingles (single words for short texts)."""
+    words = _WORD.findall(text.lower())
+    shingles = [" ".join(pair) for pair in zip(words, words[1:])] or words
+    if not shingles:
+        return 0
+    counts = [0] * bits
+    for shingle in shingles:
+        h = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=bits // 8).digest(), "big")
+        for bit in range(bits):
+            counts[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit, count in enumerate(counts) if count > 0)
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+class _NearDuplicateIndex:
+    """
+    Find fingerprints within ``distance`` bits of a query fingerprint.
+
+    Fingerprints are split into ``distance + 1`` bands; by the pigeonhole
+    principle two fingerprints that differ in at most ``distance`` bits agree
+    exactly on at least one band, so only fingerprints sharing a band are
+    compared.
+    """
+
+    def __init__(self, distance: int = NEAR_DUPLICATE_DISTANCE, bits: int = SIMHASH_BITS):
+        self.distance = distance
+        self.bands = distance + 1
+        self.width = -(-bits // self.bands)
+        self.mask = (1 << self.width) - 1
+        self.buckets: Dict[tuple, List[int]] = {}
+        self.fingerprints: List[int] = []
+
+    def _keys(self, fingerprint: int):
+        return [(band, fingerprint >> (band * self.width) & self.mask) for band in range(self.bands)]
+
+    def find(self, fingerprint: int) -> Optional[int]:
+        """Id of the first stored fingerprint within ``distance`` bits, if any."""
+        for key in self._keys(fingerprint):
+            for item in self.buckets.get(key, ()):
+                if hamming(self.fingerprints[item], fingerprint) <= self.distance:
+                    return item
+        return None
+
+    def add(self, fingerprint: int) -> int:
+        item = len(self.fingerprints)
+        self.fingerprints.append(fingerprint)
+        for key in self._keys(fingerprint):
+            self.buckets.setdefault(key, []).append(item)
+        return item
+
+
+def aggregate(results_by_query: Dict[str, List[Dict]], k: int = RRF_K,
+              distance: int = NEAR_DUPLICATE_DISTANCE, limit: Optional[int] = None) -> List[Dict]:
+    """
+    Merge per-query result lists into one deduplicated ranking.
+
+    Args:
+        results_by_query: ``{query: [{'title', 'link', 'snippet'}, ...]}`` as
+            returned by ``SimpleSearchAgent.multi_query_research``
+        k: RRF constant; larger values flatten the weight of top ranks
+        distance: Maximum SimHash distance (in bits) for two results to be
+            treated as near duplicates; 0 disables clustering
+        limit: Maximum number of results to return
+
+    Returns:
+        Result dicts ordered by fused score. Besides ``title``, ``link`` and
+        ``snippet`` (from the best-ranked member; redirect links resolved)
+        each has ``score``, ``queries`` (the queries that found it) and
+        ``duplicates`` (the other links merged into it).
+    """
+    merged: Dict[str, Dict] = {}
+    for query, results in results_by_query.items():
+        seen = set()
+        for rank, result in enumerate(results, 1):
+            link = resolve_redirect(result.get("link", ""))
+            key = canonical_url(link)
+            if key in seen:
+                continue  # a query listing the same page twice counts once
+            seen.add(key)
+            entry = merged.get(key)
+            if entry is None:
+                entry = merged[key] = {**result, "link": link, "score": 0.0, "queries": [],
+                                       "duplicates": [], "_best": rank}
+            else:
+                if link != entry["link"] and link not in entry["duplicates"]:
+                    entry["duplicates"].append(link)
+                if rank < entry["_best"]:
+                    entry.update(title=result.get("title", entry["title"]),
+                                 snippet=result.get("snippet", entry["snippet"]), _best=rank)
+            entry["score"] += 1.0 / (k + rank)
+            entry["queries"].append(query)
+
+    ranked = sorted(merged.values(), key=lambda e: -e["score"])
+    if distance > 0:
+        index = _NearDuplicateIndex(distance)
+        clusters: List[Dict] = []
+        for entry in ranked:
+            fingerprint = simhash(f"{entry.get('title', '')} {entry.get('snippet', '')}")
+            match = index.find(fingerprint)
+            if match is None:
+                index.add(fingerprint)
+                clusters.append(entry)
+                continue
+            head = clusters[match]
+            head["score"] += entry["score"]
+            head["queries"].extend(q for q in entry["queries"] if q not in head["queries"])
+            head["duplicates"].append(entry["link"])
+            head["duplicates"].extend(entry["duplicates"])
+        ranked = sorted(clusters, key=lambda e: -e["score"])
+
+    for entry in ranked:
+        del entry["_best"]
+    return ranked[:limit] if limit else ranked
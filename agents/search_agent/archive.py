@@ -0,0 +1,240 @@
+"""
+Offline record/replay archive for HTTP responses.
+
+Live DuckDuckGo results change constantly and cannot be load-tested, so
+``SimpleSearchAgent`` can record the raw responses it receives into a local
+archive and later replay them with no network access.
+
+Layout of an archive directory, loosely modelled on WARC files:
+
+- ``segment-00000.warc.gz``, ``segment-00001.warc.gz``, ...: each response
+  is one WARC-style record (``WARC/1.1`` header block, then the HTTP status
+  line, headers and body) compressed as its own gzip member. Concatenated
+  members form a valid gzip file, and any record can be decompressed on its
+  own from its offset. A new segment is started once the current one
+  passes ``segment_size`` bytes.
+- ``index.jsonl``: one line per record with the request key and the
+  segment, offset and compressed length of the record. A key recorded
+  twice is served from its latest record.
+
+Replay reads records through ``mmap``, so concurrent readers share the OS
+page cache and only the requested bytes are touched.
+"""
+
+import gzip
+import json
+import mmap
+import os
+import threading
+import uuid
+import zlib
+from datetime import datetime, timezone
+from typing import Dict, Iterator, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+SEGMENT_SIZE = 64 * 1024 * 1024
+INDEX_FILE = "index.jsonl"
+
+
+class ArchiveMiss(KeyError):
+    """A replayed request that was never recorded."""
+
+
+def request_key(method: str, url: str, params: Optional[Dict] = None) -> str:
+    """Stable key for a request: method, URL and sorted parameters."""
+    query = urlencode(sorted((params or {}).items()))
+    return f"{method.upper()} {url}" + (f"?{query}" if query else "")
+
+
+class ArchivedResponse:
+    """The parts of ``requests.Response`` the agents use."""
+
+    def __init__(self, url: str, status_code: int, headers: Dict[str, str], content: bytes):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def encoding(self) -> str:
+        content_type = self.headers.get("Content-Type", "")
+        if "charset=" in content_type:
+            return content_type.split("charset=", 1)[1].split(";")[0].strip()
+        return "utf-8"
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding, errors="replace")
+
+
+class SearchArchive:
+    """
+    Append-only archive of HTTP responses with an offset index.
+
+    Args:
+        path: Archive directory (created if missing)
+        segment_size: Start a new segment file after this many bytes
+    """
+
+    def __init__(self, path: str, segment_size: int = SEGMENT_SIZE):
+        self.path = path
+        self.segment_size = segment_size
+        os.makedirs(path, exist_ok=True)
+        # key -> (segment number, offset, compressed length)
+        self.index: Dict[str, Tuple[int, int, int]] = {}
+        self._lock = threading.Lock()
+        self._maps: Dict[int, mmap.mmap] = {}
+        self._files: Dict[int, object] = {}
+        self._writer = None
+        self._writer_segment = 0
+        self._index_file = None
+        self.hits = self.misses = 0
+        self._load_index()
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.path, f"segment-{segment:05d}.warc.gz")
+
+    def _load_index(self) -> None:
+        index_path = os.path.join(self.path, INDEX_FILE)
+        if not os.path.exists(index_path):
+            return
+        with open(index_path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # a torn last line from an interrupted recording
+                self.index[entry["key"]] = (entry["segment"], entry["offset"], entry["length"])
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.index
+
+    def requests(self) -> Iterator[Tuple[str, str, Dict[str, str]]]:
+        """``(method, url, params)`` of every recorded request, e.g. to replay them all."""
+        for key in list(self.index):
+            method, _, target = key.partition(" ")
+            url, _, query = target.partition("?")
+            yield method, url, dict(parse_qsl(query))
+
+    def record(self, method: str, url: str, params: Optional[Dict], status_code: int,
+               content_type: str, content: bytes) -> str:
+        """
+        Append a response to the archive.
+
+        Returns:
+            The request key it is stored under
+        """
+        key = request_key(method, url, params)
+        http = (f"HTTP/1.1 {status_code}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Length: {len(content)}\r\n\r\n").encode("utf-8") + content
+        warc = (f"WARC/1.1\r\nWARC-Type: response\r\nWARC-Target-URI: {url}\r\n"
+                f"WARC-Date: {datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')}\r\n"
+                f"WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>\r\nX-Request-Key: {key}\r\n"
+                f"Content-Type: application/http; msgtype=response\r\n"
+                f"Content-Length: {len(http)}\r\n\r\n").encode("utf-8")
+        packed = gzip.compress(warc + http + b"\r\n\r\n", compresslevel=6)
+
+        with self._lock:
+            segment, writer = self._open_writer()
+            offset = writer.tell()
+            writer.write(packed)
+            writer.flush()
+            self._index_file.write(json.dumps({"key": key, "segment": segment, "offset": offset,
+                                               "length": len(packed), "status": status_code}) + "\n")
+            self._index_file.flush()
+            self.index[key] = (segment, offset, len(packed))
+        return key
+
+    def _open_writer(self):
+        if self._writer is not None and self._writer.tell() < self.segment_size:
+            return self._writer_segment, self._writer
+        if self._writer is not None:
+            self._writer.close()
+            segment = self._writer_segment + 1
+        else:
+            # Continue the last segment of an existing archive unless it is full
+            names = [n for n in os.listdir(self.path) if n.startswith("segment-")]
+            segment = max((int(n[8:13]) for n in names), default=0)
+            if os.path.exists(self._segment_path(segment)) and \
+                    os.path.getsize(self._segment_path(segment)) >= self.segment_size:
+                segment += 1
+        self._writer = open(self._segment_path(segment), "ab")
+        self._writer_segment = segment
+        if self._index_file is None:
+            self._index_file = open(os.path.join(self.path, INDEX_FILE), "a", encoding="utf-8")
+        return segment, self._writer
+
+    def _map(self, segment: int, end: int) -> mmap.mmap:
+        mapped = self._maps.get(segment)
+        if mapped is None or len(mapped) < end:
+            # Not mapped yet, or the segment grew since (recording and replaying at once)
+            if mapped is not None:
+                mapped.close()
+                self._files.pop(segment).close()
+            f = open(self._segment_path(segment), "rb")
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._files[segment], self._maps[segment] = f, mapped
+        return mapped
+
+    def get(self, method: str, url: str, params: Optional[Dict] = None) -> ArchivedResponse:
+        """
+        Replay a recorded response.
+
+        Raises:
+            ArchiveMiss: The request was never recorded
+        """
+        key = request_key(method, url, params)
+        location = self.index.get(key)
+        if location is None:
+            with self._lock:
+                self.misses += 1
+            raise ArchiveMiss(f"not in archive: {key}")
+        segment, offset, length = location
+        with self._lock:
+            data = self._map(segment, offset + length)[offset:offset + length]
+            self.hits += 1
+        record = zlib.decompress(data, 31)  # 31: expect a gzip header
+
+        _, _, http = record.partition(b"\r\n\r\n")
+        head, _, body = http.partition(b"\r\n\r\n")
+        lines = head.decode("utf-8").split("\r\n")
+        headers = dict(line.split(": ", 1) for line in lines[1:] if ": " in line)
+        content = body[:int(headers["Content-Length"])]
+        return ArchivedResponse(url, int(lines[0].split()[1]), headers, content)
+
+    def stats(self) -> Dict:
+        """Record count, segments, compressed bytes and replay hits/misses."""
+        segments = {s for s, _, _ in self.index.values()}
+        return {
+            "records": len(self.index),
+            "segments": len(segments),
+            "bytes": sum(os.path.getsize(self._segment_path(s)) for s in segments
+                         if os.path.exists(self._segment_path(s))),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def close(self) -> None:
+        """Flush the writer and release memory maps."""
+        with self._lock:
+            for f in (self._writer, self._index_file):
+                if f is not None:
+                    f.close()
+            self._writer = self._index_file = None
+            for mapped in self._maps.values():
+                mapped.close()
+            for f in self._files.values():
+                f.close()
+            self._maps.clear()
+            self._files.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,7 +1,12 @@
 """Agent with function calling capabilities"""
-import google.generativeai as genai
+import argparse
 import time
 
+import google.generativeai as genai
+
+from agents.common import wrap_model
+from agents.common.config import configure_gemini
+
 
 class ToolAgent:
     def __init__(self):
@@ -31,10 +36,10 @@ class ToolAgent:
             }
         ]
         
-        self.model = genai.GenerativeModel(
+        self.model = wrap_model(genai.GenerativeModel(
             'gemini-1.5-flash',
             tools=self.tools
-        )
+        ), agent="ToolAgent")
         self.chat = self.model.start_chat()
     
     def calculate(self, expression: str) -> float:
@@ -74,3 +79,17 @@ class ToolAgent:
             })
         
         return response.text
+
+
+def main(argv=None):
+    """Send one request to the tool-calling agent."""
+    parser = argparse.ArgumentParser(description="Tool Agent - Gemini function calling")
+    parser.add_argument("message", help='request, e.g. "What is 17 * 23?"')
+    args = parser.parse_args(argv)
+
+    configure_gemini()
+    print(ToolAgent().process_request(args.message))
+
+
+if __name__ == "__main__":
+    main()
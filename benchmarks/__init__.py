@@ -0,0 +1,5 @@
+"""
+Benchmarks for the agents in this repository.
+
+Run from the repository root with ``python -m benchmarks.run``.
+"""
@@ -0,0 +1,69 @@
+"""
+Compare two benchmark result files and flag regressions.
+
+Usage:
+    python -m benchmarks.compare baseline.json candidate.json [--threshold 10]
+
+Exits with status 1 if any metric regressed by more than the threshold.
+"""
+
+import argparse
+import json
+import sys
+
+# metric -> True if higher is better
+METRICS = {
+    "ops_per_sec": True,
+    "latency_p50_ms": False,
+    "latency_p99_ms": False,
+    "alloc_peak_bytes_per_op": False,
+    "peak_rss_bytes": False,
+}
+
+
+def load(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return {r["name"]: r for r in json.load(f)["results"]}
+
+
+def compare(baseline: dict, candidate: dict, threshold: float) -> list:
+    """
+    Return one row per (workload, metric) present in both runs.
+
+    Each row is ``(workload, metric, old, new, change_percent, regressed)``.
+    """
+    rows = []
+    for name in sorted(set(baseline) & set(candidate)):
+        for metric, higher_is_better in METRICS.items():
+            old = baseline[name].get(metric)
+            new = candidate[name].get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old * 100
+            worse = -change if higher_is_better else change
+            rows.append((name, metric, old, new, change, worse > threshold))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two benchmark runs")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="regression threshold in percent (default: 10)")
+    args = parser.parse_args(argv)
+
+    rows = compare(load(args.baseline), load(args.candidate), args.threshold)
+    print(f"{'workload':<28}{'metric':<26}{'baseline':>14}{'candidate':>14}{'change':>10}")
+    print("-" * 92)
+    for name, metric, old, new, change, regressed in rows:
+        flag = "  ❌ REGRESSION" if regressed else ""
+        print(f"{name:<28}{metric:<26}{old:>14.3f}{new:>14.3f}{change:>+9.1f}%{flag}")
+
+    regressions = sum(1 for row in rows if row[-1])
+    print(f"\n{regressions} regression(s) above {args.threshold:.0f}%")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
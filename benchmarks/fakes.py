@@ -0,0 +1,187 @@
+"""
+Local stand-ins used by the benchmarks.
+
+- ``FakeGenerativeModel`` replaces ``genai.GenerativeModel`` and answers
+  instantly (or after a fixed simulated latency) with a canned response
+  of realistic size, including ``usage_metadata``. In JSON mode (a
+  ``response_schema`` in ``generation_config``) the response is JSON that
+  matches the schema; ``malformed_rate`` makes a share of those replies
+  invalid, to exercise the repair path.
+- ``LocalSearchServer`` serves DuckDuckGo-style HTML result pages from a
+  background thread so ``SimpleSearchAgent.search`` can run without network.
+"""
+
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from urllib.parse import parse_qs
+
+
+class FakeUsage:
+    def __init__(self, prompt_tokens: int, output_tokens: int):
+        self.prompt_token_count = prompt_tokens
+        self.candidates_token_count = output_tokens
+        self.total_token_count = prompt_tokens + output_tokens
+
+
+class FakeResponse:
+    def __init__(self, text: str, prompt: str):
+        self.text = text
+        self.usage_metadata = FakeUsage(len(prompt) // 4, len(text) // 4)
+
+
+def _fake_text(prompt: str, size: int) -> str:
+    """Build a deterministic response of roughly ``size`` characters."""
+    head = "Steps: evaluated the expression step by step.\nAnswer: 42\n"
+    body = ("This is a simulated model response used for benchmarking. " * (size // 58 + 1))[:size]
+    return head + body + f"\n(prompt length: {len(prompt)})"
+
+
+def _fake_value(schema: dict, filler: str):
+    """Smallest value matching ``schema``, with ``filler`` as string content."""
+    kind = str(schema.get("type", "string")).lower()
+    if "enum" in schema:
+        return schema["enum"][0]
+    if kind == "object":
+        return {name: _fake_value(sub, filler) for name, sub in schema.get("properties", {}).items()}
+    if kind == "array":
+        return [_fake_value(schema.get("items", {}), filler)]
+    return {"integer": 42, "number": 42.0, "boolean": True}.get(kind, filler)
+
+
+def _fake_json(schema: dict, size: int) -> str:
+    # Spread roughly ``size`` characters over the string fields
+    strings = json.dumps(_fake_value(schema, "")).count('""') or 1
+    filler = ("Simulated structured content. " * (size // 30 + 1))[:max(1, size // strings)]
+    return json.dumps(_fake_value(schema, filler.strip()))
+
+
+class FakeChatSession:
+    """Mimics ``genai.ChatSession``: keeps growing history across turns."""
+
+    def __init__(self, model: "FakeGenerativeModel", history=None):
+        self.model = model
+        self.history = list(history or [])
+
+    def send_message(self, content, generation_config=None, **kwargs):
+        text = str(content)
+        # The real SDK resends the whole history on every turn
+        prompt = "".join(self.history) + text
+        response = self.model._respond(prompt, generation_config)
+        self.history.append(text)
+        self.history.append(response.text)
+        return response
+
+
+class FakeGenerativeModel:
+    """Stand-in for ``genai.GenerativeModel`` with configurable latency."""
+
+    latency = 0.0
+    prompt_latency = 0.0  # extra seconds per 1k prompt tokens (prefill)
+    response_chars = 800
+    malformed_rate = 0.0  # share of JSON-mode replies that are cut short
+    _rng = random.Random(0)
+
+    def __init__(self, model_name: str = "gemini-fake", generation_config=None,
+                 system_instruction=None, tools=None, **kwargs):
+        self.model_name = f"models/{model_name}"
+        self.generation_config = generation_config
+        self.system_instruction = system_instruction or ""
+        self.tools = tools
+
+    def _respond(self, prompt: str, generation_config=None) -> FakeResponse:
+        delay = self.latency + self.prompt_latency * len(prompt) / 4000
+        if delay:
+            time.sleep(delay)
+        config = generation_config or self.generation_config
+        schema = config.get("response_schema") if isinstance(config, dict) else None
+        if schema is None:
+            text = _fake_text(prompt, self.response_chars)
+        else:
+            text = _fake_json(schema, self.response_chars)
+            if self.malformed_rate and self._rng.random() < self.malformed_rate:
+                text = text[:len(text) // 2]
+        return FakeResponse(text, self.system_instruction + prompt)
+
+    def generate_content(self, contents, generation_config=None, **kwargs):
+        return self._respond(str(contents), generation_config)
+
+    def start_chat(self, history=None, **kwargs):
+        return FakeChatSession(self, history)
+
+
+@contextmanager
+def fake_genai(latency: float = 0.0, response_chars: int = 800, prompt_latency: float = 0.0,
+               malformed_rate: float = 0.0):
+    """
+    Patch ``google.generativeai`` so agents created inside the block use
+    ``FakeGenerativeModel`` and never touch the network.
+
+    ``prompt_latency`` adds that many seconds per 1k prompt tokens, for
+    workloads where the prompt size matters. ``malformed_rate`` is the share
+    of JSON-mode replies returned truncated.
+    """
+    import google.generativeai as genai
+
+    attrs = {"latency": latency, "response_chars": response_chars, "prompt_latency": prompt_latency,
+             "malformed_rate": malformed_rate}
+    with mock.patch.multiple(FakeGenerativeModel, **attrs), \
+            mock.patch.object(genai, "GenerativeModel", FakeGenerativeModel), \
+            mock.patch.object(genai, "configure", lambda **kwargs: None):
+        yield
+
+
+def render_results_page(query: str, num_results: int = 10) -> str:
+    """Render an HTML page shaped like html.duckduckgo.com results."""
+    items = []
+    for i in range(num_results):
+        items.append(
+            '<div class="result results_links results_links_deep web-result">'
+            '<div class="links_main links_deep result__body">'
+            f'<h2 class="result__title"><a rel="nofollow" class="result__a" '
+            f'href="https://example.com/{i}/{query.replace(" ", "-")}">Result {i} for {query}</a></h2>'
+            f'<a class="result__snippet" href="https://example.com/{i}">'
+            f'Snippet {i} describing <b>{query}</b> in a couple of sentences. '
+            'It mentions related topics and a few keywords.</a>'
+            '</div></div>'
+        )
+    return (
+        "<!DOCTYPE html><html><head><title>results</title></head><body>"
+        '<div id="links" class="results">' + "".join(items) + "</div></body></html>"
+    )
+
+
+class LocalSearchServer:
+    """DuckDuckGo HTML endpoint stand-in running on a local port."""
+
+    def __init__(self, num_results: int = 10, host: str = "127.0.0.1", port: int = 0):
+        num = num_results
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                form = parse_qs(self.rfile.read(length).decode("utf-8"))
+                body = render_results_page(form.get("q", [""])[0], num).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self.url = f"http://{host}:{self._server.server_port}/html/"
+
+    def __enter__(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,101 @@
+"""
+Fleet simulation benchmark: vectorized NumPy fleet vs the scalar agent loop.
+
+The scalar loop is the original demo scaled up: one ``SimpleAgent`` and one
+``Environment`` per thermostat, with a Python call per perceive/decide/act.
+The vectorized ``Fleet`` keeps all temperatures in one array and applies the
+same rules as masks. Initial temperatures are spread over 10-34 degrees so
+every rule fires; both simulations are checked to end in the same state.
+
+Usage (from the repository root):
+    python -m benchmarks.fleet_bench
+    python -m benchmarks.fleet_bench --sizes 1000000 --ticks 100 --scalar-limit 0
+"""
+
+import argparse
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+
+from agents.rule_based_agent.agent import Environment, SimpleAgent
+from agents.rule_based_agent.fleet import Fleet
+
+from .harness import quiet, write_results
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def initial_temperatures(size: int) -> np.ndarray:
+    return (np.arange(size) % 25 + 10).astype(np.float32)
+
+
+def run_vectorized(size: int, ticks: int):
+    fleet = Fleet(size, temperature=initial_temperatures(size))
+    t0 = time.perf_counter()
+    fleet.run(ticks)
+    return time.perf_counter() - t0, fleet
+
+
+def run_scalar(size: int, ticks: int):
+    envs, agents = [], []
+    for temperature in initial_temperatures(size).tolist():
+        env = Environment()
+        env.temperature = int(temperature)
+        envs.append(env)
+        agents.append(SimpleAgent("ThermostatBot"))
+
+    t0 = time.perf_counter()
+    with quiet():
+        for _ in range(ticks):
+            for agent, env in zip(agents, envs):
+                agent.act(agent.decide(agent.perceive(env)), env)
+    return time.perf_counter() - t0, envs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the vectorized thermostat fleet")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000, 1000000])
+    parser.add_argument("--ticks", type=int, default=50)
+    parser.add_argument("--scalar-limit", type=int, default=10000,
+                        help="largest fleet also simulated with the scalar loop")
+    parser.add_argument("--output", help="JSON results path")
+    args = parser.parse_args(argv)
+
+    results = []
+    print(f"{'agents':>9}{'ticks/s':>12}{'agent-steps/s':>16}{'scalar ticks/s':>16}{'speedup':>9}")
+    print("-" * 62)
+    for size in args.sizes:
+        elapsed, fleet = run_vectorized(size, args.ticks)
+        result = {
+            "name": f"fleet_{size}",
+            "agents": size,
+            "ticks": args.ticks,
+            "ticks_per_sec": args.ticks / elapsed,
+            "agent_steps_per_sec": size * args.ticks / elapsed,
+            "state_bytes": sum(a.nbytes for a in fleet.env.fields.values()),
+            "actions": fleet.action_counts(),
+            "scalar_ticks_per_sec": None,
+            "speedup": None,
+        }
+        if size <= args.scalar_limit:
+            scalar_elapsed, envs = run_scalar(size, args.ticks)
+            final = np.array([env.temperature for env in envs], dtype=np.float32)
+            if not np.array_equal(final, fleet.env.fields["temperature"]):
+                raise AssertionError("vectorized and scalar simulations disagree")
+            result["scalar_ticks_per_sec"] = args.ticks / scalar_elapsed
+            result["speedup"] = scalar_elapsed / elapsed
+        results.append(result)
+        scalar = (f"{result['scalar_ticks_per_sec']:>16.1f}{result['speedup']:>8.0f}x"
+                  if result["speedup"] else f"{'-':>16}{'-':>9}")
+        print(f"{size:>9}{result['ticks_per_sec']:>12.1f}{result['agent_steps_per_sec']:>16.3g}{scalar}")
+
+    output = args.output or os.path.join(
+        REPO_ROOT, "benchmarks", "results", "fleet-" + datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    write_results(output, results, meta=vars(args))
+    print(f"\n✓ Results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
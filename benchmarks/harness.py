@@ -0,0 +1,134 @@
+"""
+Measurement helpers shared by the benchmark scripts.
+"""
+
+import contextlib
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """Nearest-rank percentile of ``samples`` (``q`` in 0..100)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(q / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Peak resident set size of this process, or None if unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes on Linux
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence the agents' console output while measuring."""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def measure(name: str, op: Callable[[], object], iterations: int = 200,
+            warmup: int = 10, alloc_iterations: int = 50) -> Dict:
+    """
+    Run ``op`` repeatedly and collect latency and allocation statistics.
+
+    Latency is measured in a pass without tracemalloc; allocations are
+    measured separately on ``alloc_iterations`` calls so tracing overhead
+    does not distort the timings.
+
+    Returns:
+        Dictionary with throughput, p50/p99 latency, allocations and peak RSS
+    """
+    with quiet():
+        for _ in range(warmup):
+            op()
+
+        gc.collect()
+        latencies = []
+        start = time.perf_counter()
+        for _ in range(iterations):
+            t0 = time.perf_counter()
+            op()
+            latencies.append(time.perf_counter() - t0)
+        elapsed = time.perf_counter() - start
+
+        alloc_peaks = []
+        net_blocks = []
+        tracemalloc.start()
+        try:
+            for _ in range(alloc_iterations):
+                tracemalloc.reset_peak()
+                before, _ = tracemalloc.get_traced_memory()
+                blocks = sys.getallocatedblocks()
+                op()
+                net_blocks.append(sys.getallocatedblocks() - blocks)
+                alloc_peaks.append(tracemalloc.get_traced_memory()[1] - before)
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "name": name,
+        "iterations": iterations,
+        "ops_per_sec": iterations / elapsed if elapsed else 0.0,
+        "latency_p50_ms": percentile(latencies, 50) * 1000,
+        "latency_p99_ms": percentile(latencies, 99) * 1000,
+        "latency_mean_ms": statistics.mean(latencies) * 1000 if latencies else 0.0,
+        "alloc_peak_bytes_per_op": statistics.mean(alloc_peaks) if alloc_peaks else 0,
+        "net_blocks_per_op": statistics.mean(net_blocks) if net_blocks else 0,
+        "peak_rss_bytes": peak_rss_bytes(),
+    }
+
+
+def environment() -> Dict:
+    """Describe the machine the benchmark ran on."""
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def write_results(path: str, results: List[Dict], meta: Optional[Dict] = None) -> None:
+    """Write benchmark results as JSON, creating parent directories."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    payload = {"environment": environment(), "meta": meta or {}, "results": results}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+
+
+def format_table(results: List[Dict]) -> str:
+    """Render results as a text table."""
+    lines = [
+        f"{'workload':<32}{'ops/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'alloc KB/op':>13}{'peak RSS MB':>13}",
+        "-" * 88,
+    ]
+    for r in results:
+        rss = r.get("peak_rss_bytes")
+        lines.append(
+            f"{r['name']:<32}{r['ops_per_sec']:>10.1f}{r['latency_p50_ms']:>10.3f}"
+            f"{r['latency_p99_ms']:>10.3f}{r['alloc_peak_bytes_per_op'] / 1024:>13.1f}"
+            f"{(rss / 2 ** 20 if rss else 0):>13.1f}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,158 @@
+"""
+History storage benchmark: bytes per entry, list of dicts vs ``HistoryStore``.
+
+Fills a chatbot-shaped history (user message, bot reply, timestamp) and a
+calculator-shaped one (expression, response, steps, answer, value, status)
+with synthetic English-like text, and measures the Python heap they occupy
+with ``tracemalloc``:
+
+- ``dicts``       the old layout, one dict per entry with a formatted timestamp
+- ``columnar``    ``HistoryStore`` without compression or spilling
+- ``compressed``  bodies older than the last 20 entries zlib-compressed
+- ``spilled``     compressed, with bodies beyond ``--memory-limit`` on disk
+
+Append and random-read times per entry are measured in a second, untraced
+run.
+
+Usage (from the repository root):
+    python -m benchmarks.history_bench
+    python -m benchmarks.history_bench --entries 100000 --memory-limit 1048576
+"""
+
+import argparse
+import os
+import random
+import time
+import tracemalloc
+from datetime import datetime
+
+from agents.common.history import HistoryStore
+
+from .harness import write_results
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WORDS = ("the model agent answer question value result step because first then "
+         "python function data error time number history session user reply "
+         "learning path calculate memory compress store entry token prompt").split()
+
+CHAT_COLUMNS = (("user", "text"), ("bot", "text"))
+CALCULATOR_COLUMNS = (("expression", "text"), ("full_response", "text"), ("steps", "json"),
+                      ("answer", "text"), ("value", "number"), ("status", "enum"))
+
+
+def sentence(rng: random.Random, chars: int) -> str:
+    words, size = [], 0
+    while size < chars:
+        word = rng.choice(WORDS)
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)
+
+
+def chat_entries(count: int, seed: int):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield {"user": sentence(rng, rng.randint(20, 300)), "bot": sentence(rng, rng.randint(200, 2000))}
+
+
+def calculator_entries(count: int, seed: int):
+    rng = random.Random(seed)
+    for i in range(count):
+        steps = [sentence(rng, rng.randint(20, 80)) for _ in range(rng.randint(1, 4))]
+        answer = str(rng.randint(0, 10000))
+        yield {"expression": f"{rng.randint(1, 999)} * {rng.randint(1, 999)} + {i}",
+               "full_response": "Steps:\n" + "\n".join(steps) + f"\nAnswer: {answer}",
+               "steps": steps, "answer": answer, "value": float(answer),
+               "status": "success" if rng.random() > 0.02 else "error"}
+
+
+def build(kind, columns):
+    return [] if kind == "dicts" else HistoryStore(columns, **kind)
+
+
+def add(history, entry) -> None:
+    if isinstance(history, HistoryStore):
+        history.append(**entry)
+    else:
+        history.append(dict(entry, timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+
+
+def measure_size(kind, columns, entries) -> int:
+    """Heap bytes held by a history filled from ``entries`` (generated while traced)."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    history = build(kind, columns)
+    for entry in entries:
+        add(history, entry)
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    if isinstance(history, HistoryStore):
+        history.close()
+    return size
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark compact history storage")
+    parser.add_argument("--entries", type=int, default=20000)
+    parser.add_argument("--memory-limit", type=int, default=256 * 1024,
+                        help="in-memory body bytes for the spilled layout")
+    parser.add_argument("--reads", type=int, default=2000, help="random entries read back")
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--output", help="JSON results path")
+    args = parser.parse_args(argv)
+
+    layouts = {
+        "dicts": "dicts",
+        "columnar": {"compress_after": None, "memory_limit": None},
+        "compressed": {"compress_after": 20, "memory_limit": None},
+        "spilled": {"compress_after": 20, "memory_limit": args.memory_limit},
+    }
+    shapes = {"chat": (CHAT_COLUMNS, chat_entries), "calculator": (CALCULATOR_COLUMNS, calculator_entries)}
+
+    results = []
+    print(f"{'shape':<12}{'layout':<12}{'bytes/entry':>13}{'vs dicts':>10}{'disk/entry':>12}"
+          f"{'append µs':>11}{'read µs':>10}")
+    print("-" * 80)
+    for shape, (columns, generate) in shapes.items():
+        baseline = None
+        for layout, kind in layouts.items():
+            size = measure_size(kind, columns, generate(args.entries, args.seed))
+            entries = list(generate(args.entries, args.seed))
+            history = build(kind, columns)
+            t0 = time.perf_counter()
+            for entry in entries:
+                add(history, entry)
+            elapsed = time.perf_counter() - t0
+
+            rng = random.Random(args.seed)
+            indices = [rng.randrange(args.entries) for _ in range(args.reads)]
+            t0 = time.perf_counter()
+            for i in indices:
+                history[i]
+            read = (time.perf_counter() - t0) / len(indices)
+            disk = history.stats()["disk_bytes"] if isinstance(history, HistoryStore) else 0
+            if isinstance(history, HistoryStore):
+                history.close()
+            baseline = baseline or size
+            results.append({
+                "name": f"{shape}_{layout}",
+                "entries": args.entries,
+                "bytes_per_entry": size / args.entries,
+                "ratio_vs_dicts": size / baseline,
+                "disk_bytes_per_entry": disk / args.entries,
+                "append_us": elapsed / args.entries * 1e6,
+                "read_us": read * 1e6,
+            })
+            r = results[-1]
+            print(f"{shape:<12}{layout:<12}{r['bytes_per_entry']:>13,.0f}{r['ratio_vs_dicts']:>9.2f}x"
+                  f"{r['disk_bytes_per_entry']:>12,.0f}{r['append_us']:>11.1f}{r['read_us']:>10.1f}")
+
+    output = args.output or os.path.join(
+        REPO_ROOT, "benchmarks", "results", "history-" + datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    write_results(output, results, meta=vars(args))
+    print(f"\n✓ Results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
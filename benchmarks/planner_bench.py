@@ -0,0 +1,82 @@
+"""
+Planner benchmark: expansions per second and peak memory.
+
+Usage (from the repository root):
+    python -m benchmarks.planner_bench
+    python -m benchmarks.planner_bench --sizes 1000 4000 10000 --algorithms astar
+
+Each search runs twice on the same random grid: once timed, once under
+tracemalloc to measure the search's own peak memory (the grid's cost
+bytearray is reported separately as ``world_bytes``).
+"""
+
+import argparse
+import os
+import time
+import tracemalloc
+from datetime import datetime
+
+from agents.goal_based_agent.planning import ALGORITHMS, GridWorld
+
+from .harness import write_results
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_case(world: GridWorld, algorithm: str) -> dict:
+    start, goal = 0, world.size - 1
+    planner = ALGORITHMS[algorithm]
+
+    plan = planner(world, start, goal)
+
+    tracemalloc.start()
+    planner(world, start, goal)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "name": f"{algorithm}_{world.width}x{world.height}",
+        "algorithm": algorithm,
+        "size": world.width,
+        "found": plan.found,
+        "steps": len(plan),
+        "cost": plan.cost,
+        "expansions": plan.expansions,
+        "elapsed_s": plan.elapsed,
+        "expansions_per_sec": plan.expansions_per_sec,
+        "search_peak_bytes": peak,
+        "world_bytes": len(world.costs),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the goal-based agent planners")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[250, 1000, 2000],
+                        help="grid side lengths (10000 = 10k x 10k)")
+    parser.add_argument("--algorithms", nargs="+", choices=sorted(ALGORITHMS), default=sorted(ALGORITHMS))
+    parser.add_argument("--obstacles", type=float, default=0.2, help="obstacle ratio (default: 0.2)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="JSON results path")
+    args = parser.parse_args(argv)
+
+    results = []
+    print(f"{'case':<24}{'found':>7}{'steps':>9}{'expansions':>12}{'exp/s':>12}{'time s':>9}{'peak MB':>9}")
+    print("-" * 82)
+    for size in args.sizes:
+        t0 = time.perf_counter()
+        world = GridWorld.random(size, size, args.obstacles, seed=args.seed)
+        print(f"(built {size}x{size} grid in {time.perf_counter() - t0:.2f}s)")
+        for algorithm in args.algorithms:
+            r = run_case(world, algorithm)
+            results.append(r)
+            print(f"{r['name']:<24}{str(r['found']):>7}{r['steps']:>9}{r['expansions']:>12}"
+                  f"{r['expansions_per_sec']:>12.0f}{r['elapsed_s']:>9.2f}{r['search_peak_bytes'] / 2 ** 20:>9.1f}")
+
+    output = args.output or os.path.join(
+        REPO_ROOT, "benchmarks", "results", "planner-" + datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    write_results(output, results, meta=vars(args))
+    print(f"\n✓ Results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Follow-up prefetch benchmark: answer latency with and without speculation.
+
+Simulates learning-advisor sessions against the fake Gemini model: create a
+path, "read" it for ``--read-time`` seconds, then ask a few follow-ups. Most
+are paraphrases of the usual questions, some are novel, so the hit rate is
+not 100%. The same sessions run twice:
+
+- ``baseline``  every question is a fresh generation
+- ``prefetch``  ``LearningPathAdvisor(prefetch=True)``
+
+and the table shows answer latency percentiles, hit rate and the number of
+model calls (speculation trades extra calls for latency).
+
+Usage (from the repository root):
+    python -m benchmarks.prefetch_bench
+    python -m benchmarks.prefetch_bench --latency 1.0 --read-time 2 --sessions 5
+"""
+
+import argparse
+import os
+import random
+import time
+from datetime import datetime
+
+from agents.common import get_tracer
+from agents.common.instrumentation import InMemorySink
+
+from .fakes import fake_genai
+from .harness import percentile, quiet, write_results
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# How learners actually phrase the common follow-ups
+PARAPHRASES = (
+    "what resources for phase 1?",
+    "Which books would you recommend for the first phase?",
+    "How long will this take?",
+    "how much time will this take",
+    "What do I need to know before I start?",
+    "Where should I begin?",
+    "Explain the phase one project",
+)
+NOVEL = (
+    "How do I install pandas?",
+    "What is a DataFrame?",
+    "Is there a project for phase 3?",
+    "Should I learn SQL too?",
+)
+
+
+def run_session(prefetch: bool, questions, read_time: float, budget: int):
+    from agents.learning_advisor.agent import LearningPathAdvisor
+
+    advisor = LearningPathAdvisor(prefetch=prefetch, prefetch_budget=budget)
+    path = advisor.create_learning_path("Python for data analysis", goal="Analyze datasets")
+    time.sleep(read_time)
+    latencies = []
+    for question in questions:
+        t0 = time.perf_counter()
+        advisor.answer_question(path["id"], question)
+        latencies.append(time.perf_counter() - t0)
+    stats = advisor.prefetch_stats()
+    if advisor.prefetcher is not None:
+        advisor.prefetcher.close()
+    return latencies, stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark speculative follow-up prefetch")
+    parser.add_argument("--latency", type=float, default=0.5, help="simulated model latency (s)")
+    parser.add_argument("--read-time", type=float, default=2.0, help="seconds spent reading the path")
+    parser.add_argument("--sessions", type=int, default=4)
+    parser.add_argument("--questions", type=int, default=4, help="follow-ups per session")
+    parser.add_argument("--novel-rate", type=float, default=0.2, help="share of questions not prefetched")
+    parser.add_argument("--budget", type=int, default=20, help="speculative answers per session")
+    parser.add_argument("--seed", type=int, default=3)
+    parser.add_argument("--output", help="JSON results path")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    sessions = []
+    for _ in range(args.sessions):
+        common = rng.sample(PARAPHRASES, k=min(args.questions, len(PARAPHRASES)))
+        sessions.append([rng.choice(NOVEL) if rng.random() < args.novel_rate else q for q in common])
+
+    results = []
+    print(f"{'mode':<10}{'p50 s':>8}{'p95 s':>8}{'mean s':>8}{'hit rate':>10}{'calls':>7}{'unused':>8}")
+    print("-" * 59)
+    for mode in ("baseline", "prefetch"):
+        sink = InMemorySink()
+        get_tracer().add_sink(sink)
+        latencies, hits, lookups, unused = [], 0, 0, 0
+        try:
+            with fake_genai(args.latency, response_chars=3000), quiet():
+                for questions in sessions:
+                    times, stats = run_session(mode == "prefetch", questions, args.read_time, args.budget)
+                    latencies.extend(times)
+                    if stats:
+                        hits += stats["hits"]
+                        lookups += stats["hits"] + stats["misses"]
+                        unused += stats["unused"]
+        finally:
+            get_tracer().remove_sink(sink)
+        calls = sum(row["calls"] for row in sink.summary() if row["method"] == "generate_content")
+        results.append({
+            "name": mode,
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "mean": sum(latencies) / len(latencies),
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "model_calls": calls,
+            "unused": unused,
+        })
+        r = results[-1]
+        print(f"{mode:<10}{r['p50']:>8.3f}{r['p95']:>8.3f}{r['mean']:>8.3f}{r['hit_rate']:>9.0%}"
+              f"{calls:>7}{unused:>8}")
+
+    output = args.output or os.path.join(
+        REPO_ROOT, "benchmarks", "results", "prefetch-" + datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    write_results(output, results, meta=vars(args))
+    print(f"\n✓ Results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
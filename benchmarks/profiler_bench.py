@@ -0,0 +1,90 @@
+"""
+Turn profiler benchmark: cost of sampling each turn.
+
+Runs the interactive workloads from ``benchmarks/workloads.py``
+(``chatbot_long_session``, ``calculator_sequence``, ``learning_advisor_qa``)
+against the fake model with zero latency, so turns are pure Python work
+and any sampling cost shows up in full. Each workload is timed with
+profiling off and with ``TurnProfiler`` at each ``--intervals`` setting,
+with every operation wrapped in a turn as the entry points do. Each
+setting runs ``--repeat`` times and the fastest run counts, since the
+differences are small next to scheduling noise.
+
+Usage (from the repository root):
+    python -m benchmarks.profiler_bench
+    python -m benchmarks.profiler_bench --operations 200 --intervals 1,5,10
+"""
+
+import argparse
+import os
+import time
+from datetime import datetime
+
+from agents.common.profiler import TurnProfiler
+
+from .harness import quiet, write_results
+from .workloads import WORKLOADS
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+INTERACTIVE = ("chatbot_long_session", "calculator_sequence", "learning_advisor_qa")
+
+
+def run(workload: str, operations: int, interval_ms: float):
+    """Seconds per operation and the profiler used (None when off)."""
+    profiler = TurnProfiler(interval_ms / 1000) if interval_ms else None
+    with quiet(), WORKLOADS[workload](0.0) as op:
+        op()  # warm up
+        start = time.perf_counter()
+        for _ in range(operations):
+            if profiler is None:
+                op()
+            else:
+                with profiler.turn(workload):
+                    op()
+        elapsed = time.perf_counter() - start
+    if profiler is not None:
+        profiler.close()
+    return elapsed / operations, profiler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the turn profiler's overhead")
+    parser.add_argument("--operations", type=int, default=1000, help="operations per run")
+    parser.add_argument("--intervals", default="1,5,10", help="comma-separated sampling intervals (ms)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per setting (fastest counts)")
+    parser.add_argument("--workloads", default=",".join(INTERACTIVE))
+    parser.add_argument("--output", help="JSON results path")
+    args = parser.parse_args(argv)
+
+    intervals = [float(n) for n in args.intervals.split(",")]
+    results = []
+    print(f"{'workload':<24}{'interval':>10}{'ms/op':>10}{'added µs':>10}{'overhead':>10}{'samples':>9}")
+    print("-" * 73)
+    for workload in args.workloads.split(","):
+        baseline = None
+        for interval in [0.0] + intervals:
+            per_op, profiler = min((run(workload, args.operations, interval) for _ in range(args.repeat)),
+                                   key=lambda result: result[0])
+            baseline = baseline or per_op
+            results.append({
+                "name": f"{workload}_{'off' if not interval else f'{interval:g}ms'}",
+                "interval_ms": interval,
+                "ms_per_op": per_op * 1000,
+                "added_us_per_op": (per_op - baseline) * 1e6,
+                "overhead": per_op / baseline - 1,
+                "samples": profiler.samples if profiler else 0,
+            })
+            r = results[-1]
+            label = "off" if not interval else f"{interval:g} ms"
+            print(f"{workload:<24}{label:>10}{r['ms_per_op']:>10.3f}{r['added_us_per_op']:>10.1f}"
+                  f"{r['overhead']:>9.1%}{r['samples']:>9}")
+
+    output = args.output or os.path.join(
+        REPO_ROOT, "benchmarks", "results", "profiler-" + datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    write_results(output, results, meta=vars(args))
+    print(f"\n✓ Results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
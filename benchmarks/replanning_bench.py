@@ -0,0 +1,126 @@
+"""
+Replanning benchmark: D* Lite repair vs full A* replanning on a dynamic grid.
+
+An agent walks from one corner of a random grid to the other. Every
+``--every`` steps a few cells on the path just ahead become blocked, plus
+some random cells elsewhere change cost. Both strategies see the same
+sequence of changes; the benchmark reports the time spent replanning.
+
+Usage (from the repository root):
+    python -m benchmarks.replanning_bench
+    python -m benchmarks.replanning_bench --size 2000 --every 25
+"""
+
+import argparse
+import os
+import random
+import statistics
+import time
+from datetime import datetime
+
+from agents.goal_based_agent.planning import DStarLite, GridWorld, astar
+
+from .harness import write_results
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_changes(rng: random.Random, world: GridWorld, path, position, goal, random_cells: int):
+    """Block a few cells just ahead on the path and perturb random cells."""
+    changes = {}
+    for cell in list(path)[3:6]:
+        if cell not in (position, goal):
+            changes[cell] = 0
+    for _ in range(random_cells):
+        cell = rng.randrange(world.size)
+        if cell not in (position, goal):
+            changes[cell] = rng.choice((0, 1, 2))
+    return changes
+
+
+def run(size: int, obstacles: float, every: int, random_cells: int, seed: int) -> dict:
+    base = GridWorld.random(size, size, obstacles, seed=seed)
+    goal = base.size - 1
+
+    incremental_world = GridWorld(size, size, bytearray(base.costs))
+    full_world = GridWorld(size, size, bytearray(base.costs))
+
+    t0 = time.perf_counter()
+    planner = DStarLite(incremental_world, 0, goal)
+    plan = planner.plan()
+    initial_incremental = time.perf_counter() - t0
+    initial_full = astar(full_world, 0, goal).elapsed
+    if not plan.found:
+        raise SystemExit("goal unreachable on this grid; try another --seed")
+
+    rng = random.Random(seed)
+    path = list(plan.states)
+    position = 0
+    step = 0
+    repairs, replans, repair_expansions, replan_expansions = [], [], [], []
+
+    while position != goal:
+        position = path[1]
+        path = path[1:]
+        step += 1
+        if step % every or position == goal:
+            continue
+
+        changes = make_changes(rng, base, path, position, goal, random_cells)
+
+        planner.move_to(position)
+        t0 = time.perf_counter()
+        plan = planner.update_costs(changes)
+        repairs.append(time.perf_counter() - t0)
+        repair_expansions.append(planner.last_expansions)
+
+        for cell, cost in changes.items():
+            full_world.set_cost(cell, cost)
+        full = astar(full_world, position, goal)
+        replans.append(full.elapsed)
+        replan_expansions.append(full.expansions)
+
+        if not plan.found:
+            break
+        assert abs(plan.cost - full.cost) < 1e-6, "D* Lite and A* disagree on the path cost"
+        path = list(plan.states)
+
+    return {
+        "name": f"replanning_{size}x{size}",
+        "size": size,
+        "steps": step,
+        "changes": len(repairs),
+        "initial_plan_incremental_s": initial_incremental,
+        "initial_plan_full_s": initial_full,
+        "repair_mean_ms": statistics.mean(repairs) * 1000 if repairs else 0.0,
+        "replan_mean_ms": statistics.mean(replans) * 1000 if replans else 0.0,
+        "repair_total_s": sum(repairs),
+        "replan_total_s": sum(replans),
+        "repair_expansions_mean": statistics.mean(repair_expansions) if repairs else 0,
+        "replan_expansions_mean": statistics.mean(replan_expansions) if replans else 0,
+        "speedup": sum(replans) / sum(repairs) if repairs and sum(repairs) else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare D* Lite repair with full A* replanning")
+    parser.add_argument("--size", type=int, default=500, help="grid side length (default: 500)")
+    parser.add_argument("--obstacles", type=float, default=0.15)
+    parser.add_argument("--every", type=int, default=20, help="steps between world changes")
+    parser.add_argument("--random-cells", type=int, default=50, help="random cells changed per update")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="JSON results path")
+    args = parser.parse_args(argv)
+
+    result = run(args.size, args.obstacles, args.every, args.random_cells, args.seed)
+    for key, value in result.items():
+        print(f"{key:<30}{value:.4f}" if isinstance(value, float) else f"{key:<30}{value}")
+
+    output = args.output or os.path.join(
+        REPO_ROOT, "benchmarks", "results", "replanning-" + datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    write_results(output, [result], meta=vars(args))
+    print(f"\n✓ Results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
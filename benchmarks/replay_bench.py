@@ -0,0 +1,151 @@
+"""
+Search replay benchmark: parsing and aggregation throughput without network.
+
+Replays recorded search responses (``agents/search_agent/archive.py``)
+through ``SimpleSearchAgent(replay=True)`` at several concurrency levels.
+Each operation searches a group of ``--group`` queries and merges them with
+``aggregate``, like ``aggregated_research`` without the politeness delay, so
+the numbers cover archive reads, HTML parsing and aggregation only.
+
+Without ``--archive`` the queries are first recorded from the local
+DuckDuckGo stand-in into a temporary archive. With ``--archive DIR`` every
+search recorded in DIR (e.g. by ``python -m agents search --record DIR``) is
+replayed.
+
+Threads share one archive and its memory maps; ``--processes`` runs each
+worker in its own process (each mapping the same segment files), which
+shows how far parsing scales once the GIL is out of the way.
+
+Usage (from the repository root):
+    python -m benchmarks.replay_bench
+    python -m benchmarks.replay_bench --archive search-archive --concurrency 1,4,8 --processes
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+
+from .fakes import LocalSearchServer
+from .harness import percentile, quiet, write_results
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TOPICS = ("python", "agents", "gemini", "search", "parsing", "benchmark", "archive", "replay",
+          "asyncio", "numpy", "retrieval", "workflow", "caching", "profiling", "chatbot")
+
+_archive = None
+_agents = {}
+
+
+def record_archive(path: str, queries: int, seed: int) -> None:
+    """Record ``queries`` synthetic searches from the local stand-in into ``path``."""
+    from agents.search_agent.agent import SimpleSearchAgent
+
+    rng = random.Random(seed)
+    with LocalSearchServer(num_results=10) as server, quiet():
+        agent = SimpleSearchAgent(server.url, archive=path)
+        for i in range(queries):
+            agent.search(f"{' '.join(rng.sample(TOPICS, 3))} {i}", num_results=10)
+        agent.archive.close()
+
+
+def _init_worker(path: str, silence: bool) -> None:
+    global _archive
+    from agents.search_agent.archive import SearchArchive
+
+    _archive = SearchArchive(path)
+    if silence:
+        # Worker processes: drop the agent's progress output
+        sys.stdout = open(os.devnull, "w")
+
+
+def _replay(group):
+    """Search ``group`` from the archive and aggregate; returns (search s, aggregate s, total s)."""
+    from agents.search_agent.agent import SimpleSearchAgent
+    from agents.search_agent.aggregate import aggregate
+
+    start = time.perf_counter()
+    results = {}
+    for url, query in group:
+        agent = _agents.get(url)
+        if agent is None:
+            agent = _agents[url] = SimpleSearchAgent(url, archive=_archive, replay=True)
+        results[query] = agent.search(query, num_results=10)
+    searched = time.perf_counter()
+    aggregate(results, limit=10)
+    end = time.perf_counter()
+    return searched - start, end - searched, end - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark search replay from a local archive")
+    parser.add_argument("--archive", help="archive directory to replay (default: record a temporary one)")
+    parser.add_argument("--queries", type=int, default=200, help="queries to record without --archive")
+    parser.add_argument("--operations", type=int, default=300, help="aggregated searches per level")
+    parser.add_argument("--group", type=int, default=3, help="queries per aggregated search")
+    parser.add_argument("--concurrency", default="1,2,4,8", help="comma-separated worker counts")
+    parser.add_argument("--processes", action="store_true", help="use worker processes instead of threads")
+    parser.add_argument("--seed", type=int, default=17)
+    parser.add_argument("--output", help="JSON results path")
+    args = parser.parse_args(argv)
+
+    from agents.search_agent.archive import SearchArchive
+
+    with tempfile.TemporaryDirectory(prefix="search-archive-") as scratch:
+        path = args.archive or scratch
+        if not args.archive:
+            record_archive(path, args.queries, args.seed)
+        archive = SearchArchive(path)
+        recorded = [(url, params["q"]) for method, url, params in archive.requests()
+                    if method == "POST" and "q" in params]
+        stats = archive.stats()
+        archive.close()
+        if not recorded:
+            parser.error(f"no recorded searches in {path}")
+        print(f"📦 {stats['records']} records in {stats['segments']} segment(s), "
+              f"{stats['bytes'] / 1024:.0f} KiB compressed\n")
+
+        rng = random.Random(args.seed)
+        groups = [rng.sample(recorded, min(args.group, len(recorded))) for _ in range(args.operations)]
+        executor_class = ProcessPoolExecutor if args.processes else ThreadPoolExecutor
+        kind = "processes" if args.processes else "threads"
+
+        results = []
+        print(f"{'workers':>8}{'ops/s':>10}{'searches/s':>12}{'p50 ms':>9}{'p95 ms':>9}"
+              f"{'search ms':>11}{'aggregate ms':>14}")
+        print("-" * 73)
+        for workers in [int(n) for n in args.concurrency.split(",")]:
+            with executor_class(max_workers=workers, initializer=_init_worker,
+                                initargs=(path, args.processes)) as pool, quiet():
+                list(pool.map(_replay, groups[:workers]))  # warm up: imports and memory maps
+                start = time.perf_counter()
+                timings = list(pool.map(_replay, groups))
+                elapsed = time.perf_counter() - start
+            totals = [t[2] for t in timings]
+            results.append({
+                "name": f"{kind}_{workers}",
+                "workers": workers,
+                "ops_per_s": len(groups) / elapsed,
+                "searches_per_s": len(groups) * args.group / elapsed,
+                "p50_ms": percentile(totals, 50) * 1000,
+                "p95_ms": percentile(totals, 95) * 1000,
+                "search_ms": sum(t[0] for t in timings) / len(timings) * 1000,
+                "aggregate_ms": sum(t[1] for t in timings) / len(timings) * 1000,
+            })
+            r = results[-1]
+            print(f"{workers:>8}{r['ops_per_s']:>10.1f}{r['searches_per_s']:>12.1f}{r['p50_ms']:>9.2f}"
+                  f"{r['p95_ms']:>9.2f}{r['search_ms']:>11.2f}{r['aggregate_ms']:>14.2f}")
+
+    output = args.output or os.path.join(
+        REPO_ROOT, "benchmarks", "results", "replay-" + datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    write_results(output, results, meta=vars(args))
+    print(f"\n✓ Results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
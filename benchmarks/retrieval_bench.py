@@ -0,0 +1,117 @@
+"""
+Retrieval benchmark: indexing throughput and query latency at scale.
+
+Builds a ``PassageIndex`` from synthetic passages (Zipf-distributed words
+over a fixed vocabulary, ~80 words each), then runs random 2-4 word
+queries against it. Query words skip the ``--common`` most frequent words,
+which behave like stopwords in the synthetic text (a real query would be
+"bm25 segment merge", not "the of and"), but keep the Zipf weighting so
+queries still mix frequent and rare terms. The index is created in a
+temporary directory unless ``--index`` is given; reopening it is timed too,
+since everything large is memory-mapped.
+
+Usage (from the repository root):
+    python -m benchmarks.retrieval_bench
+    python -m benchmarks.retrieval_bench --passages 1000000 --queries 200
+"""
+
+import argparse
+import bisect
+import itertools
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+from agents.research_agent.retrieval import PassageIndex
+
+from .harness import percentile, write_results
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class ZipfWords:
+    """Sample words from a synthetic vocabulary with a Zipf distribution."""
+
+    def __init__(self, vocabulary: int, seed: int, s: float = 1.07):
+        self.rng = random.Random(seed)
+        self.words = [f"w{i:x}" for i in range(vocabulary)]
+        self.cumulative = list(itertools.accumulate(1 / (rank ** s) for rank in range(1, vocabulary + 1)))
+
+    def sample(self, n: int, skip: int = 0):
+        low = self.cumulative[skip - 1] if skip else 0.0
+        span = self.cumulative[-1] - low
+        return [self.words[bisect.bisect_left(self.cumulative, low + self.rng.random() * span)]
+                for _ in range(n)]
+
+
+def passages(count: int, words: ZipfWords, length: int):
+    for i in range(count):
+        yield f"synthetic/{i // 100}.md", f"doc {i // 100}", " ".join(words.sample(length))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the local retrieval index")
+    parser.add_argument("--passages", type=int, default=100000, help="passages to index (try 1000000)")
+    parser.add_argument("--words", type=int, default=80, help="words per passage")
+    parser.add_argument("--vocabulary", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--common", type=int, default=50, help="most frequent words left out of queries")
+    parser.add_argument("--index", help="index directory to keep (default: temporary)")
+    parser.add_argument("--seed", type=int, default=5)
+    parser.add_argument("--output", help="JSON results path")
+    args = parser.parse_args(argv)
+
+    path = args.index or tempfile.mkdtemp(prefix="retrieval-bench-")
+    words = ZipfWords(args.vocabulary, args.seed)
+    try:
+        index = PassageIndex(path)
+        stats = index.add_texts(passages(args.passages, words, args.words))
+        index.close()
+        disk = sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+
+        t0 = time.perf_counter()
+        index = PassageIndex(path)
+        open_s = time.perf_counter() - t0
+
+        queries = [" ".join(words.sample(random.Random(i).randint(2, 4), skip=args.common))
+                   for i in range(args.queries)]
+        latencies = []
+        for query in queries:
+            t0 = time.perf_counter()
+            index.search(query, args.k)
+            latencies.append(time.perf_counter() - t0)
+        index.close()
+    finally:
+        if not args.index:
+            shutil.rmtree(path, ignore_errors=True)
+
+    result = {
+        "name": f"retrieval_{args.passages}",
+        "passages": args.passages,
+        "tokens": stats.tokens,
+        "index_s": stats.elapsed,
+        "passages_per_sec": stats.passages_per_sec,
+        "tokens_per_sec": stats.tokens / stats.elapsed,
+        "disk_bytes": disk,
+        "open_ms": open_s * 1000,
+        "query_p50_ms": percentile(latencies, 50) * 1000,
+        "query_p95_ms": percentile(latencies, 95) * 1000,
+        "query_mean_ms": statistics.mean(latencies) * 1000,
+    }
+    for key, value in result.items():
+        shown = f"{value:,.2f}" if isinstance(value, float) else f"{value:,}" if isinstance(value, int) else value
+        print(f"{key:<22}{shown}")
+
+    output = args.output or os.path.join(
+        REPO_ROOT, "benchmarks", "results", "retrieval-" + datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    write_results(output, [result], meta=vars(args))
+    print(f"\n✓ Results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Code review benchmark: local static pre-analysis vs sending whole files.
+
+Runs ``CodeAgent.review_code`` on every Python file under ``--path`` twice,
+with and without the local pre-analysis, against the fake model. The fake
+charges ``--latency`` seconds per call plus ``--prompt-latency`` seconds per
+1k prompt tokens, so shorter prompts answer faster as they do with the
+real API. Reports prompt size, local analysis time and end-to-end latency.
+
+Usage (from the repository root):
+    python -m benchmarks.review_bench
+    python -m benchmarks.review_bench --path agents/common --latency 0.5 --prompt-latency 0.2
+"""
+
+import argparse
+import os
+import statistics
+from datetime import datetime
+
+from .fakes import fake_genai
+from .harness import write_results
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark local pre-analysis for code review")
+    parser.add_argument("--path", default=os.path.join(REPO_ROOT, "agents"), help="directory to review")
+    parser.add_argument("--latency", type=float, default=0.2, help="fake model seconds per call")
+    parser.add_argument("--prompt-latency", type=float, default=0.1,
+                        help="fake model seconds per 1k prompt tokens")
+    parser.add_argument("--output", help="JSON results path")
+    args = parser.parse_args(argv)
+
+    from agents.code_agent.agent import CodeAgent
+    from agents.code_agent.repo_review import iter_files
+
+    files = list(iter_files(args.path))
+    results = []
+    with fake_genai(latency=args.latency, prompt_latency=args.prompt_latency):
+        agent = CodeAgent()
+        for pre_analysis in (False, True):
+            stats = []
+            for path in files:
+                with open(path, encoding="utf-8") as f:
+                    agent.review_code(f.read(), pre_analysis=pre_analysis)
+                stats.append(agent.last_review_stats)
+            results.append({
+                "name": "review_pre_analysis" if pre_analysis else "review_full_file",
+                "files": len(files),
+                "prompt_chars_total": sum(s["prompt_chars"] for s in stats),
+                "prompt_chars_mean": statistics.mean(s["prompt_chars"] for s in stats),
+                "local_findings": sum(s["local_findings"] for s in stats),
+                "analysis_ms_mean": statistics.mean(s["analysis_ms"] for s in stats),
+                "latency_ms_mean": statistics.mean(s["total_ms"] for s in stats),
+                "latency_ms_total": sum(s["total_ms"] for s in stats),
+            })
+
+    full, local = results
+    print(f"{'mode':<22}{'prompt chars':>14}{'findings':>10}{'analysis ms':>13}{'latency ms':>12}")
+    print("-" * 71)
+    for r in results:
+        print(f"{r['name']:<22}{r['prompt_chars_total']:>14,}{r['local_findings']:>10}"
+              f"{r['analysis_ms_mean']:>13.1f}{r['latency_ms_mean']:>12.0f}")
+    print(f"\nPrompt size: {1 - local['prompt_chars_total'] / full['prompt_chars_total']:.0%} smaller, "
+          f"end-to-end latency: {1 - local['latency_ms_total'] / full['latency_ms_total']:.0%} lower "
+          f"over {len(files)} files")
+
+    output = args.output or os.path.join(
+        REPO_ROOT, "benchmarks", "results", "review-" + datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    write_results(output, results, meta=vars(args))
+    print(f"\n✓ Results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
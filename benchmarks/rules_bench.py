@@ -0,0 +1,146 @@
+"""
+Rule engine benchmark: rules per second from 10 to 100k rules.
+
+Generates random rules over a set of sensor fields (1-3 conditions each,
+thresholds drawn from a small grid so conditions are shared between rules)
+and a stream of sensor readings where only a few fields change per tick.
+The compiled ``RuleSession`` is compared with evaluating every rule
+linearly on each tick, like the original ``if/elif`` chain.
+
+"rules/s" is rules decided per second: rule count x ticks per second.
+
+Usage (from the repository root):
+    python -m benchmarks.rules_bench
+    python -m benchmarks.rules_bench --rules 1000 100000 --ticks 2000
+"""
+
+import argparse
+import operator
+import os
+import random
+import time
+from datetime import datetime
+
+from agents.rule_based_agent.rules import RuleSet
+
+from .harness import write_results
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+OPS = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le,
+       "==": operator.eq, "!=": operator.ne}
+
+
+def make_rules(count: int, fields: int, rng: random.Random):
+    rules = []
+    for i in range(count):
+        when = {}
+        for _ in range(rng.randint(1, 3)):
+            op = rng.choice(("<", "<=", ">", ">=", ">", "<", "=="))
+            when.setdefault(f"sensor_{rng.randrange(fields)}", {})[op] = rng.randrange(0, 100, 5)
+        rules.append({"name": f"rule_{i}", "when": when, "then": f"action_{i % 50}",
+                      "priority": rng.randrange(5)})
+    return rules
+
+
+def make_ticks(count: int, fields: int, changed: int, rng: random.Random):
+    state = {f"sensor_{i}": rng.randrange(100) for i in range(fields)}
+    ticks = []
+    for _ in range(count):
+        state = dict(state)
+        for _ in range(changed):
+            name = f"sensor_{rng.randrange(fields)}"
+            state[name] = min(99, max(0, state[name] + rng.randint(-3, 3)))
+        ticks.append(state)
+    return ticks
+
+
+def linear_decide(rules, state, default="do_nothing"):
+    """Evaluate every rule on every tick (the baseline)."""
+    best = None
+    for index, rule in enumerate(rules):
+        for field, tests in rule["when"].items():
+            value = state[field]
+            if not all(OPS[op](value, threshold) for op, threshold in tests.items()):
+                break
+        else:
+            rank = (-rule["priority"], index)
+            if best is None or rank < best[0]:
+                best = (rank, rule["then"])
+    return best[1] if best else default
+
+
+def run(count: int, fields: int, ticks: int, changed: int, linear_limit: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    rules = make_rules(count, fields, rng)
+    stream = make_ticks(ticks, fields, changed, rng)
+
+    t0 = time.perf_counter()
+    ruleset = RuleSet(rules, default="do_nothing")
+    compile_s = time.perf_counter() - t0
+
+    session = ruleset.session()
+    session.decide(stream[0])
+    flipped_before = session.conditions_flipped
+    t0 = time.perf_counter()
+    decisions = [session.decide(state) for state in stream]
+    elapsed = time.perf_counter() - t0
+
+    result = {
+        "name": f"rules_{count}",
+        "rules": count,
+        "conditions": len(ruleset.conditions),
+        "condition_refs": sum(len(r["when"]) for r in rules),
+        "compile_s": compile_s,
+        "ticks": ticks,
+        "ticks_per_sec": ticks / elapsed,
+        "rules_per_sec": count * ticks / elapsed,
+        "flips_per_tick": (session.conditions_flipped - flipped_before) / ticks,
+        "linear_ticks_per_sec": None,
+        "speedup": None,
+    }
+
+    if count <= linear_limit:
+        # Fewer ticks for the baseline at large sizes; the rate is what matters
+        sample = stream[:max(50, min(ticks, 2_000_000 // count))]
+        t0 = time.perf_counter()
+        expected = [linear_decide(rules, state) for state in sample]
+        linear_elapsed = time.perf_counter() - t0
+        if expected != decisions[:len(sample)]:
+            raise AssertionError("compiled engine and linear evaluation disagree")
+        result["linear_ticks_per_sec"] = len(sample) / linear_elapsed
+        result["speedup"] = result["ticks_per_sec"] / result["linear_ticks_per_sec"]
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the compiled rule engine")
+    parser.add_argument("--rules", type=int, nargs="+", default=[10, 100, 1000, 10000, 100000])
+    parser.add_argument("--fields", type=int, default=50, help="number of sensor fields")
+    parser.add_argument("--ticks", type=int, default=5000)
+    parser.add_argument("--changed", type=int, default=3, help="fields changed per tick")
+    parser.add_argument("--linear-limit", type=int, default=100000,
+                        help="largest rule count also run through the linear baseline")
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--output", help="JSON results path")
+    args = parser.parse_args(argv)
+
+    results = []
+    print(f"{'rules':>8}{'conds':>9}{'compile s':>11}{'ticks/s':>12}{'rules/s':>14}"
+          f"{'flips/tick':>12}{'linear t/s':>12}{'speedup':>9}")
+    print("-" * 87)
+    for count in args.rules:
+        r = run(count, args.fields, args.ticks, args.changed, args.linear_limit, args.seed)
+        results.append(r)
+        linear = f"{r['linear_ticks_per_sec']:>12.0f}{r['speedup']:>8.1f}x" if r["speedup"] else f"{'-':>12}{'-':>9}"
+        print(f"{r['rules']:>8}{r['conditions']:>9}{r['compile_s']:>11.3f}{r['ticks_per_sec']:>12.0f}"
+              f"{r['rules_per_sec']:>14.3g}{r['flips_per_tick']:>12.1f}{linear}")
+
+    output = args.output or os.path.join(
+        REPO_ROOT, "benchmarks", "results", "rules-" + datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    write_results(output, results, meta=vars(args))
+    print(f"\n✓ Results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+End-to-end agent benchmarks.
+
+Usage (from the repository root):
+    python -m benchmarks.run
+    python -m benchmarks.run --only calculator_sequence chatbot_long_session
+    python -m benchmarks.run --latency 0.05 --output benchmarks/results/slow-model.json
+
+Each workload runs in its own subprocess so peak RSS is reported per workload.
+Results are written as JSON; compare two runs with ``python -m benchmarks.compare``.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime
+
+from .harness import format_table, measure, write_results
+from .workloads import WORKLOADS
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_one(name: str, iterations: int, warmup: int, latency: float) -> dict:
+    """Run a single workload in this process."""
+    with WORKLOADS[name](latency) as op:
+        return measure(name, op, iterations=iterations, warmup=warmup,
+                       alloc_iterations=min(iterations, 50))
+
+
+def run_isolated(name: str, args) -> dict:
+    """Run a single workload in a fresh interpreter and return its result."""
+    cmd = [
+        sys.executable, "-m", "benchmarks.run", "--in-process", name,
+        "--iterations", str(args.iterations),
+        "--warmup", str(args.warmup),
+        "--latency", str(args.latency),
+    ]
+    proc = subprocess.run(cmd, cwd=REPO_ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"workload {name} failed:\n{proc.stderr}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the agent benchmark suite")
+    parser.add_argument("--only", nargs="+", choices=sorted(WORKLOADS), help="workloads to run")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="simulated model latency in seconds (default: 0)")
+    parser.add_argument("--output", help="JSON results path (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--in-process", metavar="WORKLOAD", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.in_process:
+        result = run_one(args.in_process, args.iterations, args.warmup, args.latency)
+        print(json.dumps(result))
+        return
+
+    results = []
+    for name in args.only or sorted(WORKLOADS):
+        print(f"⏱️  {name} ...", flush=True)
+        results.append(run_isolated(name, args))
+
+    output = args.output or os.path.join(
+        REPO_ROOT, "benchmarks", "results", datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    write_results(output, results, meta={
+        "iterations": args.iterations, "warmup": args.warmup, "latency": args.latency})
+
+    print("\n" + format_table(results))
+    print(f"\n✓ Results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
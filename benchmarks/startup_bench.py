@@ -0,0 +1,115 @@
+"""
+Startup benchmark: import cost of each agent module.
+
+Every agent listed in ``agents.cli.AGENTS`` is imported in a fresh
+interpreter under ``python -X importtime``. The report shows the agent
+module's cumulative import time, the total time spent importing, the number
+of modules loaded and which heavy third-party packages got pulled in. It
+also checks that importing prints nothing (agent modules must be free of
+side effects) and times ``python -m agents`` listing the agents.
+
+Usage (from the repository root):
+    python -m benchmarks.startup_bench
+    python -m benchmarks.startup_bench --agents rule search --repeat 5
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+from agents.cli import AGENTS
+
+from .harness import write_results
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Third-party packages worth calling out when an agent imports them
+HEAVY_PACKAGES = ("google.generativeai", "grpc", "bs4", "requests", "numpy", "dotenv")
+
+_IMPORTTIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s+)(\S+)$")
+
+
+def parse_importtime(stderr: str) -> dict:
+    """Summarize ``-X importtime`` output: {module: (self_us, cumulative_us)}."""
+    modules = {}
+    for line in stderr.splitlines():
+        match = _IMPORTTIME.match(line)
+        if match:
+            modules[match.group(4)] = (int(match.group(1)), int(match.group(2)))
+    return modules
+
+
+def measure_import(module: str, env: dict) -> dict:
+    t0 = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          capture_output=True, text=True, cwd=REPO_ROOT, env=env)
+    wall = time.perf_counter() - t0
+    if proc.returncode:
+        raise RuntimeError(f"importing {module} failed:\n{proc.stderr[-2000:]}")
+    modules = parse_importtime(proc.stderr)
+    return {
+        "wall_s": wall,
+        "module_us": modules.get(module, (0, 0))[1],
+        "total_us": sum(self_us for self_us, _ in modules.values()),
+        "modules": len(modules),
+        "heavy": [name for name in HEAVY_PACKAGES if name in modules],
+        "stdout_bytes": len(proc.stdout),
+    }
+
+
+def measure_command(args, env: dict) -> float:
+    t0 = time.perf_counter()
+    subprocess.run([sys.executable] + args, capture_output=True, cwd=REPO_ROOT, env=env, check=True)
+    return time.perf_counter() - t0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark agent import/startup time")
+    parser.add_argument("--agents", nargs="+", choices=sorted(AGENTS), default=list(AGENTS))
+    parser.add_argument("--repeat", type=int, default=3, help="runs per agent; the median is reported")
+    parser.add_argument("--output", help="JSON results path")
+    args = parser.parse_args(argv)
+
+    env = dict(os.environ, PYTHONWARNINGS="ignore", PYTHONDONTWRITEBYTECODE="1")
+    # Warm the bytecode cache and OS page cache so runs are comparable
+    measure_command(["-c", "pass"], env)
+
+    results = []
+    print(f"{'agent':<18}{'module ms':>11}{'total ms':>10}{'wall ms':>9}{'modules':>9}  heavy packages")
+    print("-" * 90)
+    for name in ["python"] + args.agents:
+        module = "sys" if name == "python" else AGENTS[name][0]
+        runs = [measure_import(module, env) for _ in range(args.repeat)]
+        r = {
+            "name": f"startup_{name}",
+            "agent": name,
+            "module": module,
+            "module_ms": statistics.median(run["module_us"] for run in runs) / 1000,
+            "total_import_ms": statistics.median(run["total_us"] for run in runs) / 1000,
+            "wall_ms": statistics.median(run["wall_s"] for run in runs) * 1000,
+            "modules": runs[0]["modules"],
+            "heavy": runs[0]["heavy"],
+            "import_output_bytes": runs[0]["stdout_bytes"],
+        }
+        results.append(r)
+        warning = "  ⚠️ prints on import" if r["import_output_bytes"] else ""
+        print(f"{name:<18}{r['module_ms']:>11.1f}{r['total_import_ms']:>10.1f}{r['wall_ms']:>9.1f}"
+              f"{r['modules']:>9}  {', '.join(r['heavy']) or '-'}{warning}")
+
+    listing = statistics.median(measure_command(["-m", "agents"], env) for _ in range(args.repeat))
+    results.append({"name": "startup_cli_list", "wall_ms": listing * 1000})
+    print(f"\n'python -m agents' (list): {listing * 1000:.1f} ms")
+
+    output = args.output or os.path.join(
+        REPO_ROOT, "benchmarks", "results", "startup-" + datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    write_results(output, results, meta=vars(args))
+    print(f"\n✓ Results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Workflow benchmark: DAG scheduling and memoization for the article workflow.
+
+Runs search → (research ∥ code) → writer → editor against the fake model and
+the local search server:
+
+- ``sequential``   one worker, nodes run one after another
+- ``parallel``     ``--workers`` workers, research and code run together
+- ``rerun_same``   same inputs again, every node served from the memo cache
+- ``rerun_style``  only the style changes, so only writer and editor run
+
+Usage (from the repository root):
+    python -m benchmarks.workflow_bench
+    python -m benchmarks.workflow_bench --latency 0.5 --workers 2
+"""
+
+import argparse
+import os
+from datetime import datetime
+
+from .fakes import LocalSearchServer, fake_genai
+from .harness import quiet, write_results
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the DAG workflow orchestrator")
+    parser.add_argument("--latency", type=float, default=0.3, help="fake model seconds per call")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--topic", default="Vector databases")
+    parser.add_argument("--output", help="JSON results path")
+    args = parser.parse_args(argv)
+
+    from agents.orchestrator.agent import build_article_workflow
+    from agents.orchestrator.dag import MemoCache
+
+    inputs = {"topic": args.topic, "style": "professional", "language": "python"}
+    shared = MemoCache()
+    # The parallel run fills the shared cache that the reruns read from
+    scenarios = [
+        ("sequential", MemoCache(), 1, inputs),
+        ("parallel", shared, args.workers, inputs),
+        ("rerun_same", shared, args.workers, inputs),
+        ("rerun_style", shared, args.workers, dict(inputs, style="casual")),
+    ]
+
+    results = []
+    with fake_genai(latency=args.latency), LocalSearchServer() as server:
+        for name, cache, workers, run_inputs in scenarios:
+            flow = build_article_workflow(cache, search_url=server.url)
+            with quiet():
+                result = flow.run(run_inputs, max_workers=workers)
+            results.append({
+                "name": name,
+                "workers": workers,
+                "wall_s": result.elapsed,
+                "node_s": sum(r.duration for r in result.trace if r.status == "ran"),
+                "ran": result.ran,
+                "cached": result.cached,
+                "nodes": {r.name: {"status": r.status, "start_s": r.start, "duration_s": r.duration}
+                          for r in result.trace},
+            })
+
+    baseline = results[0]["wall_s"]
+    print(f"{'scenario':<14}{'workers':>8}{'wall s':>9}{'node s':>9}{'ran':>5}{'cached':>8}{'speedup':>9}")
+    print("-" * 62)
+    for r in results:
+        print(f"{r['name']:<14}{r['workers']:>8}{r['wall_s']:>9.2f}{r['node_s']:>9.2f}"
+              f"{len(r['ran']):>5}{len(r['cached']):>8}{baseline / max(r['wall_s'], 1e-9):>8.1f}x")
+
+    output = args.output or os.path.join(
+        REPO_ROOT, "benchmarks", "results", "workflow-" + datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    write_results(output, results, meta=vars(args))
+    print(f"\n✓ Results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
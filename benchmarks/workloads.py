@@ -0,0 +1,115 @@
+"""
+Realistic workloads for each agent, driven against local stand-ins.
+
+Each workload is a context manager that sets up the agent and yields a
+zero-argument callable performing one operation.
+"""
+
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator
+
+from .fakes import LocalSearchServer, fake_genai
+
+API_KEY = "benchmark-key"
+
+SEARCH_QUERIES = ["AI agents 2025", "LangChain tutorial", "How to build chatbots"]
+
+CALCULATIONS = [
+    "25 + 37 * 2",
+    "What is the square root of 144?",
+    "Calculate 15% of 250",
+    "If I have 5 apples and buy 3 more, how many do I have?",
+    "Solve: 2x + 5 = 15",
+    "What is sin(30 degrees)?",
+    "Convert 100 Fahrenheit to Celsius",
+]
+
+CONTENT_TOPICS = [
+    "The future of renewable energy",
+    "Getting started with Python",
+    "Why sleep matters",
+    "A beginner's guide to AI agents",
+]
+
+LEARNING_QUESTIONS = [
+    "What resources do you recommend for phase 1?",
+    "How long will this take?",
+    "What are the key concepts in phase 2?",
+    "Can you explain more about the milestone project?",
+]
+
+
+@contextmanager
+def search_multi_query(latency: float) -> Iterator[Callable]:
+    from agents.search_agent.agent import SimpleSearchAgent
+
+    with LocalSearchServer(num_results=10) as server:
+        agent = SimpleSearchAgent(search_url=server.url)
+        yield lambda: agent.multi_query_research(SEARCH_QUERIES, delay=0)
+
+
+@contextmanager
+def calculator_sequence(latency: float) -> Iterator[Callable]:
+    from agents.calculator.calculator import CalculatorAgent
+
+    with fake_genai(latency, response_chars=300):
+        calculator = CalculatorAgent(api_key=API_KEY)
+
+        def op():
+            # Start each sequence from a fresh session so history stays bounded
+            calculator.clear_history()
+            for expression in CALCULATIONS:
+                calculator.calculate(expression)
+
+        yield op
+
+
+@contextmanager
+def content_team_batch(latency: float) -> Iterator[Callable]:
+    from agents.content_team.agent import ContentCreationTeam
+
+    with fake_genai(latency, response_chars=4000):
+        team = ContentCreationTeam()
+        yield lambda: [team.create_content(topic) for topic in CONTENT_TOPICS]
+
+
+@contextmanager
+def chatbot_long_session(latency: float) -> Iterator[Callable]:
+    from agents.gemini_chatbot.chatbot import GeminiChatbot
+
+    with fake_genai(latency, response_chars=600):
+        chatbot = GeminiChatbot(api_key=API_KEY)
+        chatbot.start_conversation()
+        turn = [0]
+
+        def op():
+            # One turn of a single, ever-growing session
+            turn[0] += 1
+            chatbot.send_message(f"Tell me one more thing about topic number {turn[0]}.")
+
+        yield op
+
+
+@contextmanager
+def learning_advisor_qa(latency: float) -> Iterator[Callable]:
+    from agents.learning_advisor.agent import LearningPathAdvisor
+
+    with fake_genai(latency, response_chars=3000):
+        advisor = LearningPathAdvisor()
+        path = advisor.create_learning_path("Python for data analysis", goal="Analyze datasets")
+        turn = [0]
+
+        def op():
+            turn[0] += 1
+            advisor.answer_question(path["id"], LEARNING_QUESTIONS[turn[0] % len(LEARNING_QUESTIONS)])
+
+        yield op
+
+
+WORKLOADS: Dict[str, Callable] = {
+    "search_multi_query": search_multi_query,
+    "calculator_sequence": calculator_sequence,
+    "content_team_batch": content_team_batch,
+    "chatbot_long_session": chatbot_long_session,
+    "learning_advisor_qa": learning_advisor_qa,
+}
@@ -0,0 +1,58 @@
+"""Tests for single-file review in ``agents/code_agent/agent.py``."""
+
+import json
+
+import pytest
+
+pytest.importorskip("google.generativeai")
+
+from agents.code_agent.agent import REVIEW_SCHEMA, CodeAgent  # noqa: E402
+from agents.common.structured import StructuredOutput  # noqa: E402
+
+JS = """function add(a, b) {
+  return a + b;
+}
+"""
+
+
+class RecordingModel:
+    agent = "CodeAgent"
+
+    def __init__(self):
+        self.prompts = []
+
+    def generate_content(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        text = json.dumps({"summary": "Fine.", "findings": []})
+        return type("Response", (), {"text": text, "usage_metadata": None})()
+
+
+def make_agent():
+    agent = CodeAgent.__new__(CodeAgent)
+    agent.last_review_stats = {}
+    agent.model = RecordingModel()
+    agent.review_output = StructuredOutput(agent.model, REVIEW_SCHEMA, "CodeAgent", "review_code")
+    return agent
+
+
+def test_non_python_code_is_sent_whole_without_local_analysis():
+    agent = make_agent()
+    agent.review_code(JS, language="javascript")
+    prompt = agent.model.prompts[0]
+    assert "syntax error" not in prompt and "Python" not in prompt
+    assert JS in prompt
+    assert agent.last_review_stats["local_findings"] == 0
+    assert agent.last_review_stats["reduction"] == 0
+
+
+def test_python_code_is_still_analyzed():
+    agent = make_agent()
+    agent.review_code("def broken(:\n    pass\n")
+    assert agent.model.prompts[0].startswith("Local analysis found a syntax error at line 1")
+
+
+def test_review_code_returns_text_and_structured_returns_findings():
+    agent = make_agent()
+    assert agent.review_code("x = 1\n") == "Fine."
+    review = agent.review_code_structured("x = 1\n")
+    assert review["summary"] == "Fine." and review["findings"] == [] and review["content"] == "Fine."
@@ -0,0 +1,46 @@
+"""Regression tests for incremental replanning in ``agents/goal_based_agent/planning/dstar_lite.py``."""
+
+import random
+
+import pytest
+
+from agents.goal_based_agent.planning import DStarLite, GridWorld, astar
+
+
+def weighted_grid(size, seed):
+    world = GridWorld.random(size, size, 0.25, seed=seed, diagonal=True)
+    rng = random.Random(seed)
+    for cell in range(world.size):
+        if world.costs[cell]:
+            world.costs[cell] = rng.randint(1, 4)
+    return world, rng
+
+
+# Seeds where float near-ties in the keys used to stop repair too early
+@pytest.mark.parametrize("size,seed", [(30, 0), (30, 15), (30, 16), (30, 23), (25, 100), (25, 129)])
+def test_repaired_plans_match_astar(size, seed):
+    world, rng = weighted_grid(size, seed)
+    goal = world.size - 1
+    planner = DStarLite(world, 0, goal)
+    plan = planner.plan()
+    for _ in range(25):
+        if len(plan.states) < 3:
+            break
+        position = plan.states[1]
+        planner.move_to(position)
+        ahead = list(plan.states[2:-1])
+        plan = planner.update_costs({cell: rng.randint(0, 4) for cell in rng.sample(ahead, min(3, len(ahead)))})
+        reference = astar(world, position, goal)
+        assert plan.found == reference.found
+        if not plan.found:
+            break
+        assert plan.states[0] == position and plan.states[-1] == goal
+        assert plan.cost == pytest.approx(reference.cost)
+
+
+def test_blocked_goal_is_not_found():
+    world = GridWorld(5, 5)
+    planner = DStarLite(world, 0, 24)
+    assert planner.plan().found
+    plan = planner.update_costs({19: 0, 23: 0, 18: 0})
+    assert not plan.found and plan.cost == float("inf")
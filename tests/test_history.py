@@ -0,0 +1,52 @@
+"""Tests for spilling in ``agents/common/history.py``."""
+
+import gc
+import os
+
+from agents.common.history import HistoryStore
+
+COLUMNS = [("user", "text"), ("data", "json"), ("status", "enum")]
+
+
+def fill(store, n=50):
+    for i in range(n):
+        store.append(user=f"message {i} " * 20, data={"i": i}, status="ok")
+
+
+def test_spilled_entries_round_trip():
+    store = HistoryStore(COLUMNS, compress_after=5, memory_limit=2000)
+    fill(store)
+    assert store.stats()["spilled"] > 0
+    assert [entry["data"]["i"] for entry in store] == list(range(50))
+    assert store[0]["user"] == "message 0 " * 20
+    assert [entry["data"]["i"] for entry in store[3:8]] == [3, 4, 5, 6, 7]
+    store.close()
+
+
+def test_spilled_stores_hold_no_open_files():
+    before = len(os.listdir("/proc/self/fd")) if os.path.isdir("/proc/self/fd") else None
+    stores = [HistoryStore(COLUMNS, memory_limit=500) for _ in range(50)]
+    for store in stores:
+        fill(store, 10)
+    assert all(store.stats()["spilled"] for store in stores)
+    if before is not None:
+        assert len(os.listdir("/proc/self/fd")) <= before
+    for store in stores:
+        store.close()
+
+
+def test_spill_file_removed_on_close_and_collection(tmp_path):
+    path = str(tmp_path / "history.spill")
+    store = HistoryStore(COLUMNS, memory_limit=500, spill_path=path)
+    fill(store, 10)
+    assert os.path.exists(path)
+    store.close()
+    assert not os.path.exists(path) and len(store) == 0
+
+    store = HistoryStore(COLUMNS, memory_limit=500)
+    fill(store, 10)
+    name = store._spill_name
+    assert os.path.exists(name)
+    del store
+    gc.collect()
+    assert not os.path.exists(name)
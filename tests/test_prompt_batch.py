@@ -0,0 +1,46 @@
+"""Tests for the batch prompt runner in ``agents/gemini/prompt.py``."""
+
+import io
+import json
+
+import pytest
+
+from agents.gemini.prompt import BatchRunner, load_checkpoint, read_prompts
+
+
+class EchoModel:
+    def generate_content(self, prompt):
+        return type("Response", (), {"text": prompt.upper(), "usage_metadata": None})()
+
+
+def results(output):
+    return [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+def test_invalid_lines_are_reported_and_skipped():
+    source = io.StringIO('{"id": "a", "prompt": "one"}\n{"id": "b", "text": "oops"}\n{"id": "c", "prompt": "two"}\n')
+    invalid = []
+    output = io.StringIO()
+    progress = BatchRunner(EchoModel(), concurrency=2).run(
+        read_prompts(source, on_invalid=lambda number, reason: invalid.append(number)), output)
+    assert invalid == [2]
+    assert sorted(r["id"] for r in results(output)) == ["a", "c"]
+    assert progress.done == 2
+
+
+def test_invalid_line_raises_without_a_handler():
+    with pytest.raises(ValueError):
+        list(read_prompts(io.StringIO('{"id": "b", "text": "oops"}\n')))
+
+
+def test_finished_results_are_written_when_reading_fails(tmp_path):
+    def prompts():
+        yield "a", "one"
+        yield "b", "two"
+        raise UnicodeDecodeError("utf-8", b"\xff", 0, 1, "invalid start byte")
+
+    path = tmp_path / "results.jsonl"
+    with open(path, "a", encoding="utf-8") as output:
+        with pytest.raises(UnicodeDecodeError):
+            BatchRunner(EchoModel(), concurrency=4).run(prompts(), output)
+    assert load_checkpoint(str(path)) == {"a", "b"}
@@ -0,0 +1,75 @@
+"""Tests for the circuit breaker and retry loop in ``agents/common/resilience.py``."""
+
+import pytest
+
+from agents.common.resilience import CircuitBreaker, CircuitOpenError, Resilience, RetryPolicy
+
+
+class FakeAPIError(Exception):
+    def __init__(self, code):
+        super().__init__(f"HTTP {code}")
+        self.code = code
+
+
+def make_resilience():
+    # Opens on the first failure and allows a trial call straight away
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.0)
+    return Resilience(breaker=breaker, policy=RetryPolicy(max_attempts=1), deadline=None), breaker
+
+
+def fail(code):
+    def attempt(timeout):
+        raise FakeAPIError(code)
+    return attempt
+
+
+def test_client_error_during_half_open_closes_circuit():
+    resilience, breaker = make_resilience()
+    with pytest.raises(FakeAPIError):
+        resilience.call(fail(503))
+    assert breaker.state == CircuitBreaker.OPEN
+
+    # The half-open trial gets a 400: upstream answered, so it is up
+    with pytest.raises(FakeAPIError):
+        resilience.call(fail(400))
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    for _ in range(3):
+        assert resilience.call(lambda timeout: "ok") == "ok"
+
+
+def test_non_http_error_during_half_open_reopens_circuit():
+    resilience, breaker = make_resilience()
+    with pytest.raises(FakeAPIError):
+        resilience.call(fail(503))
+
+    def broken(timeout):
+        raise ValueError("bad response")
+
+    with pytest.raises(ValueError):
+        resilience.call(broken)
+    assert breaker.state == CircuitBreaker.OPEN
+    # The trial was released, so the next call after the reset timeout is let through
+    assert resilience.call(lambda timeout: "ok") == "ok"
+
+
+def test_interrupted_trial_is_released():
+    resilience, breaker = make_resilience()
+    with pytest.raises(FakeAPIError):
+        resilience.call(fail(503))
+
+    def interrupted(timeout):
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        resilience.call(interrupted)
+    assert resilience.call(lambda timeout: "ok") == "ok"
+
+
+def test_open_circuit_fails_fast():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=60.0)
+    resilience = Resilience(breaker=breaker, policy=RetryPolicy(max_attempts=1), deadline=None)
+    with pytest.raises(FakeAPIError):
+        resilience.call(fail(503))
+    with pytest.raises(CircuitOpenError):
+        resilience.call(lambda timeout: "ok")
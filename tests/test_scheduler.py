@@ -0,0 +1,68 @@
+"""Tests for queue timeouts in ``agents/common/scheduler.py`` and the model wrapper."""
+
+import threading
+import time
+
+import pytest
+
+from agents.common import scheduler as scheduler_module
+from agents.common.model import ModelProxy
+from agents.common.resilience import CircuitBreaker, QueueTimeoutError, Resilience
+from agents.common.scheduler import RequestScheduler
+
+
+def test_acquire_times_out_and_leaves_the_queue():
+    scheduler = RequestScheduler(rpm=60)  # one request per second, burst of 60
+    scheduler.rpm.tokens = 0
+    started = time.monotonic()
+    with pytest.raises(QueueTimeoutError):
+        scheduler.acquire("agent", timeout=0.1)
+    assert time.monotonic() - started < 0.5
+    assert scheduler.queue_depth() == 0
+
+
+def test_abandoned_ticket_does_not_block_the_next_caller():
+    scheduler = RequestScheduler(rpm=600)
+    scheduler.rpm.tokens = 0
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(scheduler.acquire("b", timeout=2.0)))
+    with pytest.raises(QueueTimeoutError):
+        scheduler.acquire("a", timeout=0.01)
+    waiter.start()
+    waiter.join(3.0)
+    assert results and scheduler.queue_depth() == 0
+
+
+class RecordingModel:
+    model_name = "models/fake"
+
+    def __init__(self):
+        self.calls = []
+
+    def generate_content(self, *args, **kwargs):
+        self.calls.append(kwargs)
+        return type("Response", (), {"text": "ok", "usage_metadata": None})()
+
+
+def test_model_fails_fast_instead_of_sending_a_zero_timeout(monkeypatch):
+    scheduler = RequestScheduler(rpm=60)
+    scheduler.rpm.tokens = 0
+    monkeypatch.setattr(scheduler_module, "_scheduler", scheduler)
+    model = RecordingModel()
+    breaker = CircuitBreaker("queue-test")
+    proxy = ModelProxy(model, "agent", resilience=Resilience(breaker=breaker, deadline=0.2))
+    with pytest.raises(QueueTimeoutError):
+        proxy.generate_content("hello")
+    assert model.calls == []
+    assert breaker.state == CircuitBreaker.CLOSED and breaker._failures == 0
+
+
+def test_model_timeout_excludes_queue_wait(monkeypatch):
+    scheduler = RequestScheduler(rpm=600)
+    scheduler.rpm.tokens = 0  # next slot in ~0.1s
+    monkeypatch.setattr(scheduler_module, "_scheduler", scheduler)
+    model = RecordingModel()
+    proxy = ModelProxy(model, "agent", resilience=Resilience(breaker=CircuitBreaker("queue-test"), deadline=5.0))
+    proxy.generate_content("hello")
+    timeout = model.calls[0]["request_options"]["timeout"]
+    assert 0 < timeout < 4.95
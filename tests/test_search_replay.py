@@ -0,0 +1,54 @@
+"""Tests for record/replay isolation in ``agents/search_agent/agent.py``."""
+
+import threading
+
+import pytest
+
+pytest.importorskip("bs4")
+
+from agents.search_agent import agent as search_module  # noqa: E402
+from agents.search_agent.agent import SimpleSearchAgent  # noqa: E402
+from agents.search_agent.archive import SearchArchive  # noqa: E402
+
+URL = "http://search.invalid/html/"
+
+
+def page(title):
+    return (f'<div class="result"><a class="result__a" href="https://{title}.example">{title}</a>'
+            f'<a class="result__snippet">about {title}</a></div>').encode("utf-8")
+
+
+class SlowLiveResponse:
+    status_code = 200
+    headers = {"Content-Type": "text/html; charset=utf-8"}
+    content = page("live")
+    text = content.decode("utf-8")
+
+    def raise_for_status(self):
+        pass
+
+
+def test_replay_is_not_coalesced_onto_a_live_fetch(tmp_path, monkeypatch):
+    archive = SearchArchive(str(tmp_path))
+    archive.record("POST", URL, {"q": "agents"}, 200, "text/html; charset=utf-8", page("recorded"))
+
+    started, release = threading.Event(), threading.Event()
+
+    def slow_post(*args, **kwargs):
+        started.set()
+        release.wait(5)
+        return SlowLiveResponse()
+
+    monkeypatch.setattr(search_module.requests, "post", slow_post)
+    live_results = []
+    live = threading.Thread(target=lambda: live_results.extend(SimpleSearchAgent(URL).search("agents")))
+    live.start()
+    try:
+        assert started.wait(5)
+        replayed = SimpleSearchAgent(URL, archive=archive, replay=True).search("agents")
+    finally:
+        release.set()
+        live.join(5)
+    assert [r["title"] for r in replayed] == ["recorded"]
+    assert [r["title"] for r in live_results] == ["live"]
+    archive.close()
@@ -0,0 +1,26 @@
+"""Tests for the article workflow in ``agents/orchestrator/agent.py``."""
+
+import socket
+
+import pytest
+
+from agents.orchestrator.agent import build_article_workflow
+from agents.orchestrator.dag import MemoCache, WorkflowError
+
+
+def closed_port_url():
+    # Bind and release a port so nothing is listening on it
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    return f"http://127.0.0.1:{port}/html/"
+
+
+def test_failed_search_fails_the_run_and_is_not_memoized(tmp_path):
+    cache = MemoCache(str(tmp_path / "cache.json"))
+    flow = build_article_workflow(cache, search_url=closed_port_url())
+    with pytest.raises(WorkflowError) as excinfo:
+        flow.run({"topic": "anything", "style": "casual", "language": "python"})
+    runs = {run.name: run.status for run in excinfo.value.result.trace}
+    assert runs["search"] == "failed"
+    assert not cache.entries